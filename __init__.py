@@ -58,6 +58,9 @@ bl_info = {
 
 import sys
 import importlib
+import time
+
+_start_time = time.perf_counter()
 
 
 # monkey patch the sverchok name, I am sure there is a better way to do this.
@@ -72,12 +75,14 @@ imported_modules = []
 # or parse it
 root_modules = ["menu", "node_tree", "data_structure", "core",
                 "utils", "ui", "nodes", "old_nodes"]
-core_modules = ["handlers", "update_system", "upgrade_nodes"]
+core_modules = ["handlers", "toposort", "update_profile", "cache_budget", "disk_cache",
+                "offload", "update_system", "update_scheduler", "upgrade_nodes"]
 utils_modules = [
     # non UI tools
-    "cad_module", "sv_bmesh_utils", "sv_viewer_utils", "sv_curve_utils",
-    "voronoi", "sv_script", "sv_itertools", "script_importhelper",
-    "csg_core", "csg_geom",
+    # cad_module, sv_curve_utils, voronoi and csg_core, with csg_geom,
+    # are imported lazily by the nodes that use them, see utils/lazy_import.py
+    "sv_bmesh_utils", "sv_viewer_utils",
+    "sv_script", "sv_itertools", "script_importhelper",
     # UI text editor ui
     "text_editor_submenu", "text_editor_plugins",
     # UI operators
@@ -100,11 +105,12 @@ mods_bases = [(root_modules, "sverchok"),
 #  is something else than sverchok...
 settings = importlib.import_module(".settings", __name__)
 imported_modules.append(settings)
+lazy_import = importlib.import_module(".utils.lazy_import", __name__)
 
 
 def import_modules(modules, base, im_list):
     for m in modules:
-        im = importlib.import_module('.{}'.format(m), base)
+        im = lazy_import.timed_import('.{}'.format(m), base)
         im_list.append(im)
 
 
@@ -121,6 +127,7 @@ for mods, base in mods_bases:
     import_modules(mods, base, imported_modules)
 
 node_list = make_node_list()
+lazy_import.startup_time = time.perf_counter() - _start_time
 
 reload_event = bool("bpy" in locals())
 
@@ -130,6 +137,8 @@ if reload_event:
     #  then reload nodes after the node module as been reloaded
     for im in imported_modules:
         importlib.reload(im)
+    for name in lazy_import.lazy_loaded:
+        importlib.reload(sys.modules[name])
     node_list = make_node_list()
     for node in node_list:
         importlib.reload(node)
@@ -147,6 +156,8 @@ def register():
     # this is used to access preferences, should/could be hidden
     # in an interface
     data_structure.SVERCHOK_NAME = __name__
+    if lazy_import.report_requested():
+        print(lazy_import.report())
     print("** Have a nice day with sverchok  **\n")
     ascii_print.logo()
 
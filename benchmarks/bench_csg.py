@@ -0,0 +1,299 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+Benchmark the BSP tree of utils/csg_geom.py, the iterative CSGNode against
+the recursive implementation it replaced, on booleans of subdivided cubes,
+uv spheres and tori. Reports time, peak memory and whether the recursive
+version fails on the recursion limit. Doesn't need blender, run with:
+
+    python benchmarks/bench_csg.py [--quick]
+        [--save baseline.json] [--compare baseline.json]
+"""
+
+import argparse
+import math
+import os
+import sys
+import types
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import load_module, best_time, peak_memory, save_baseline, compare_baseline
+
+# csg_core imports csg_geom from the sverchok package, which needs blender
+for name in ("sverchok", "sverchok.utils"):
+    if name not in sys.modules:
+        package = types.ModuleType(name)
+        package.__path__ = []
+        sys.modules[name] = package
+csg_geom = load_module("sverchok.utils.csg_geom", os.path.join("utils", "csg_geom.py"))
+sys.modules["sverchok.utils.csg_geom"] = csg_geom
+csg_core = load_module("sverchok.utils.csg_core", os.path.join("utils", "csg_core.py"))
+
+CSGNode = csg_geom.CSGNode
+CSG = csg_core.CSG
+
+# the limit Boolean() used to set for the recursive version
+RECURSION_LIMIT = 10000
+
+
+class RecursiveCSGNode(CSGNode):
+    """
+    The recursive BSP node that CSGNode replaced, for comparison
+    """
+
+    def invert(self):
+        for poly in self.polygons:
+            poly.flip()
+        self.plane.flip()
+        if self.front:
+            self.front.invert()
+        if self.back:
+            self.back.invert()
+        self.front, self.back = self.back, self.front
+
+    def clipPolygons(self, polygons):
+        if not self.plane:
+            return polygons[:]
+        front = []
+        back = []
+        for poly in polygons:
+            self.plane.splitPolygon(poly, front, back, front, back)
+        if self.front:
+            front = self.front.clipPolygons(front)
+        if self.back:
+            back = self.back.clipPolygons(back)
+        else:
+            back = []
+        front.extend(back)
+        return front
+
+    def clipTo(self, bsp):
+        self.polygons = bsp.clipPolygons(self.polygons)
+        if self.front:
+            self.front.clipTo(bsp)
+        if self.back:
+            self.back.clipTo(bsp)
+
+    def allPolygons(self):
+        polygons = self.polygons[:]
+        if self.front:
+            polygons.extend(self.front.allPolygons())
+        if self.back:
+            polygons.extend(self.back.allPolygons())
+        return polygons
+
+    def build(self, polygons):
+        polygons = list(polygons)
+        if not polygons:
+            return
+        if not self.plane:
+            self.plane = polygons[0].plane.clone()
+        front = []
+        back = []
+        for poly in polygons:
+            self.plane.splitPolygon(poly, self.polygons, self.polygons, front, back)
+        if front:
+            if not self.front:
+                self.front = RecursiveCSGNode()
+            self.front.build(front)
+        if back:
+            if not self.back:
+                self.back = RecursiveCSGNode()
+            self.back.build(back)
+
+
+def boolean(node_class, va, pa, vb, pb, operation):
+    """
+    CSG.union, subtract and intersect with node_class as BSP node
+    """
+    a = node_class(CSG.Obj_from_pydata(va, pa).polygons)
+    b = node_class(CSG.Obj_from_pydata(vb, pb).polygons)
+    if operation == 'JOIN':
+        a.clipTo(b)
+        b.clipTo(a)
+        b.invert()
+        b.clipTo(a)
+        b.invert()
+        a.build(b.allPolygons())
+    elif operation == 'DIFF':
+        a.invert()
+        a.clipTo(b)
+        b.clipTo(a)
+        b.invert()
+        b.clipTo(a)
+        b.invert()
+        a.build(b.allPolygons())
+        a.invert()
+    else:
+        a.invert()
+        b.clipTo(a)
+        b.invert()
+        a.clipTo(b)
+        b.clipTo(a)
+        a.build(b.allPolygons())
+        a.invert()
+    return a.allPolygons()
+
+
+def cube(n, offset=(0, 0, 0)):
+    """
+    Cube of side 2 with n x n quads per side
+    """
+    verts = {}
+    faces = []
+    corners = ((0, 0), (1, 0), (1, 1), (0, 1))
+    for axis in range(3):
+        for side in (-1, 1):
+            for i in range(n):
+                for j in range(n):
+                    face = []
+                    for di, dj in (corners if side > 0 else corners[::-1]):
+                        co = [0.0, 0.0, 0.0]
+                        co[axis] = side
+                        co[(axis + 1) % 3] = -1 + 2.0 * (i + di) / n
+                        co[(axis + 2) % 3] = -1 + 2.0 * (j + dj) / n
+                        co = tuple(round(c + o, 9) for c, o in zip(co, offset))
+                        face.append(verts.setdefault(co, len(verts)))
+                    faces.append(face)
+    out = [None] * len(verts)
+    for co, index in verts.items():
+        out[index] = co
+    return out, faces
+
+
+def uv_sphere(n, offset=(0, 0, 0)):
+    """
+    Sphere of radius 1 with n segments and n rings, triangles at the poles
+    """
+    ox, oy, oz = offset
+    verts = [(ox, oy, oz + 1)]
+    for ring in range(1, n):
+        theta = math.pi * ring / n
+        for seg in range(n):
+            phi = 2 * math.pi * seg / n
+            verts.append((ox + math.sin(theta) * math.cos(phi),
+                          oy + math.sin(theta) * math.sin(phi),
+                          oz + math.cos(theta)))
+    verts.append((ox, oy, oz - 1))
+    bottom = len(verts) - 1
+    faces = []
+    for seg in range(n):
+        faces.append([0, 1 + seg, 1 + (seg + 1) % n])
+    for ring in range(n - 2):
+        first = 1 + ring * n
+        for seg in range(n):
+            a = first + seg
+            b = first + (seg + 1) % n
+            faces.append([a, a + n, b + n, b])
+    first = 1 + (n - 2) * n
+    for seg in range(n):
+        faces.append([first + (seg + 1) % n, first + seg, bottom])
+    return verts, faces
+
+
+def torus(n, offset=(0, 0, 0), major=1.0, minor=0.35):
+    ox, oy, oz = offset
+    verts = []
+    for i in range(n):
+        u = 2 * math.pi * i / n
+        for j in range(n):
+            v = 2 * math.pi * j / n
+            r = major + minor * math.cos(v)
+            verts.append((ox + r * math.cos(u), oy + r * math.sin(u), oz + minor * math.sin(v)))
+    faces = []
+    for i in range(n):
+        for j in range(n):
+            a = i * n + j
+            b = ((i + 1) % n) * n + j
+            c = ((i + 1) % n) * n + (j + 1) % n
+            d = i * n + (j + 1) % n
+            faces.append([a, b, c, d])
+    return verts, faces
+
+
+MESHES = [("cube", cube), ("sphere", uv_sphere), ("torus", torus)]
+SIZES = [8, 16, 32, 64]
+OPERATIONS = ['JOIN', 'DIFF', 'ITX']
+
+
+def polygon_key(polygons):
+    return [tuple(round(c, 9) for v in p.vertices for c in (v.pos.x, v.pos.y, v.pos.z))
+            for p in polygons]
+
+
+def run(sizes, memory=True, repeat=3):
+    results = {}
+    print("{:<8} {:>5} {:<5} {:>7} {:>12} {:>12} {:>8} {:>10} {:>10} {:>6}".format(
+        "mesh", "size", "op", "polys", "rec ms", "iter ms", "speedup",
+        "rec KB", "iter KB", "same"))
+    old_limit = sys.getrecursionlimit()
+    for mesh_name, make in MESHES:
+        for size in sizes:
+            va, pa = make(size)
+            vb, pb = make(size, (0.37, 0.23, 0.11))
+            for operation in OPERATIONS:
+                iterative = lambda: boolean(CSGNode, va, pa, vb, pb, operation)
+                recursive = lambda: boolean(RecursiveCSGNode, va, pa, vb, pb, operation)
+                t_iter = best_time(iterative, min_time=0, max_repeat=repeat)
+                peak_iter = peak_memory(iterative) if memory else 0
+                polygons = iterative()
+                sys.setrecursionlimit(RECURSION_LIMIT)
+                try:
+                    t_rec = best_time(recursive, min_time=0, max_repeat=repeat)
+                    peak_rec = peak_memory(recursive) if memory else 0
+                    same = polygon_key(recursive()) == polygon_key(polygons)
+                except RecursionError:
+                    t_rec = peak_rec = None
+                    same = None
+                finally:
+                    sys.setrecursionlimit(old_limit)
+                case = "{}/{}/{}".format(mesh_name, size, operation)
+                results[case] = {"time": t_iter, "peak": peak_iter}
+                print("{:<8} {:>5} {:<5} {:>7} {:>12} {:>12.1f} {:>8} {:>10} {:>10.0f} {:>6}".format(
+                    mesh_name, size, operation, len(polygons),
+                    "failed" if t_rec is None else "{:.1f}".format(t_rec * 1000),
+                    t_iter * 1000,
+                    "" if t_rec is None else "{:.2f}x".format(t_rec / t_iter),
+                    "" if t_rec is None else "{:.0f}".format(peak_rec / 1024),
+                    peak_iter / 1024,
+                    "" if same is None else str(same)))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--quick", action="store_true", help="sizes up to 16 only")
+    parser.add_argument("--no-memory", action="store_true", help="skip peak memory")
+    parser.add_argument("--save", help="write results as baseline")
+    parser.add_argument("--compare", help="compare results with a baseline")
+    parser.add_argument("--threshold", type=float, default=1.2,
+                        help="ratio to the baseline that counts as a regression")
+    args = parser.parse_args()
+
+    sizes = [s for s in SIZES if s <= 16] if args.quick else SIZES
+    results = run(sizes, memory=not args.no_memory)
+    if args.save:
+        save_baseline(args.save, results)
+    if args.compare:
+        regressions = compare_baseline(args.compare, results, args.threshold)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
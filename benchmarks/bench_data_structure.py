@@ -0,0 +1,144 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+Benchmark the list matching and list level helpers from data_structure.py
+and utils/sv_itertools.py for sizes from 10 to 10^6 leaves and nesting
+depth 1 to 4. Reports throughput (leaves per second) and peak memory.
+Doesn't need blender, run with:
+
+    python benchmarks/bench_data_structure.py [--quick]
+        [--save baseline.json] [--compare baseline.json]
+"""
+
+import argparse
+import operator
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import load_module, best_time, peak_memory, save_baseline, compare_baseline
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# data_structure imports bpy and mathutils, none of the helpers here use them
+ds = load_module("data_structure", "data_structure.py", placeholders=("bpy", "mathutils"))
+it = load_module("sv_itertools", os.path.join("utils", "sv_itertools.py"))
+
+SIZES = [10, 100, 1000, 10 ** 4, 10 ** 5, 10 ** 6]
+DEPTHS = [1, 2, 3, 4]
+
+
+def make_data(count, depth, offset=0.0):
+    """
+    Nested lists of depth levels with about count float leaves
+    """
+    if depth == 1:
+        return [offset + i * 0.5 for i in range(count)]
+    branch = max(1, int(round(count ** (1.0 / depth))))
+    inner = max(1, count // branch)
+    return [make_data(inner, depth - 1, offset + i) for i in range(branch)]
+
+
+def cases(count, depth):
+    """
+    (name, function) to benchmark for count leaves and depth
+    """
+    a = make_data(count, depth)
+    b = make_data(max(1, count // 2), depth, 1.0)
+    # cross matching output is len(a) * len(b)
+    side = max(1, int(count ** 0.5))
+    a_cross = make_data(side, 1)
+    b_cross = make_data(side, 1, 1.0)
+    # lists with the same nesting but different top level length
+    short = a[:max(1, len(a) // 2)]
+    return [
+        ("match_long_repeat", lambda: ds.match_long_repeat([a, short])),
+        ("match_long_cycle", lambda: ds.match_long_cycle([a, short])),
+        ("match_cross2", lambda: ds.match_cross2([a_cross, b_cross])),
+        ("fullList", lambda: ds.fullList(short[:], len(a))),
+        ("sv_zip", lambda: list(ds.sv_zip(a, short))),
+        ("levelsOflist", lambda: ds.levelsOflist(a)),
+        ("dataCorrect", lambda: ds.dataCorrect(a)),
+        ("data_shape", lambda: ds.data_shape(a).depth),
+        ("data_shape.lengths", lambda: ds.data_shape(a).lengths),
+        ("sv_deep_copy", lambda: ds.sv_deep_copy(a)),
+        ("sv_zip_longest", lambda: list(it.sv_zip_longest(a, short))),
+        ("sv_zip_longest2", lambda: list(it.sv_zip_longest2(a, short))),
+        ("recurse_fxy", lambda: it.recurse_fxy(a, b, operator.add)),
+    ] + array_cases(count, depth)
+
+
+def array_cases(count, depth):
+    """
+    The matching functions with numpy arrays, (count, 3) for depth 2
+    """
+    if not np or depth > 2:
+        return []
+    shape = (count,) if depth == 1 else (count, 3)
+    a = np.arange(count * (1 if depth == 1 else 3), dtype=float).reshape(shape)
+    short = a[:max(1, count // 2)]
+    side = max(1, int(count ** 0.5))
+    a_cross, b_cross = a[:side], short[:side]
+    return [
+        ("match_long_repeat_np", lambda: ds.match_long_repeat([a, short])),
+        ("match_long_cycle_np", lambda: ds.match_long_cycle([a, short])),
+        ("match_cross2_np", lambda: ds.match_cross2([a_cross, b_cross])),
+        ("sv_deep_copy_np", lambda: ds.sv_deep_copy([a])),
+    ]
+
+
+def run(sizes, depths, memory=True):
+    results = {}
+    print("{:<22} {:>8} {:>5} {:>12} {:>14} {:>10}".format(
+        "function", "size", "depth", "time ms", "leaves/s", "peak KB"))
+    for depth in depths:
+        for count in sizes:
+            for name, func in cases(count, depth):
+                t = best_time(func)
+                peak = peak_memory(func) if memory else 0
+                results["{}/{}/{}".format(name, count, depth)] = {"time": t, "peak": peak}
+                print("{:<22} {:>8} {:>5} {:>12.3f} {:>14.0f} {:>10.1f}".format(
+                    name, count, depth, t * 1000, count / t if t else 0, peak / 1024))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--quick", action="store_true", help="sizes up to 10^4 only")
+    parser.add_argument("--no-memory", action="store_true", help="skip peak memory")
+    parser.add_argument("--save", help="write results as baseline")
+    parser.add_argument("--compare", help="compare results with a baseline")
+    parser.add_argument("--threshold", type=float, default=1.2,
+                        help="ratio to the baseline that counts as a regression")
+    args = parser.parse_args()
+
+    sizes = [s for s in SIZES if s <= 10 ** 4] if args.quick else SIZES
+    results = run(sizes, DEPTHS, memory=not args.no_memory)
+    if args.save:
+        save_baseline(args.save, results)
+    if args.compare:
+        regressions = compare_baseline(args.compare, results, args.threshold)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+Compare the level scheduler in core/toposort.py with the old depth first
+make_update_list on synthetic node trees.
+Doesn't need blender, run with:
+    python benchmarks/bench_update_list.py
+"""
+
+import collections
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import load_module
+
+toposort = load_module("toposort", os.path.join("core", "toposort.py"))
+
+
+def make_update_list_dfs(node_set, deps):
+    """
+    The depth first make_update_list as it was before the level scheduler,
+    kept for comparison.
+    """
+    if len(node_set) == 1:
+        return list(node_set)
+    name = node_set.pop()
+    node_set.add(name)
+
+    tree_stack = collections.deque([name])
+    tree_stack_append = tree_stack.append
+    tree_stack_pop = tree_stack.pop
+    out = collections.OrderedDict()
+    node_count = len(node_set)
+    while node_count > len(out):
+        node_dependencies = True
+        for dep_name in deps[name]:
+            if dep_name in node_set and dep_name not in out:
+                tree_stack_append(name)
+                name = dep_name
+                node_dependencies = False
+                break
+        if len(tree_stack) > node_count:
+            print("Invalid node tree!")
+            return []
+        if node_dependencies:
+            if name not in out:
+                out[name] = 1
+            if tree_stack:
+                name = tree_stack_pop()
+            else:
+                if node_count == len(out):
+                    break
+                for node_name in node_set:
+                    if node_name not in out:
+                        name = node_name
+                        break
+    return list(out.keys())
+
+
+def make_level_list(node_set, deps):
+    levels = toposort.topological_levels(node_set, deps)
+    return [name for level in levels for name in level]
+
+
+def synthetic_tree(count, parts=8, max_inputs=3, seed=0):
+    """
+    Upstream dependency dict of count nodes split in parts unconnected
+    sub graphs, every node depends on up to max_inputs earlier nodes
+    of the same part.
+    """
+    rnd = random.Random(seed)
+    deps = collections.defaultdict(set)
+    names = ["Node.{:05d}".format(i) for i in range(count)]
+    for part in range(parts):
+        part_names = names[part::parts]
+        for i, name in enumerate(part_names[1:], 1):
+            window = part_names[max(0, i - 20):i]
+            for dep in rnd.sample(window, min(len(window), rnd.randint(1, max_inputs))):
+                deps[name].add(dep)
+    return set(names), deps
+
+
+def check_order(order, deps):
+    position = {name: i for i, name in enumerate(order)}
+    for name, upstream in deps.items():
+        for dep in upstream:
+            assert position[dep] < position[name], (dep, name)
+
+
+def best_of(func, node_set, deps, repeat=5):
+    best = float("inf")
+    for i in range(repeat):
+        start = time.perf_counter()
+        out = func(set(node_set), deps)
+        best = min(best, time.perf_counter() - start)
+    return best, out
+
+
+def main():
+    print("{:>7} {:>12} {:>12} {:>8} {:>7}".format("nodes", "dfs ms", "levels ms", "speedup", "levels"))
+    for count in (1000, 2000, 5000, 10000):
+        node_set, deps = synthetic_tree(count)
+        t_dfs, out_dfs = best_of(make_update_list_dfs, node_set, deps)
+        t_lvl, out_lvl = best_of(make_level_list, node_set, deps)
+        check_order(out_dfs, deps)
+        check_order(out_lvl, deps)
+        n_levels = len(toposort.topological_levels(node_set, deps))
+        print("{:>7} {:>12.2f} {:>12.2f} {:>7.1f}x {:>7}".format(
+            count, t_dfs * 1000, t_lvl * 1000, t_dfs / t_lvl, n_levels))
+
+    # cycle report
+    deps = {"A": {"C"}, "B": {"A"}, "C": {"B"}, "D": {"C"}}
+    try:
+        toposort.topological_levels(set(deps), deps)
+    except toposort.SvCycleError as err:
+        print("cycle found:", err)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+Shared helpers for the benchmarks, they run with plain python, no blender.
+"""
+
+import importlib.util
+import json
+import os
+import sys
+import time
+import tracemalloc
+import types
+
+SV_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_module(name, rel_path, placeholders=()):
+    """
+    Load a sverchok module from its file, without importing the sverchok
+    package (which needs blender).
+    placeholders are names of modules that the file imports at module level
+    but that the benchmarked functions don't use, like bpy. If they can't
+    be imported empty modules are used.
+    """
+    for placeholder in placeholders:
+        if placeholder in sys.modules:
+            continue
+        try:
+            importlib.import_module(placeholder)
+        except ImportError:
+            module = types.ModuleType(placeholder)
+            module.__getattr__ = lambda attr: None
+            sys.modules[placeholder] = module
+    path = os.path.join(SV_ROOT, rel_path)
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def best_time(func, min_time=0.2, max_repeat=1000):
+    """
+    Best of a few runs of func, runs until min_time has passed
+    or max_repeat runs are done
+    """
+    best = float("inf")
+    total = 0.0
+    count = 0
+    while count < max_repeat and (count < 1 or total < min_time):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        total += elapsed
+        count += 1
+    return best
+
+
+def peak_memory(func):
+    """
+    Peak memory allocated while running func once, in bytes
+    """
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def save_baseline(path, results):
+    with open(path, 'w') as baseline_file:
+        json.dump(results, baseline_file, indent=2, sort_keys=True)
+
+
+def compare_baseline(path, results, threshold=1.2):
+    """
+    Print cases that are slower or use more memory than the baseline
+    by more than threshold, returns the number of regressions
+    """
+    with open(path) as baseline_file:
+        baseline = json.load(baseline_file)
+    regressions = 0
+    for case, result in sorted(results.items()):
+        base = baseline.get(case)
+        if not base:
+            continue
+        for key in ("time", "peak"):
+            if base.get(key) and result[key] > base[key] * threshold:
+                regressions += 1
+                print("REGRESSION {}: {} {:.4g} -> {:.4g} ({:.2f}x)".format(
+                    case, key, base[key], result[key], result[key] / base[key]))
+    print("{} regressions against {}".format(regressions, path))
+    return regressions
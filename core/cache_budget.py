@@ -0,0 +1,189 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Memory accounting for the socket data cache and eviction of data
+# from nodes that are cheap to process again.
+
+import sys
+
+import bpy
+
+from sverchok import data_structure
+from sverchok.core import update_profile
+import sverchok
+
+MB = 1024 * 1024
+
+# budgets in bytes, 0 is no limit
+tree_budget = 0
+total_budget = 0
+# nodes with a last process time below this (seconds) can be evicted
+cheap_time = 0.005
+
+# size estimates, {socket key: (id of data, elements, bytes)}
+size_memo = {}
+
+
+def update_budget(self, context):
+    global tree_budget
+    global total_budget
+    global cheap_time
+    tree_budget = self.cache_budget_tree * MB
+    total_budget = self.cache_budget_total * MB
+    cheap_time = self.cache_cheap_time / 1000
+
+
+def estimate_size(data, sample=8):
+    """
+    Estimate (element count, bytes) of socket data, long lists are
+    estimated from a sample of their items.
+    """
+    if hasattr(data, 'nbytes') and hasattr(data, 'size'):
+        return data.size, data.nbytes
+    if isinstance(data, (list, tuple)):
+        count = len(data)
+        if not count:
+            return 0, sys.getsizeof(data)
+        if count <= sample:
+            items = data
+        else:
+            step = count // sample
+            items = [data[i] for i in range(0, step * sample, step)]
+        elements = 0
+        size = 0
+        for item in items:
+            e, b = estimate_size(item, sample)
+            elements += e
+            size += b
+        scale = count / len(items)
+        return int(elements * scale), sys.getsizeof(data) + int(size * scale)
+    return 1, sys.getsizeof(data)
+
+
+def socket_sizes():
+    """
+    Sizes of all cached socket data,
+    [(bytes, elements, tree name, node name, socket key)]
+    """
+    out = []
+    names = data_structure.socket_key_names
+    for ng_name, cache in data_structure.socket_data_cache.items():
+        for s_id, data in cache.items():
+            memo = size_memo.get(s_id)
+            if memo and memo[0] == id(data):
+                elements, size = memo[1:]
+            else:
+                elements, size = estimate_size(data)
+                size_memo[s_id] = (id(data), elements, size)
+            out.append((size, elements, ng_name, names[s_id][1], s_id))
+    if len(size_memo) > len(out):
+        live = {s[4] for s in out}
+        for s_id in [s_id for s_id in size_memo if s_id not in live]:
+            del size_memo[s_id]
+    return out
+
+
+# nodes whose output is set from outside of their process, by the group
+# node or the iteration, or that keep state between updates
+keep_node_types = {'SvGroupInputsNode', 'SvGroupOutputsNode', 'SvCacheNode'}
+
+
+def can_evict(ng_name, node_name):
+    """
+    Data can be evicted from nodes in a layout that process their own
+    output. Group trees are filled by the group and iteration nodes,
+    their data is never evicted.
+    """
+    ng = bpy.data.node_groups.get(ng_name)
+    if ng is None or ng.bl_idname != 'SverchCustomTreeType':
+        return False
+    node = ng.nodes.get(node_name)
+    if node is None or node.bl_idname in keep_node_types:
+        return False
+    return callable(getattr(node, 'process', None))
+
+
+def evict(sizes, budget):
+    """
+    Evict least recently used data from cheap nodes until sizes are
+    within budget. Returns the bytes that are left.
+    """
+    total = sum(s[0] for s in sizes)
+    if total <= budget:
+        return total
+    access = data_structure.socket_data_access
+    durations = update_profile.last_durations
+    for size, elements, ng_name, node_name, s_id in sorted(sizes, key=lambda s: access.get(s[4], 0)):
+        if total <= budget:
+            break
+        duration = durations.get((ng_name, node_name))
+        if duration is None or duration > cheap_time:
+            continue
+        if not can_evict(ng_name, node_name):
+            continue
+        cache = data_structure.socket_data_cache[ng_name]
+        if s_id in cache:
+            del cache[s_id]
+            size_memo.pop(s_id, None)
+            data_structure.socket_data_shape.pop(s_id, None)
+            data_structure.socket_data_lists.pop(s_id, None)
+            data_structure.evicted_sockets.add(s_id)
+            total -= size
+    return total
+
+
+def enforce_budget():
+    if not (tree_budget or total_budget):
+        return
+    sizes = socket_sizes()
+    if tree_budget:
+        per_tree = {}
+        for s in sizes:
+            per_tree.setdefault(s[2], []).append(s)
+        for tree_sizes in per_tree.values():
+            evict(tree_sizes, tree_budget)
+        sizes = socket_sizes()
+    if total_budget:
+        evict(sizes, total_budget)
+
+
+def report(count=20):
+    """
+    Text report of total cached data per tree and the largest sockets
+    """
+    sizes = sorted(socket_sizes(), reverse=True)
+    per_tree = {}
+    for size, elements, ng_name, node_name, s_id in sizes:
+        per_tree[ng_name] = per_tree.get(ng_name, 0) + size
+    lines = ["Socket cache: {:.1f} MB, {} evicted sockets".format(
+        sum(per_tree.values()) / MB, len(data_structure.evicted_sockets))]
+    for ng_name, size in sorted(per_tree.items()):
+        lines.append("  {:<30} {:>10.1f} MB".format(ng_name, size / MB))
+    lines.append("{:<20} {:<24} {:<20} {:>12} {:>10}".format("tree", "node", "socket", "elements", "MB"))
+    names = data_structure.socket_key_names
+    for size, elements, ng_name, node_name, s_id in sizes[:count]:
+        lines.append("{:<20} {:<24} {:<20} {:>12} {:>10.2f}".format(
+            ng_name[:20], node_name[:24], names[s_id][2][:20], elements, size / MB))
+    return "\n".join(lines)
+
+
+def register():
+    addon_name = sverchok.__name__
+    addon = bpy.context.user_preferences.addons.get(addon_name)
+    if addon:
+        update_budget(addon.preferences, [])
@@ -0,0 +1,234 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Persistent result cache for nodes, on disk.
+# Outputs of slow generator and modifier nodes are stored under a key made
+# from the node type, its properties and the hashes of its input data,
+# so they can be reused after reloading the file, or on another machine
+# sharing the cache directory, instead of processing the node again.
+# The files are written with utils/sv_data_io.py, never pickled, so
+# reading a file from a shared directory can't run code.
+
+import hashlib
+import os
+import re
+import tempfile
+import time
+
+import bpy
+
+from sverchok import data_structure
+from sverchok.utils.sv_data_io import save_data, load_data
+import sverchok
+
+# change when the stored format changes
+CACHE_FORMAT = 2
+
+enabled = False
+cache_dir = ""
+# seconds, only nodes slower than this are stored
+min_time = 0.05
+
+# categories, nodes.nodes_dict keys, of nodes that only depend on
+# their properties and inputs
+cached_categories = {
+    'generator', 'generators_extended', 'modifier_change', 'modifier_make',
+}
+# nodes of these categories that read images of bpy.data, not in the key
+uncached_node_types = {'ImageNode', 'HilbertImageNode'}
+# nodes that read a text of bpy.data, {bl_idname: property with the text name},
+# the text goes in the key. The text of SvProfileNode is added by get_node_params
+text_node_types = {'SvGenerativeArtNode': 'filename'}
+
+# the files and directories made by the cache, clear() only removes these
+key_dir_pattern = re.compile(r"^[0-9a-f]{2}$")
+key_file_pattern = re.compile(r"^[0-9a-f]{40}\.npz(\.\d+\.tmp)?$")
+
+# process time without the cache, {(tree name, node name): seconds}
+node_cost = {}
+# hits and misses since the cache was enabled
+stats = {"hits": 0, "misses": 0, "stored": 0}
+
+
+def update_settings(self, context):
+    global enabled
+    global cache_dir
+    global min_time
+    enabled = self.disk_cache
+    cache_dir = bpy.path.abspath(self.disk_cache_dir) if self.disk_cache_dir else ""
+    min_time = self.disk_cache_min_time / 1000
+
+
+def get_cache_dir():
+    return cache_dir or os.path.join(tempfile.gettempdir(), "sv_disk_cache")
+
+
+def is_cacheable(node):
+    module = type(node).__module__.split(".")
+    if len(module) < 3 or module[-2] not in cached_categories:
+        return False
+    from sverchok.core.update_system import animation_node_types, group_node_types
+    if node.bl_idname in animation_node_types or node.bl_idname in group_node_types:
+        return False
+    if node.bl_idname in uncached_node_types:
+        return False
+    return bool(node.outputs)
+
+
+def node_key(node):
+    """
+    Cache key for the node from its type, properties and input data,
+    None if the node isn't cached
+    """
+    cost = node_cost.get((node.id_data.name, node.name))
+    if cost is not None and cost < min_time:
+        return None
+    if not is_cacheable(node):
+        return None
+    from sverchok.utils.sv_IO_panel_tools import get_node_params
+    extra = {}
+    try:
+        params = get_node_params(node, extra, {})
+    except Exception:
+        return None
+    if node.bl_idname in text_node_types:
+        text = bpy.data.texts.get(getattr(node, text_node_types[node.bl_idname]))
+        if text is None:
+            # nothing to read, nothing to cache
+            return None
+        extra['text'] = text.as_string()
+    h = hashlib.sha1()
+    h.update(repr((CACHE_FORMAT, sverchok.bl_info["version"], node.bl_idname)).encode())
+    h.update(repr((sorted(params.items()), sorted(extra.items()))).encode())
+    for socket in node.inputs:
+        h.update(socket.name.encode())
+        if socket.is_linked:
+            try:
+                data = socket.sv_get(deepcopy=False)
+            except Exception:
+                # no data, processing the node reports the error
+                return None
+            data_structure.data_hash(data, h)
+    return h.hexdigest()
+
+
+def key_path(key):
+    return os.path.join(get_cache_dir(), key[:2], key + ".npz")
+
+
+def load(node, key):
+    """
+    Set the outputs of node from the cache, True if they were found
+    """
+    path = key_path(key)
+    try:
+        outputs = load_data(path)
+    except (OSError, ValueError):
+        stats["misses"] += 1
+        return False
+    if not isinstance(outputs, dict) or any(socket.is_linked and socket.name not in outputs for socket in node.outputs):
+        stats["misses"] += 1
+        return False
+    for socket in node.outputs:
+        if socket.is_linked:
+            socket.sv_set(outputs[socket.name])
+    stats["hits"] += 1
+    if data_structure.DEBUG_MODE:
+        print("Disk cache hit for {}".format(node.name))
+    return True
+
+
+def store(node, key, duration):
+    """
+    Write the outputs of node to the cache if it was slow enough
+    """
+    if duration < min_time:
+        return
+    cache = data_structure.socket_data_cache.get(node.id_data.name, {})
+    outputs = {}
+    for socket in node.outputs:
+        s_id = data_structure.socket_id(socket)
+        if s_id in cache:
+            outputs[socket.name] = cache[s_id]
+    if not outputs:
+        return
+    path = key_path(key)
+    # write then rename, so other machines never read a partial file
+    tmp_path = "{}.{}.tmp".format(path, os.getpid())
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, 'wb') as cache_file:
+            save_data(cache_file, outputs)
+        os.replace(tmp_path, path)
+        stats["stored"] += 1
+    except (OSError, TypeError, ValueError) as err:
+        print("Disk cache, could not store {}: {}".format(node.name, err))
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def process(node, run=None):
+    """
+    Process node, with run if passed, or set its outputs from the cache
+    """
+    key = node_key(node) if enabled else None
+    if key and load(node, key):
+        return
+    start = time.perf_counter()
+    if run is None:
+        node.process()
+    else:
+        run()
+    duration = time.perf_counter() - start
+    # every time, so a node found fast once is stored when it gets slow
+    node_cost[(node.id_data.name, node.name)] = duration
+    if key:
+        store(node, key, duration)
+
+
+def clear():
+    """
+    Remove the cached files, other files of the cache directory are kept
+    """
+    root = get_cache_dir()
+    try:
+        dir_names = os.listdir(root)
+    except OSError:
+        dir_names = []
+    for dir_name in dir_names:
+        path = os.path.join(root, dir_name)
+        if not key_dir_pattern.match(dir_name) or not os.path.isdir(path):
+            continue
+        for file_name in os.listdir(path):
+            if key_file_pattern.match(file_name):
+                try:
+                    os.remove(os.path.join(path, file_name))
+                except OSError:
+                    pass
+        if not os.listdir(path):
+            os.rmdir(path)
+    node_cost.clear()
+    for k in stats:
+        stats[k] = 0
+
+
+def register():
+    addon_name = sverchok.__name__
+    addon = bpy.context.user_preferences.addons.get(addon_name)
+    if addon:
+        update_settings(addon.preferences, [])
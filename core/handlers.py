@@ -50,6 +50,15 @@ def sv_clean(scene):
     nodeview_bgl_viewer_draw.callback_disable_all()
     data_structure.sv_Vars = {}
     data_structure.temp_handle = {}
+    data_structure.reset_socket_keys()
+
+
+@persistent
+def sv_undo(scene):
+    """
+    Socket pointers can't be trusted after undo and redo.
+    """
+    data_structure.reset_socket_keys()
 
 
 @persistent
@@ -128,6 +137,8 @@ def set_frame_change(mode):
 def register():
     bpy.app.handlers.load_pre.append(sv_clean)
     bpy.app.handlers.load_post.append(sv_post_load)
+    bpy.app.handlers.undo_post.append(sv_undo)
+    bpy.app.handlers.redo_post.append(sv_undo)
     data_structure.setup_init()
     addon_name = data_structure.SVERCHOK_NAME
     addon = bpy.context.user_preferences.addons.get(addon_name)
@@ -140,4 +151,6 @@ def register():
 def unregister():
     bpy.app.handlers.load_pre.remove(sv_clean)
     bpy.app.handlers.load_post.remove(sv_post_load)
+    bpy.app.handlers.undo_post.remove(sv_undo)
+    bpy.app.handlers.redo_post.remove(sv_undo)
     set_frame_change(None)
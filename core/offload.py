@@ -0,0 +1,174 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Offloading of heavy pure python nodes to a pool of worker processes.
+# A node opts in with sv_offload = True and two methods:
+#   sv_offload_job(self) -> (function, args) or None to process normally,
+#       function must be defined at module level and args picklable
+#   sv_offload_done(self, result) sets the outputs from the result
+# Offloadable nodes further down the update list whose inputs are
+# ready are started at the same time, so they run concurrently. With
+# offload on, process_tree runs the unconnected parts of a tree as one
+# update list merged level by level, so nodes of different parts are
+# started together too.
+# Workers are forked from blender, which is only safe on linux. macOS
+# doesn't support fork of a process using its system frameworks and
+# windows has no fork, spawning would start another blender, so there
+# the nodes are processed normally. A job that takes longer than the
+# timeout is given up and the node is processed normally.
+
+import multiprocessing
+import os
+import sys
+
+import bpy
+
+from sverchok import data_structure
+import sverchok
+
+enabled = False
+# 0 is one worker per cpu
+workers = 0
+# seconds to wait for a job
+timeout = 60.0
+
+pool = None
+
+
+def update_settings(self, context):
+    global enabled
+    global workers
+    global timeout
+    enabled = self.process_offload
+    if workers != self.offload_workers or not enabled:
+        close_pool()
+    workers = self.offload_workers
+    timeout = self.offload_timeout
+
+
+def is_supported():
+    return sys.platform.startswith("linux")
+
+
+def get_pool():
+    global pool
+    if pool is None:
+        if not is_supported():
+            return None
+        try:
+            context = multiprocessing.get_context("fork")
+        except ValueError:
+            return None
+        pool = context.Pool(workers or os.cpu_count() or 2)
+    return pool
+
+
+def close_pool():
+    global pool
+    if pool is not None:
+        pool.terminate()
+        pool = None
+
+
+def is_offloadable(node):
+    return getattr(node, "sv_offload", False)
+
+
+def submit(node):
+    """
+    Start the job of node in the pool, None if the node
+    should be processed normally
+    """
+    job = node.sv_offload_job()
+    if job is None:
+        return None
+    function, args = job
+    return get_pool().apply_async(function, args)
+
+
+def process(node, remaining, upstream, jobs, is_skipped=None):
+    """
+    Process node in the worker pool.
+    remaining are the names in the update list from node on,
+    upstream a dependency dict and jobs the running jobs of this
+    update, {node name: async result or None}. is_skipped tells if a
+    node further down will be skipped, those aren't started early.
+    """
+    if get_pool() is None:
+        node.process()
+        return
+    name = node.name
+    if name not in jobs:
+        jobs[name] = submit(node)
+    start_ready(remaining, node.id_data.nodes, upstream, jobs, is_skipped)
+    job = jobs.pop(name)
+    if job is None:
+        node.process()
+        return
+    try:
+        result = job.get(timeout)
+    except multiprocessing.TimeoutError:
+        print("Offloaded {} took more than {} s, processing it here".format(name, timeout))
+        # the worker may be stuck, start over with a new pool
+        close_pool()
+        jobs.clear()
+        node.process()
+        return
+    node.sv_offload_done(result)
+
+
+def discard(jobs, name):
+    """
+    Forget the job of a node that won't be processed, its result is
+    ignored if it was started early
+    """
+    if jobs.pop(name, None) is not None and data_structure.DEBUG_MODE:
+        print("Discarded the offloaded job of {}".format(name))
+
+
+def start_ready(remaining, nodes, upstream, jobs, is_skipped=None):
+    """
+    Submit the offloadable nodes in remaining that only depend on
+    nodes that are already processed
+    """
+    todo = set(remaining)
+    for name in remaining[1:]:
+        node = nodes.get(name)
+        if name in jobs or not node or not is_offloadable(node):
+            continue
+        if not upstream.get(name, set()).isdisjoint(todo):
+            continue
+        if is_skipped and is_skipped(name):
+            continue
+        try:
+            jobs[name] = submit(node)
+        except Exception as err:
+            # processed, and reported, when the update gets to it
+            if data_structure.DEBUG_MODE:
+                print("Could not start {} early: {}".format(name, err))
+
+
+def register():
+    addon_name = sverchok.__name__
+    addon = bpy.context.user_preferences.addons.get(addon_name)
+    if addon:
+        update_settings(addon.preferences, [])
+
+
+def unregister():
+    close_pool()
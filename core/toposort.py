@@ -0,0 +1,87 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Pure python, no bpy here, so it can be used and benchmarked outside blender.
+
+import collections
+
+
+class SvCycleError(Exception):
+    """
+    Raised when a node set can't be sorted, nodes is the found cycle
+    in the direction of the data flow.
+    """
+    def __init__(self, nodes):
+        self.nodes = nodes
+        super().__init__(" -> ".join(nodes + nodes[:1]))
+
+
+def find_cycle(remaining, deps):
+    """
+    Find one cycle among remaining nodes, every node in remaining
+    must have at least one dependency in remaining.
+    """
+    name = next(iter(remaining))
+    path = []
+    seen = {}
+    while name not in seen:
+        seen[name] = len(path)
+        path.append(name)
+        name = next(dep for dep in deps[name] if dep in remaining)
+    cycle = path[seen[name]:]
+    cycle.reverse()
+    return cycle
+
+
+def topological_levels(node_set, deps):
+    """
+    Kahn's algorithm, sorts node_set into levels where every node only
+    depends on nodes from earlier levels. Nodes in the same level are
+    independent of each other.
+    deps is an upstream dependency dict, dependencies outside of node_set
+    are ignored.
+    Raises SvCycleError if node_set contains a cycle.
+    """
+    in_degree = {}
+    down = collections.defaultdict(list)
+    for name in node_set:
+        count = 0
+        for dep in deps.get(name, ()):
+            if dep in node_set:
+                count += 1
+                down[dep].append(name)
+        in_degree[name] = count
+
+    level = [name for name, count in in_degree.items() if not count]
+    levels = []
+    done = 0
+    while level:
+        levels.append(level)
+        done += len(level)
+        next_level = []
+        for name in level:
+            for other in down[name]:
+                in_degree[other] -= 1
+                if not in_degree[other]:
+                    next_level.append(other)
+        level = next_level
+
+    if done < len(in_degree):
+        remaining = {name for name, count in in_degree.items() if count}
+        raise SvCycleError(find_cycle(remaining, deps))
+    return levels
@@ -0,0 +1,143 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Rolling history of update timings, the graphs made by do_update_general.
+# Pure python, no bpy here.
+
+import collections
+import json
+import statistics
+
+HISTORY_LENGTH = 1000
+
+# (tree name, graph), graph is a list of {name, bl_idname, start, duration}
+# with "error" for nodes that failed and "skipped", the failed node, for
+# nodes skipped after an error with error isolation
+history = collections.deque(maxlen=HISTORY_LENGTH)
+# last process time for nodes, {(tree name, node name): duration}
+last_durations = {}
+
+
+def record(tree_name, graph):
+    if graph:
+        history.append((tree_name, graph))
+        for item in graph:
+            if "skipped" not in item:
+                last_durations[(tree_name, item["name"])] = item["duration"]
+
+
+def clear():
+    history.clear()
+    last_durations.clear()
+
+
+def chrome_trace(entries=None):
+    """
+    Timings in chrome trace event format, load in chrome://tracing
+    Every tree is a process and every recorded graph a thread so the
+    unconnected parts of a tree are shown on separate rows.
+    """
+    if entries is None:
+        entries = history
+    events = []
+    pids = {}
+    for tid, (tree_name, graph) in enumerate(entries):
+        if tree_name not in pids:
+            pids[tree_name] = len(pids)
+            events.append({"name": "process_name", "ph": "M", "pid": pids[tree_name],
+                           "args": {"name": tree_name}})
+        for item in graph:
+            events.append({"name": item["name"],
+                           "cat": item["bl_idname"],
+                           "ph": "X",
+                           "ts": item["start"] * 1e6,
+                           "dur": item["duration"] * 1e6,
+                           "pid": pids[tree_name],
+                           "tid": tid,
+                           "args": {k: v for k, v in item.items()
+                                    if k not in {"name", "start", "duration"}}})
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def percentile(values, p):
+    """
+    Nearest rank percentile of sorted values
+    """
+    index = min(len(values) - 1, int(round(p * (len(values) - 1))))
+    return values[index]
+
+
+def node_statistics(entries=None):
+    """
+    Timing statistics per (tree name, node name) across the history,
+    {key: {"bl_idname", "count", "min", "median", "p95", "max", "total"}}
+    """
+    if entries is None:
+        entries = history
+    durations = collections.defaultdict(list)
+    idnames = {}
+    for tree_name, graph in entries:
+        for item in graph:
+            if "skipped" in item:
+                continue
+            key = (tree_name, item["name"])
+            durations[key].append(item["duration"])
+            idnames[key] = item["bl_idname"]
+    stats = {}
+    for key, values in durations.items():
+        values.sort()
+        stats[key] = {"bl_idname": idnames[key],
+                      "count": len(values),
+                      "min": values[0],
+                      "median": statistics.median(values),
+                      "p95": percentile(values, 0.95),
+                      "max": values[-1],
+                      "total": sum(values)}
+    return stats
+
+
+def statistics_table(stats=None):
+    """
+    Statistics as text, slowest nodes (by p95) first, times in ms
+    """
+    if stats is None:
+        stats = node_statistics()
+    header = "{:<20} {:<24} {:<24} {:>6} {:>9} {:>9} {:>9} {:>9}"
+    row = "{:<20} {:<24} {:<24} {:>6} {:>9.3f} {:>9.3f} {:>9.3f} {:>9.3f}"
+    lines = [header.format("tree", "node", "bl_idname", "count", "min", "median", "p95", "max")]
+    order = sorted(stats.items(), key=lambda item: item[1]["p95"], reverse=True)
+    for (tree_name, name), s in order:
+        lines.append(row.format(tree_name[:20], name[:24], s["bl_idname"][:24], s["count"],
+                                s["min"] * 1000, s["median"] * 1000,
+                                s["p95"] * 1000, s["max"] * 1000))
+    return "\n".join(lines)
+
+
+def write_chrome_trace(path):
+    with open(path, 'w') as trace_file:
+        json.dump(chrome_trace(), trace_file)
+
+
+def write_statistics(path):
+    stats = node_statistics()
+    out = []
+    for (tree_name, name), s in stats.items():
+        s.update(tree=tree_name, node=name)
+        out.append(s)
+    with open(path, 'w') as stats_file:
+        json.dump(out, stats_file, indent=2, sort_keys=True)
@@ -0,0 +1,123 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Coalescing of partial updates from property changes.
+# Nodes that change while an update is not due are collected per tree
+# and processed together in one update list by a scene update handler.
+
+import time
+
+import bpy
+from bpy.app.handlers import persistent
+
+from sverchok.core import update_system
+import sverchok
+
+enabled = False
+# seconds
+interval = 0.1
+# only update when no change has come for interval, so intermediate
+# states while dragging a slider are never processed
+latest_wins = False
+
+# {tree name: set of node names}
+pending = {}
+# {tree name: time of last update}
+last_run = {}
+# {tree name: time of last request}
+last_request = {}
+
+
+def update_settings(self, context):
+    global enabled
+    global interval
+    global latest_wins
+    enabled = self.coalesce_updates
+    interval = self.coalesce_interval / 1000
+    latest_wins = self.coalesce_latest_wins
+    if not enabled:
+        flush_all()
+
+
+def request_update(node):
+    """
+    Process from node now if the last update for the tree is older
+    than interval, otherwise when the scene update handler finds it due.
+    """
+    ng_name = node.id_data.name
+    now = time.perf_counter()
+    pending.setdefault(ng_name, set()).add(node.name)
+    last_request[ng_name] = now
+    if not latest_wins and now - last_run.get(ng_name, 0) >= interval:
+        flush(ng_name)
+
+
+def is_due(ng_name, now):
+    if latest_wins:
+        return now - last_request.get(ng_name, 0) >= interval
+    return now - last_run.get(ng_name, 0) >= interval
+
+
+def flush(ng_name):
+    names = pending.pop(ng_name, None)
+    ng = bpy.data.node_groups.get(ng_name)
+    last_run[ng_name] = time.perf_counter()
+    if not names or not ng or ng.is_frozen():
+        return
+    nodes = [ng.nodes[name] for name in sorted(names) if name in ng.nodes]
+    if nodes:
+        update_system.process_from_nodes(nodes)
+
+
+def flush_all():
+    for ng_name in list(pending):
+        flush(ng_name)
+
+
+@persistent
+def sv_scheduler_handler(scene):
+    if not pending:
+        return
+    now = time.perf_counter()
+    for ng_name in list(pending):
+        if is_due(ng_name, now):
+            flush(ng_name)
+
+
+@persistent
+def sv_scheduler_clean(scene):
+    pending.clear()
+    last_run.clear()
+    last_request.clear()
+
+
+def register():
+    addon_name = sverchok.__name__
+    addon = bpy.context.user_preferences.addons.get(addon_name)
+    if addon:
+        update_settings(addon.preferences, [])
+    bpy.app.handlers.scene_update_post.append(sv_scheduler_handler)
+    bpy.app.handlers.load_pre.append(sv_scheduler_clean)
+
+
+def unregister():
+    if sv_scheduler_handler in bpy.app.handlers.scene_update_post:
+        bpy.app.handlers.scene_update_post.remove(sv_scheduler_handler)
+    if sv_scheduler_clean in bpy.app.handlers.load_pre:
+        bpy.app.handlers.load_pre.remove(sv_scheduler_clean)
+    sv_scheduler_clean(None)
@@ -17,6 +17,10 @@
 # ##### END GPL LICENSE BLOCK #####
 
 import collections
+import contextlib
+import functools
+import hashlib
+import itertools
 import time
 
 import bpy
@@ -24,6 +28,8 @@ from mathutils import Vector
 
 from sverchok import data_structure
 from sverchok.data_structure import SvNoDataError
+from sverchok.core.toposort import topological_levels, SvCycleError
+from sverchok.core import update_profile, cache_budget, disk_cache, offload
 import sverchok
 
 import traceback
@@ -42,110 +48,202 @@ def update_error_colors(self, context):
 
 # cache node group update trees
 update_cache = {}
+# update lists of the unconnected parts of a tree merged level by level,
+# {tree name: update list}, see merge_levels
+merged_update_cache = {}
 # cache for partial update lists
 partial_update_cache = {}
+# node fingerprints for incremental partial updates
+# {tree name: {node name: fingerprint}}
+fingerprint_cache = {}
+
+
+class DepIndex:
+    """
+    Upstream and downstream dependencies for a node tree, including wifi.
+    Kept between updates, blender doesn't tell which links changed so a
+    sync rebuilds the edge counts from all links and applies the
+    difference to the stored sets. That is still a walk over all links,
+    the saving is that it only happens when the tree changed, see
+    get_dep_index, not on every make_dep_dict call.
+    """
+    def __init__(self):
+        # number of links between two nodes, {(from name, to name): count}
+        self.edges = collections.Counter()
+        self.up = collections.defaultdict(set)
+        self.down = collections.defaultdict(set)
+        self.valid = True
+        self.signature = None
+        # set when the tree reports a change the signature can't see,
+        # like a wifi var_name change
+        self.dirty = True
+
+    def add_edge(self, from_name, to_name, count=1):
+        key = (from_name, to_name)
+        self.edges[key] += count
+        self.up[to_name].add(from_name)
+        self.down[from_name].add(to_name)
+
+    def remove_edge(self, from_name, to_name, count=1):
+        key = (from_name, to_name)
+        self.edges[key] -= count
+        if self.edges[key] <= 0:
+            del self.edges[key]
+            self.up[to_name].discard(from_name)
+            self.down[from_name].discard(to_name)
+
+    def sync(self, ng):
+        """
+        Count the edges of all links of the node tree again, compare them
+        with the stored edges and apply the difference.
+        """
+        current = collections.Counter()
+        self.signature = tree_signature(ng)
+        self.dirty = False
+        self.valid = False
+        for link in list(ng.links):
+            #  this proctects against a rare occurance where
+            #  a link is considered valid without a to_socket
+            #  or a from_socket. proctects against a blender crash
+            #  see https://github.com/nortikin/sverchok/issues/493
+            if not (link.to_socket and link.from_socket):
+                ng.links.remove(link)
+                raise ValueError("Invalid link found!, please report this file")
+            if not link.is_valid:
+                return  # this happens more often than one might think
+            if link.is_hidden:
+                continue
+            current[(link.from_node.name, link.to_node.name)] += 1
+
+        # create wifi out dependencies, process if needed
+        wifi_out_nodes = [(name, node.var_name)
+                          for name, node in ng.nodes.items()
+                          if node.bl_idname == 'WifiOutNode' and node.outputs]
+        if wifi_out_nodes:
+            wifi_dict = {node.var_name: name
+                         for name, node in ng.nodes.items()
+                         if node.bl_idname == 'WifiInNode'}
+        for name, var_name in wifi_out_nodes:
+            other = wifi_dict.get(var_name)
+            if not other:
+                print("Unsatisifed Wifi dependency: node, {0} var,{1}".format(name, var_name))
+                return
+            current[(other, name)] += 1
+
+        for (from_name, to_name), count in (self.edges - current).items():
+            self.remove_edge(from_name, to_name, count)
+        for (from_name, to_name), count in (current - self.edges).items():
+            self.add_edge(from_name, to_name, count)
+        self.valid = True
+
+
+# cached dependency indices, {tree name: DepIndex}
+dep_index_cache = {}
+
+
+def tree_signature(ng):
+    """
+    Change marker for the dependency index, checked on every use of the
+    index. The node names catch renames, added and removed nodes, which
+    don't call the tree update, so this is linear in the node count but
+    doesn't touch the links. Relinking calls the tree update, which
+    syncs the index.
+    """
+    return (len(ng.links), tuple(ng.nodes.keys()))
+
+
+def invalidate_dep_index(ng):
+    """
+    Mark the dependency index of node group for a sync on next use
+    """
+    index = dep_index_cache.get(ng.name)
+    if index is not None:
+        index.dirty = True
+
+
+def update_dep_index(ng):
+    """
+    Sync the dependency index of node group with its links
+    """
+    index = dep_index_cache.get(ng.name)
+    if index is None:
+        index = DepIndex()
+        dep_index_cache[ng.name] = index
+    index.sync(ng)
+    return index
+
+
+def get_dep_index(ng):
+    """
+    Get the dependency index of node group, only synced if the tree
+    changed since last time.
+    """
+    index = dep_index_cache.get(ng.name)
+    if (index is None or not index.valid or index.dirty or
+            index.signature != tree_signature(ng)):
+        index = update_dep_index(ng)
+    return index
 
 
 def make_dep_dict(node_tree, down=False):
     """
     Create a dependency dictionary for node group.
+    The dictionary is shared with the dependency index, don't modify it.
     """
-    ng = node_tree
-    
-    deps = collections.defaultdict(set)
-   
-    # create wifi out dependencies, process if needed
-   
-    wifi_out_nodes = [(name, node.var_name)
-                  for name, node in ng.nodes.items()
-                  if node.bl_idname == 'WifiOutNode' and node.outputs]
-    if wifi_out_nodes:
-        wifi_dict = {node.var_name: name
-                     for name, node in ng.nodes.items()
-                     if node.bl_idname == 'WifiInNode'}
-        
-    for i,link in enumerate(list(ng.links)):
-        #  this proctects against a rare occurance where 
-        #  a link is considered valid without a to_socket
-        #  or a from_socket. proctects against a blender crash
-        #  see https://github.com/nortikin/sverchok/issues/493
-        if not (link.to_socket and link.from_socket):
-            ng.links.remove(link)
-            raise ValueError("Invalid link found!, please report this file")
-        if not link.is_valid:
-            return collections.defaultdict(set)  # this happens more often than one might think
-        if link.is_hidden:
-            continue
-        key, value = (link.from_node.name, link.to_node.name) if down else (link.to_node.name, link.from_node.name) 
-        deps[key].add(value)
-
-    for name, var_name in wifi_out_nodes:
-        other = wifi_dict.get(var_name)
-        if not other:
-            print("Unsatisifed Wifi dependency: node, {0} var,{1}".format(name, var_name))
-            return collections.defaultdict(set)
-        if down:
-            deps[other].add(name)
-        else:
-            deps[name].add(other)
-    
-    return deps
+    index = get_dep_index(node_tree)
+    if not index.valid:
+        return collections.defaultdict(set)
+    return index.down if down else index.up
 
 
-def make_update_list(node_tree, node_set=None, dependencies=None):
+def make_update_levels(node_tree, node_set=None, dependencies=None):
     """
-    Makes a update list from a node_group
+    Makes a list of update levels from a node_group, nodes in the same
+    level don't depend on each other.
     if a node set is passed only the subtree defined by the node set is used. Otherwise
     the complete node tree is used.
     If dependencies are not passed they are built.
     """
-
     ng = node_tree
     if not node_set:  # if no node_set, take all
         node_set = set(ng.nodes.keys())
-    if len(node_set) == 1:
-        return list(node_set)
-    if node_set:  # get one name
-        name = node_set.pop()
-        node_set.add(name)
-    else:
+    if not node_set:
         return []
+    if len(node_set) == 1:
+        return [list(node_set)]
     if not dependencies:
         deps = make_dep_dict(ng)
     else:
         deps = dependencies
+    try:
+        return topological_levels(node_set, deps)
+    except SvCycleError as err:
+        print("Invalid node tree {0}, cycle: {1}".format(ng.name, err))
+        return []
+
 
-    tree_stack = collections.deque([name])
-    tree_stack_append = tree_stack.append
-    tree_stack_pop = tree_stack.pop
-    out = collections.OrderedDict()
-    # travel in node graph create one sorted list of nodes based on dependencies
-    node_count = len(node_set)
-    while node_count > len(out):
-        node_dependencies = True
-        for dep_name in deps[name]:
-            if dep_name in node_set and dep_name not in out:
-                tree_stack_append(name)
-                name = dep_name
-                node_dependencies = False
-                break
-        if len(tree_stack) > node_count:
-            print("Invalid node tree!")
-            return []
-        # if all dependencies are in out
-        if node_dependencies:
-            if name not in out:
-                out[name] = 1
-            if tree_stack:
-                name = tree_stack_pop()
-            else:
-                if node_count == len(out):
-                    break
-                for node_name in node_set:
-                    if node_name not in out:
-                        name = node_name
-                        break
-    return list(out.keys())
+def make_update_list(node_tree, node_set=None, dependencies=None):
+    """
+    Makes a update list from a node_group
+    if a node set is passed only the subtree defined by the node set is used. Otherwise
+    the complete node tree is used.
+    If dependencies are not passed they are built.
+    """
+    levels = make_update_levels(node_tree, node_set, dependencies)
+    return [name for level in levels for name in level]
+
+
+def merge_levels(level_lists):
+    """
+    One update list for several unconnected node sets, given as lists of
+    levels, the first level of every set, then the second and so on.
+    [[[a], [b]], [[c], [d, e], [f]]] -> [a, c, b, d, e, f]
+    """
+    out = []
+    for levels in itertools.zip_longest(*level_lists, fillvalue=()):
+        for level in levels:
+            out.extend(level)
+    return out
 
 
 def separate_nodes(ng, links=None):
@@ -157,10 +255,10 @@ def separate_nodes(ng, links=None):
     nodes = set(ng.nodes.keys())
     if not nodes:
         return []
-    node_links = make_dep_dict(ng)
-    down = make_dep_dict(ng, down=True)
-    for name, links in down.items():
-        node_links[name].update(links) 
+    node_links = collections.defaultdict(set)
+    for deps in (make_dep_dict(ng), make_dep_dict(ng, down=True)):
+        for name, links in deps.items():
+            node_links[name].update(links)
     n = nodes.pop()
     node_set_list = [set([n])]
     node_stack = collections.deque()
@@ -205,7 +303,6 @@ def make_tree_from_nodes(node_names, tree, down=True):
     out_stack = collections.deque(node_names)
     current_node = out_stack.pop()
 
-    # build downwards links, this should be cached perhaps
     node_links = make_dep_dict(ng, down)
     while current_node:
         for node in node_links[current_node]:
@@ -223,26 +320,206 @@ def make_tree_from_nodes(node_names, tree, down=True):
         return make_update_list(ng, out_set)
 
 
-# to make update tree based on node types and node names bases
-# no used yet
-# should add a check do find animated or driven nodes.
-# needs some updates
+# nodes that can change with the frame without any input changing
+animation_node_types = {
+    'SvFrameInfoNode', 'SvCacheNode',
+    'SvScriptNode', 'SvScriptNodeMK2', 'SvPrototypeJS',
+    'SvGetPropNode', 'SvGetDataObjectNode', 'SvObjRemoteNode',
+    'SvObjectToMeshNode', 'SvRayCastSceneNode',
+    'SvVertexGroupNode', 'SvVertexColorNode',
+}
+# nodes that read objects, only animated if the objects are
+object_node_types = {'ObjectsNode'}
+group_node_types = {'SvGroupNode', 'SvIterationNode'}
+
+# cache for animation update lists,
+# {tree name: (frozenset of animated node names, update list)}
+animation_update_cache = {}
+
+
+def is_animated(id_block):
+    anim = getattr(id_block, "animation_data", None)
+    return bool(anim and (anim.action or anim.drivers or anim.nla_tracks))
+
+
+def object_is_animated(obj):
+    """
+    If the object, its data, shape keys, parents or constraints can change
+    with the frame
+    """
+    while obj:
+        if is_animated(obj) or obj.constraints or obj.modifiers:
+            return True
+        data = obj.data
+        if data and (is_animated(data) or is_animated(getattr(data, "shape_keys", None))):
+            return True
+        obj = obj.parent
+    return False
+
+
+def group_is_animated(group_ng):
+    """
+    If any node in the group, or in groups in it, can change with the
+    frame, including driven nodes and nodes reading animated objects
+    """
+    return group_ng is not None and bool(animation_sources(group_ng))
+
+
+def group_reads_scene(group_ng):
+    """
+    True if the output of the group can change without its inputs
+    changing, from the frame, drivers or objects in the scene
+    """
+    if driven_nodes(group_ng):
+        return True
+    for n in getattr(group_ng, "nodes", []):
+        if n.bl_idname in animation_node_types or n.bl_idname in object_node_types:
+            return True
+        if n.bl_idname in group_node_types and \
+           group_reads_scene(bpy.data.node_groups.get(n.group_name)):
+            return True
+    return False
+
+
+# update lists of group trees, {group tree name: update list}
+group_update_cache = {}
+# memoized group outputs,
+# {group tree name: OrderedDict({key: ({socket name: data}, input data)})}
+group_output_cache = {}
+GROUP_OUTPUT_CACHE_SIZE = 8
+
+
+def get_group_update_list(group_ng, out_node):
+    update_list = group_update_cache.get(group_ng.name)
+    if update_list is None:
+        update_list = make_tree_from_nodes([out_node.name], group_ng, down=False)
+        group_update_cache[group_ng.name] = update_list
+    return update_list
+
+
+def reset_group_cache(group_ng, done=None):
+    """
+    Forget the update list and memoized outputs of the group, and of
+    the groups that use it
+    """
+    if done is None:
+        done = set()
+    done.add(group_ng.name)
+    group_update_cache.pop(group_ng.name, None)
+    group_output_cache.pop(group_ng.name, None)
+    for ng in bpy.data.node_groups:
+        if ng.bl_idname != 'SverchGroupTreeType' or ng.name in done:
+            continue
+        if any(n.bl_idname in group_node_types and n.group_name == group_ng.name
+               for n in ng.nodes):
+            reset_group_cache(ng, done)
+
+
+def group_props(group_ng, h, done=None):
+    """
+    Add the properties of the nodes in the group, and in the groups
+    in it, to h, a hashlib object
+    """
+    if done is None:
+        done = set()
+    done.add(group_ng.name)
+    for node in sorted(group_ng.nodes, key=lambda n: n.name):
+        h.update(repr((node.name, node_props(node))).encode())
+        if node.bl_idname in group_node_types and node.group_name not in done:
+            nested = bpy.data.node_groups.get(node.group_name)
+            if nested is not None:
+                h.update(node.group_name.encode())
+                group_props(nested, h, done)
+
+
+def group_output_key(group_ng, inputs):
+    """
+    Key for memoized outputs of the group from its input data,
+    [(socket name, data)], and the properties of the nodes in it and
+    in nested groups. None if the group can't be memoized.
+    The input data is told apart by identity, not by content, socket
+    data is replaced when it changes. The memo keeps the input data so
+    the ids aren't reused.
+    """
+    if group_reads_scene(group_ng):
+        return None
+    h = hashlib.sha1()
+    group_props(group_ng, h)
+    return tuple((name, id(data)) for name, data in inputs), h.hexdigest()
+
+
+def get_group_outputs(group_ng, key):
+    memo = group_output_cache.get(group_ng.name)
+    if memo is None or key not in memo:
+        return None
+    memo.move_to_end(key)
+    return memo[key][0]
+
+
+def store_group_outputs(group_ng, key, outputs, inputs):
+    memo = group_output_cache.setdefault(group_ng.name, collections.OrderedDict())
+    memo[key] = (outputs, [data for name, data in inputs])
+    while len(memo) > GROUP_OUTPUT_CACHE_SIZE:
+        memo.popitem(last=False)
+
+
+def driven_nodes(ng):
+    """
+    Names of nodes with driven or animated properties
+    """
+    anim = ng.animation_data
+    if not anim:
+        return set()
+    fcurves = list(anim.drivers)
+    if anim.action:
+        fcurves.extend(anim.action.fcurves)
+    names = set()
+    for fcurve in fcurves:
+        path = fcurve.data_path
+        if path.startswith('nodes["'):
+            names.add(path[len('nodes["'):path.index('"]')])
+    return names
+
+
+def animation_sources(ng):
+    """
+    Names of nodes in the tree that can change with the frame
+    """
+    sources = {name for name in driven_nodes(ng) if name in ng.nodes}
+    objects = bpy.data.objects
+    for name, node in ng.nodes.items():
+        bl_idname = node.bl_idname
+        if bl_idname in animation_node_types:
+            sources.add(name)
+        elif bl_idname in object_node_types:
+            try:
+                obj_names = ast.literal_eval(node.objects_local)
+            except (ValueError, SyntaxError):
+                continue
+            if any(object_is_animated(objects.get(o)) for o in obj_names):
+                sources.add(name)
+        elif bl_idname in group_node_types:
+            if group_is_animated(bpy.data.node_groups.get(node.group_name)):
+                sources.add(name)
+    return sources
+
 
 def make_animation_tree(node_types, node_list, tree_name):
     """
     Create update list for specific purposes depending on which nodes are dynamic
-    node_types 
+    node_types, bl_idnames of nodes that drive the update
+    node_list, names of nodes that drives the update
     """
-    global update_cache
     ng = bpy.data.node_groups[tree_name]
     node_set = set(node_list)
     for n_t in node_types:
         node_set = node_set | {name for name, node in ng.nodes.items() if node.bl_idname == n_t}
-    a_tree = make_tree_from_nodes(list(node_set), tree_name)
-    return a_tree
+    if not node_set:
+        return []
+    return make_tree_from_nodes(list(node_set), ng)
 
 
-def do_update_heat_map(node_list, nodes):
+def do_update_heat_map(node_list, nodes, deps=None, isolate=False):
     """
     Create a heat map for the node tree, 
     Needs development.
@@ -251,9 +528,9 @@ def do_update_heat_map(node_list, nodes):
         color_data = {node.name: (node.color[:], node.use_custom_color) for node in nodes}
         nodes.id_data.sv_user_colors = str(color_data)
 
-    times = do_update_general(node_list, nodes)
+    times = do_update_general(node_list, nodes, deps=deps, isolate=isolate)
     if not times:
-        return
+        return times
     t_max = max(times)
     addon_name = data_structure.SVERCHOK_NAME
     addon = bpy.context.user_preferences.addons.get(addon_name)
@@ -269,6 +546,56 @@ def do_update_heat_map(node_list, nodes):
         nodes[name].use_custom_color = True
         # linear scale.
         nodes[name].color = cold.lerp(hot, t / t_max)
+    return times
+
+def node_props(node):
+    """
+    [(name, value)] of the properties set on node
+    """
+    props = []
+    for k, v in node.items():
+        if k == 'n_id':
+            continue
+        if not isinstance(v, (float, int, str)):
+            try:
+                v = v[:]
+            except Exception:
+                v = repr(v)
+        props.append((k, v))
+    return props
+
+
+def node_fingerprint(node, deps):
+    """
+    Fingerprint of a node from its properties and the data versions of
+    the nodes it depends on, see data_structure.node_data_version
+    """
+    props = node_props(node)
+    versions = data_structure.node_data_version.get(node.id_data.name, {})
+    upstream = tuple((name, versions.get(name, 0)) for name in sorted(deps[node.name]))
+    return props, upstream
+
+
+def fingerprint_unchanged(node, deps):
+    """
+    True if the node has the same fingerprint as last time, without
+    storing the new one
+    """
+    fingerprints = fingerprint_cache.get(node.id_data.name, {})
+    return fingerprints.get(node.name) == node_fingerprint(node, deps)
+
+
+def check_fingerprint(node, deps):
+    """
+    Store a new fingerprint for the node,
+    returns True if it has changed since last time
+    """
+    fingerprints = fingerprint_cache.setdefault(node.id_data.name, {})
+    fp = node_fingerprint(node, deps)
+    changed = fingerprints.get(node.name) != fp
+    fingerprints[node.name] = fp
+    return changed
+
 
 def update_error_nodes(ng, name, err=Exception):
     if "error nodes" in ng:
@@ -298,28 +625,120 @@ def reset_error_nodes(ng):
         del ng["error nodes"]
 
 
-def do_update_general(node_list, nodes, procesed_nodes=set()):
+def downstream_nodes(name, down):
+    """
+    Names of all nodes that depend on the node, down is a
+    downstream dependency dict
+    """
+    out = set()
+    stack = [name]
+    while stack:
+        for n in down.get(stack.pop(), ()):
+            if n not in out:
+                out.add(n)
+                stack.append(n)
+    return out
+
+
+def skip_after_error(node_name, err, graph, down, skipped):
+    """
+    Error isolation, record the error in graph and add
+    the nodes downstream of node_name to skipped
+    """
+    graph[-1]["error"] = repr(err)
+    for name in downstream_nodes(node_name, down):
+        skipped.setdefault(name, node_name)
+
+
+def refresh_evicted(node, nodes):
+    """
+    Process the nodes again whose output data node needs has been
+    evicted by the cache budget, before node is processed.
+    """
+    evicted = data_structure.evicted_sockets
+    stale = set()
+    for socket in node.inputs:
+        if socket.is_linked:
+            other = data_structure.get_other_socket(socket)
+            if data_structure.socket_id(other) in evicted:
+                stale.add(other.node.name)
+    if stale:
+        if data_structure.DEBUG_MODE:
+            print("Processing {} again for {}".format(", ".join(sorted(stale)), node.name))
+        do_update_general(make_update_list(nodes.id_data, stale), nodes)
+
+
+def do_update_general(node_list, nodes, procesed_nodes=set(), deps=None, isolate=False):
     """
     General update function for node set
+    If deps, a upstream dependency dict, is passed nodes which fingerprint
+    hasn't changed are skipped, the first node in the list is always processed
+    With error isolation, or isolate for a list of unconnected parts, nodes
+    downstream of a failed node are skipped and the rest of the list is
+    processed, otherwise processing stops.
     """
     global graphs
     timings = []
     graph = []
     total_time = 0
     done_nodes = set(procesed_nodes)
-    
-    for node_name in node_list:
+    # {skipped node: failed node upstream}
+    skipped = {}
+    # jobs of offloaded nodes, see core/offload.py
+    offloaded = {}
+
+    def is_skipped(name):
+        if name in skipped:
+            return True
+        return deps is not None and fingerprint_unchanged(nodes[name], deps)
+
+    for i, node_name in enumerate(node_list):
         if node_name in done_nodes:
             continue
+        if node_name in skipped:
+            if data_structure.DEBUG_MODE:
+                print("Skipped {} after error in {}".format(node_name, skipped[node_name]))
+            offload.discard(offloaded, node_name)
+            timings.append(0.0)
+            graph.append({"name": node_name,
+                          "bl_idname": nodes[node_name].bl_idname,
+                          "start": time.perf_counter(),
+                          "duration": 0.0,
+                          "skipped": skipped[node_name]})
+            continue
+        start = time.perf_counter()
         try:
             node = nodes[node_name]
+            if deps is not None:
+                changed = check_fingerprint(node, deps)
+                if i and not changed:
+                    if data_structure.DEBUG_MODE:
+                        print("Skipped unchanged {}".format(node_name))
+                    offload.discard(offloaded, node_name)
+                    timings.append(0.0)
+                    continue
+                if not node.outputs:
+                    # no outputs to compare, dependent nodes always update
+                    data_structure.bump_node_data_version(nodes.id_data.name, node_name)
+            if data_structure.evicted_sockets:
+                refresh_evicted(node, nodes)
             start = time.perf_counter()
             if hasattr(node, "process"):
-                node.process()
+                if offload.enabled and offload.is_offloadable(node):
+                    run = functools.partial(offload.process, node, node_list[i:],
+                                            make_dep_dict(nodes.id_data), offloaded, is_skipped)
+                else:
+                    run = node.process
+                if disk_cache.enabled:
+                    disk_cache.process(node, run)
+                else:
+                    run()
             delta = time.perf_counter() - start
             total_time += delta
             if data_structure.DEBUG_MODE:
                 print("Processed  {} in: {:.4f}".format(node_name, delta))
+                for name, socket_name in data_structure.check_shared_reads():
+                    print("Warning: {} modified shared data in socket: {}".format(name, socket_name))
             timings.append(delta)
             graph.append({"name" : node_name,
                            "bl_idname": node.bl_idname,
@@ -331,18 +750,32 @@ def do_update_general(node_list, nodes, procesed_nodes=set()):
             update_error_nodes(ng, node_name, err)
             traceback.print_tb(err.__traceback__)
             print("Node {0} had exception {1}".format(node_name, err))
-            return None
-    graphs.append(graph)    
+            if not (isolate or data_structure.ERROR_ISOLATION):
+                data_structure.clear_shared_reads()
+                return None
+            # process the node again next time even if nothing changed
+            fingerprint_cache.get(ng.name, {}).pop(node_name, None)
+            delta = time.perf_counter() - start
+            timings.append(delta)
+            graph.append({"name": node_name,
+                          "bl_idname": getattr(nodes.get(node_name), "bl_idname", ""),
+                          "start": start,
+                          "duration": delta})
+            skip_after_error(node_name, err, graph, make_dep_dict(ng, down=True), skipped)
+    graphs.append(graph)
+    update_profile.record(nodes.id_data.name, graph)
+    data_structure.clear_shared_reads()
     if data_structure.DEBUG_MODE:
         print("Node set updated in: {:.4f} seconds".format(total_time))
     return timings
     
 
-def do_update(node_list, nodes):
+def do_update(node_list, nodes, deps=None, isolate=False):
     if data_structure.HEAT_MAP:
-        do_update_heat_map(node_list, nodes)
+        return do_update_heat_map(node_list, nodes, deps, isolate)
     else:
-        do_update_general(node_list, nodes)
+        return do_update_general(node_list, nodes, deps=deps, isolate=isolate)
+
 
 def build_update_list(ng=None):
     """
@@ -358,11 +791,16 @@ def build_update_list(ng=None):
         for ng in sverchok_trees():
             build_update_list(ng)
     else:
+        update_dep_index(ng)
         node_sets = separate_nodes(ng)
         deps = make_dep_dict(ng)
-        out = [make_update_list(ng, s, deps) for s in node_sets]
+        levels = [make_update_levels(ng, s, deps) for s in node_sets]
+        out = [[name for level in l for name in level] for l in levels]
         update_cache[ng.name] = out
+        merged_update_cache[ng.name] = merge_levels(levels)
         partial_update_cache[ng.name] = {}
+        animation_update_cache.pop(ng.name, None)
+        fingerprint_cache[ng.name] = {}
         data_structure.reset_socket_cache(ng)
 
 
@@ -405,12 +843,126 @@ def process_from_node(node):
         if not update_list:
             update_list = make_tree_from_nodes([node.name], ng)
             partial_update_cache[ng.name][node.name] = update_list
-        nodes = ng.nodes
-        if not ng.sv_process:
+        do_partial_update(ng, update_list)
+    else:
+        process_tree(ng)
+
+
+def process_from_nodes(nodes):
+    """
+    Process downstream from several changed nodes, every affected node
+    is processed once. Nodes are grouped by tree and the merged update
+    list for a tree is cached under the set of node names.
+    """
+    global graphs
+    per_tree = collections.OrderedDict()
+    for node in nodes:
+        per_tree.setdefault(node.id_data.name, {})[node.name] = node
+    for ng_name, tree_nodes in per_tree.items():
+        if len(tree_nodes) == 1:
+            process_from_node(next(iter(tree_nodes.values())))
+            continue
+        graphs = []
+        ng = next(iter(tree_nodes.values())).id_data
+        reset_error_nodes(ng)
+
+        if data_structure.RELOAD_EVENT:
+            reload_sverchok()
             return
-        do_update(update_list, nodes)
+        if update_cache.get(ng.name):
+            key = frozenset(tree_nodes)
+            p_u_c = partial_update_cache.setdefault(ng.name, {})
+            update_list = p_u_c.get(key)
+            if not update_list:
+                update_list = make_tree_from_nodes(sorted(key), ng)
+                p_u_c[key] = update_list
+            do_partial_update(ng, update_list)
+        else:
+            process_tree(ng)
+
+
+# nodes changed inside batch_update, {tree name: [node names]}
+batch_nodes = collections.OrderedDict()
+batch_depth = 0
+
+
+def add_to_batch(node):
+    """
+    Collect node if a batch update is active, returns True if it was
+    """
+    if not batch_depth:
+        return False
+    names = batch_nodes.setdefault(node.id_data.name, [])
+    if node.name not in names:
+        names.append(node.name)
+    return True
+
+
+@contextlib.contextmanager
+def batch_update():
+    """
+    Property changes made in the with block are processed together
+    when it ends, with one merged update list per tree.
+
+    with batch_update():
+        for node in nodes:
+            node.count = 10
+    """
+    global batch_depth
+    batch_depth += 1
+    try:
+        yield
+    finally:
+        batch_depth -= 1
+        if not batch_depth:
+            changed = []
+            for ng_name, names in batch_nodes.items():
+                ng = bpy.data.node_groups.get(ng_name)
+                if ng and not ng.is_frozen():
+                    changed.extend(ng.nodes[name] for name in names if name in ng.nodes)
+            batch_nodes.clear()
+            if changed:
+                process_from_nodes(changed)
+
+
+def do_partial_update(ng, update_list):
+    if not ng.sv_process:
+        return
+    if data_structure.INCREMENTAL_UPDATE:
+        do_update(update_list, ng.nodes, make_dep_dict(ng))
     else:
+        do_update(update_list, ng.nodes)
+    cache_budget.enforce_budget()
+
+def process_animation(ng):
+    """
+    Frame change update, only process the nodes downstream of
+    nodes that can change with the frame.
+    """
+    global graphs
+    graphs = []
+
+    if data_structure.RELOAD_EVENT:
+        reload_sverchok()
+        return
+    if not data_structure.ANIMATION_SUBTREE or not update_cache.get(ng.name):
         process_tree(ng)
+        return
+    if not ng.sv_process:
+        return
+    sources = frozenset(animation_sources(ng))
+    cached = animation_update_cache.get(ng.name)
+    if cached and cached[0] == sources:
+        update_list = cached[1]
+    else:
+        update_list = make_animation_tree([], sources, ng.name)
+        animation_update_cache[ng.name] = (sources, update_list)
+    if not update_list:
+        return
+    reset_error_nodes(ng)
+    do_update(update_list, ng.nodes)
+    cache_budget.enforce_budget()
+
 
 def sverchok_trees():
     for ng in bpy.data.node_groups:
@@ -435,8 +987,14 @@ def process_tree(ng=None):
         if not update_list:
             build_update_list(ng)
             update_list = update_cache.get(ng.name)
-        for l in update_list:
-            do_update(l, ng.nodes)
+        if len(update_list) > 1 and offload.enabled and offload.is_supported():
+            # one list for all parts, so offloaded nodes of different
+            # parts run at the same time, see offload.start_ready
+            do_update(merged_update_cache[ng.name], ng.nodes, isolate=True)
+        else:
+            for l in update_list:
+                do_update(l, ng.nodes)
+        cache_budget.enforce_budget()
     else:
         pass
         
@@ -21,14 +21,22 @@ from math import radians
 import itertools
 import time
 import ast
+import zlib
+import hashlib
 import bpy
 from mathutils import Vector, Matrix
+import numpy as np
 
 global bmesh_mapping, per_cache
 
 DEBUG_MODE = False
 HEAT_MAP = False
 RELOAD_EVENT = False
+INCREMENTAL_UPDATE = False
+SHARED_SOCKET_DATA = False
+ANIMATION_SUBTREE = False
+VERTEX_ARRAYS = False
+ERROR_ISOLATION = False
 
 # this is set correctly later.
 SVERCHOK_NAME = "sverchok"
@@ -39,6 +47,9 @@ temp_handle = {}
 # cache_nodes = {}
 # socket cache
 socket_data_cache = {}
+# change counter per node, bumped when a node sets changed output data
+# used by incremental partial updates. {tree name: {node name: int}}
+node_data_version = {}
 # for viewer baker node cache
 cache_viewer_baker = {}
 sv_Vars = {}
@@ -194,8 +205,56 @@ def repeat_last(lst):
             yield lst[-1]
 
 
+# the fast paths below are used when all inputs are lists/tuples or all are
+# numpy arrays, they give the same result as the general zip versions.
+# lists are built with list multiplication and hold the same objects,
+# arrays are matched along the first axis and returned as arrays,
+# arrays that already have the right length are returned as is and
+# arrays of length 1 as read only broadcast views, without copying.
+
+def match_kind(lsts):
+    """
+    'list' if all lsts are lists or tuples, 'array' if all are numpy arrays
+    with at least one dimension, otherwise None
+    """
+    if all(isinstance(l, (list, tuple)) for l in lsts):
+        return 'list'
+    if all(isinstance(l, np.ndarray) and l.ndim for l in lsts):
+        return 'array'
+    return None
+
+
+def match_long_fast(lsts, kind, cycle):
+    max_l = max(len(l) for l in lsts)
+    out = []
+    for l in lsts:
+        n = len(l)
+        if kind == 'list':
+            if n == max_l:
+                out.append(list(l))
+            elif cycle:
+                out.append((list(l) * (max_l // n + 1))[:max_l])
+            else:
+                out.append(list(l) + [l[-1]] * (max_l - n))
+        else:
+            if n == max_l:
+                out.append(l)
+            elif n == 1:
+                out.append(np.broadcast_to(l, (max_l,) + l.shape[1:]))
+            elif cycle:
+                out.append(np.take(l, np.arange(max_l) % n, axis=0))
+            else:
+                out.append(np.concatenate([l, np.repeat(l[-1:], max_l - n, axis=0)]))
+    return out
+
+
 # longest list matching [[1,2,3,4,5], [10,11]] -> [[1,2,3,4,5], [10,11,11,11,11]]
 def match_long_repeat(lsts):
+    kind = match_kind(lsts)
+    if kind and lsts:
+        if not all(len(l) for l in lsts):
+            return []
+        return match_long_fast(lsts, kind, cycle=False)
     max_l = 0
     tmp = []
     for l in lsts:
@@ -210,6 +269,11 @@ def match_long_repeat(lsts):
 
 # longest list matching, cycle [[1,2,3,4,5] ,[10,11]] -> [[1,2,3,4,5] ,[10,11,10,11,10]]
 def match_long_cycle(lsts):
+    kind = match_kind(lsts)
+    if kind and lsts:
+        if not all(len(l) for l in lsts):
+            return []
+        return match_long_fast(lsts, kind, cycle=True)
     max_l = 0
     tmp = []
     for l in lsts:
@@ -244,6 +308,28 @@ def match_cross(lsts):
 # but longer and less elegant expression
 # performance difference is minimal since number of lists is usually small
 def match_cross2(lsts):
+    kind = match_kind(lsts)
+    if kind and lsts:
+        if not all(len(l) for l in lsts):
+            return []
+        # the first list changes fastest
+        lengths = [len(l) for l in lsts]
+        total = reduce(lambda a, b: a * b, lengths)
+        out = []
+        inner = 1
+        for l, n in zip(lsts, lengths):
+            outer = total // (inner * n)
+            if kind == 'list':
+                if inner == 1:
+                    out.append(list(l) * outer)
+                else:
+                    out.append(list(itertools.chain.from_iterable(
+                        itertools.repeat(x, inner) for x in l)) * outer)
+            else:
+                tiled = np.repeat(l, inner, axis=0)
+                out.append(np.tile(tiled, (outer,) + (1,) * (l.ndim - 1)))
+            inner *= n
+        return out
     return list(reversed(list(map(list, zip(*itertools.product(*reversed(lsts)))))))
 
 
@@ -283,8 +369,9 @@ def sv_zip(*iterables):
 # define data floor
 
 # data from nasting to standart: TO container( objects( lists( floats, ), ), )
-def dataCorrect(data, nominal_dept=2):
-    dept = levelsOflist(data)
+# pass shape, from socket.sv_shape(), to not scan data again
+def dataCorrect(data, nominal_dept=2, shape=None):
+    dept = shape.depth if shape else levelsOflist(data)
     output = []
     if not dept: # for empty lists 
         return []
@@ -323,12 +410,91 @@ def dataStandart(data, dept, nominal_dept):
 def levelsOflist(lst):
     level = 1
     for n in lst:
+        if isinstance(n, np.ndarray):
+            return level + n.ndim
         if n and isinstance(n, (list, tuple)):
             level += levelsOflist(n)
         return level
     return 0
 
 
+class SvDataShape:
+    """
+    Shape of data, depth as levelsOflist, type of the first leaf and
+    the length of every level when data is rectangular, otherwise None.
+    [[1,2],[3,4],[5,6]] -> SvDataShape(depth=2, leaf=int, lengths=(3, 2))
+    Finding the lengths walks all containers, when the shape is made from
+    data they are only found the first time they are asked for.
+    """
+    __slots__ = ('depth', 'leaf', '_lengths', '_data')
+
+    def __init__(self, depth, leaf, lengths=None, data=None):
+        self.depth = depth
+        self.leaf = leaf
+        self._lengths = lengths
+        self._data = data
+
+    @property
+    def lengths(self):
+        if self._data is not None:
+            self._lengths = data_lengths(self._data, self.depth)
+            self._data = None
+        return self._lengths
+
+    def __eq__(self, other):
+        if not isinstance(other, SvDataShape):
+            return NotImplemented
+        return (self.depth, self.leaf, self.lengths) == (other.depth, other.leaf, other.lengths)
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "SvDataShape(depth={!r}, leaf={!r}, lengths={!r})".format(
+            self.depth, self.leaf, self.lengths)
+
+
+def data_lengths(data, depth):
+    """
+    Length of every level of data, None if it isn't rectangular
+    """
+    lengths = []
+    level = [data]
+    for i in range(depth):
+        n = len(level[0])
+        for item in level:
+            if not isinstance(item, (list, tuple)) or len(item) != n:
+                return None
+        lengths.append(n)
+        if i < depth - 1:
+            level = [x for item in level for x in item]
+    return tuple(lengths)
+
+
+def data_shape(data):
+    """
+    SvDataShape of data, numpy arrays use ndim, dtype and shape.
+    The depth and the leaf type only follow the first items like
+    levelsOflist, the leaf type is None if one of them is empty.
+    The lengths are found when used.
+    """
+    if isinstance(data, np.ndarray):
+        return SvDataShape(data.ndim, data.dtype.type, data.shape)
+    depth = levelsOflist(data)
+    if not depth:
+        return SvDataShape(0, None, (0,))
+    leaf = data
+    for i in range(depth):
+        if not len(leaf):
+            # like the vertex array of an empty mesh, no leaf to look at
+            return SvDataShape(depth, None, data=data)
+        leaf = leaf[0]
+    return SvDataShape(depth, type(leaf), data=data)
+
+
 #####################################################
 ################### matrix magic ####################
 #####################################################
@@ -403,6 +569,31 @@ def Vector_degenerate(prop):
     return [[v[0:3] for v in obj] for obj in prop]
 
 
+# Vertex arrays, vertices as a list with a (N, 3) float array per object
+# instead of lists of 3-tuples. Only nodes with sv_vertex_arrays get them,
+# other nodes get lists, see SvGetSocket.
+
+def is_vertex_arrays(data):
+    return isinstance(data, list) and any(isinstance(obj, np.ndarray) for obj in data)
+
+
+def vertices_to_arrays(data):
+    """
+    Vertices, lists or arrays, as vertex arrays
+    """
+    return [np.asarray(obj, dtype=np.float64).reshape(-1, 3) for obj in data]
+
+
+def vertices_to_lists(data):
+    """
+    Vertex arrays as lists of 3-tuples, other data is returned as is
+    """
+    if not is_vertex_arrays(data):
+        return data
+    return [list(map(tuple, obj.tolist())) if isinstance(obj, np.ndarray) else obj
+            for obj in data]
+
+
 def Edg_pol_generate(prop):
     edg_pol_out = []
     if len(prop[0][0]) == 2:
@@ -688,6 +879,11 @@ def sverchok_debug(mode):
 def setup_init():
     global DEBUG_MODE
     global HEAT_MAP
+    global INCREMENTAL_UPDATE
+    global SHARED_SOCKET_DATA
+    global ANIMATION_SUBTREE
+    global VERTEX_ARRAYS
+    global ERROR_ISOLATION
     global SVERCHOK_NAME
     import sverchok
     SVERCHOK_NAME = sverchok.__name__
@@ -695,6 +891,11 @@ def setup_init():
     if addon:
         DEBUG_MODE = addon.preferences.show_debug
         HEAT_MAP = addon.preferences.heat_map
+        INCREMENTAL_UPDATE = addon.preferences.incremental_update
+        SHARED_SOCKET_DATA = addon.preferences.shared_socket_data
+        ANIMATION_SUBTREE = addon.preferences.animation_subtree
+        VERTEX_ARRAYS = addon.preferences.vertex_arrays
+        ERROR_ISOLATION = addon.preferences.error_isolation
     else:
         print("Setup of preferences failed")
     
@@ -910,9 +1111,59 @@ def multi_socket(node, min=1, start=0, breck=False, out_count=None):
 
 
 # socket.name is not unique... identifier is
+# Sockets get a integer key, allocated once per (tree, node, identifier) and
+# looked up from the socket pointer after that. The pointer lookup is
+# cleared on topology change and undo, since pointers might be reused,
+# and checked against the names when setting data.
+socket_keys = {}
+socket_name_keys = {}
+# {key: (tree name, node name, identifier)}
+socket_key_names = {}
+socket_key_counter = itertools.count()
+
+
 def socket_id(socket):
-    #return hash(socket)
-    return str(hash(socket.id_data.name + socket.node.name + socket.identifier))+socket.node.name+socket.name
+    ptr = socket.as_pointer()
+    key = socket_keys.get(ptr)
+    if key is None:
+        name = (socket.id_data.name, socket.node.name, socket.identifier)
+        key = socket_name_keys.get(name)
+        if key is None:
+            key = next(socket_key_counter)
+            socket_name_keys[name] = key
+            socket_key_names[key] = name
+        socket_keys[ptr] = key
+    return key
+
+
+def reset_socket_keys():
+    """
+    Forget socket pointers, keys are found again from the names.
+    """
+    socket_keys.clear()
+
+
+def prune_socket_keys(ng):
+    """
+    Drop the keys of sockets that are no longer in node group, and of
+    trees that have been removed or renamed, with everything stored
+    under them.
+    """
+    trees = bpy.data.node_groups
+    live = {(ng.name, node.name, socket.identifier)
+            for node in ng.nodes
+            for socket in itertools.chain(node.inputs, node.outputs)}
+    dead = [key for key, name in socket_key_names.items()
+            if (name[0] == ng.name and name not in live) or name[0] not in trees]
+    for key in dead:
+        del socket_name_keys[socket_key_names.pop(key)]
+        socket_data_access.pop(key, None)
+        socket_data_shape.pop(key, None)
+        socket_data_lists.pop(key, None)
+        evicted_sockets.discard(key)
+    for name in [name for name in socket_data_cache if name not in trees]:
+        del socket_data_cache[name]
+
 
 # For when need a key for use with dict in node
 #  create a string property like this.
@@ -937,7 +1188,6 @@ def node_id(node):
 
 
 def SvGetSocketAnyType(self, socket, default=None, deepcopy=True):
-    out = SvGetSocket(socket, deepcopy)
     if socket.is_linked:
         return SvGetSocket(socket, deepcopy)
     elif default:
@@ -957,17 +1207,94 @@ def SvSetSocketAnyType(self, socket_name, out):
 
 def sv_deep_copy(lst):
     if isinstance(lst, (list, tuple)):
-        if lst and not isinstance(lst[0], (list, tuple)):
+        if lst and not isinstance(lst[0], (list, tuple, np.ndarray)):
             return lst[:]
         return [sv_deep_copy(l) for l in lst]
+    if isinstance(lst, np.ndarray):
+        return lst.copy()
     return lst
 
 
+# Sockets whose data has been evicted by core/cache_budget.py, the update
+# system processes the node again before a node that needs the data.
+# {socket key}
+evicted_sockets = set()
+# {socket key: (id of data, SvDataShape)}, see SvGetSocketShape
+socket_data_shape = {}
+# vertex arrays converted for nodes without sv_vertex_arrays,
+# {socket key: (id of data, lists)}
+socket_data_lists = {}
+# last access of socket data, {socket key: tick}
+socket_data_access = {}
+socket_access_counter = itertools.count()
+
+
+# In shared socket data mode nodes with sv_input_readonly get data without
+# a copy. In debug mode every read without a copy is recorded,
+# (node name, socket name, tree name, socket id, checksum), and checked
+# after the node has processed to find nodes modifying shared data.
+shared_reads = []
+
+
+def data_hash(data, h=None):
+    """
+    sha1 hash of socket data, for memoizing results by their input.
+    Pass h, a hashlib object, to add data to it.
+    """
+    top = h is None
+    if top:
+        h = hashlib.sha1()
+    if isinstance(data, np.ndarray):
+        h.update(repr((data.shape, data.dtype.str)).encode())
+        h.update(np.ascontiguousarray(data).tobytes())
+    elif isinstance(data, (list, tuple)) and data and (
+            isinstance(data[0], np.ndarray) or
+            (isinstance(data[0], (list, tuple)) and data[0] and
+             isinstance(data[0][0], (list, tuple, np.ndarray)))):
+        # only walk down to where arrays could be, repr the rest
+        h.update(b'[')
+        for item in data:
+            data_hash(item, h)
+        h.update(b']')
+    else:
+        # repr of numbers, vectors and matrices is exact
+        h.update(repr(data).encode())
+        h.update(b',')
+    return h.hexdigest() if top else h
+
+
+def data_checksum(data):
+    if hasattr(data, 'tobytes'):
+        return zlib.crc32(data.tobytes())
+    return zlib.crc32(repr(data).encode())
+
+
+def check_shared_reads():
+    """
+    Verify that data read without a copy since last check is unchanged,
+    returns a list of (node name, socket name) that have modified it.
+    """
+    global shared_reads
+    reads, shared_reads = shared_reads, []
+    modified = []
+    for node_name, socket_name, s_ng, s_id, checksum in reads:
+        data = socket_data_cache.get(s_ng, {}).get(s_id)
+        if data_checksum(data) != checksum:
+            modified.append((node_name, socket_name))
+    return modified
+
+
+def clear_shared_reads():
+    """
+    Drop the reads of failed nodes, called after every update pass
+    """
+    del shared_reads[:]
+
+
 # Build string for showing in socket label
 def SvGetSocketInfo(socket):
 
     global socket_data_cache
-    ng = socket.id_data.name
     
     if socket.is_output:
         s_id = socket_id(socket)
@@ -975,6 +1302,7 @@ def SvGetSocketInfo(socket):
         s_id = socket_id(get_other_socket(socket))
     else:
         return ''
+    ng = socket_key_names[s_id][0]
     if ng in socket_data_cache:
         if s_id in socket_data_cache[ng]:
             data = socket_data_cache[ng][s_id]
@@ -983,17 +1311,57 @@ def SvGetSocketInfo(socket):
     return ''
 
 
-def SvSetSocket(socket, out):
+def sv_data_changed(old, new):
+    """
+    Compare previous and new socket data, used for incremental updates.
+    The same object could have been modified in place so it counts as changed,
+    as does data that can't be compared, like numpy arrays.
+    """
+    if old is new:
+        return True
+    try:
+        return bool(old != new)
+    except Exception:
+        return True
+
+
+def bump_node_data_version(ng_name, node_name):
+    versions = node_data_version.setdefault(ng_name, {})
+    versions[node_name] = versions.get(node_name, 0) + 1
+
+
+def set_socket_data(s_ng, node_name, s_id, out, shape=None):
     global socket_data_cache
+    if s_ng not in socket_data_cache:
+        socket_data_cache[s_ng] = {}
+    if INCREMENTAL_UPDATE:
+        old = socket_data_cache[s_ng].get(s_id, None)
+        if old is None or sv_data_changed(old, out):
+            bump_node_data_version(s_ng, node_name)
+    socket_data_cache[s_ng][s_id] = out
+    socket_data_access[s_id] = next(socket_access_counter)
+    evicted_sockets.discard(s_id)
+    socket_data_lists.pop(s_id, None)
+    if shape is None:
+        socket_data_shape.pop(s_id, None)
+    else:
+        socket_data_shape[s_id] = (id(out), shape)
+
+
+def SvSetSocket(socket, out, shape=None):
     if not socket.is_output:
         print("Warning, {} setting input socket: {}".format(socket.node.name, socket.name))
     if not socket.is_linked:
         print("Warning: {} setting unconncted socket: {}".format(socket.node.name, socket.name))
     s_id = socket_id(socket)
-    s_ng = socket.id_data.name
-    if s_ng not in socket_data_cache:
-        socket_data_cache[s_ng] = {}
-    socket_data_cache[s_ng][s_id] = out
+    s_ng, node_name, identifier = socket_key_names[s_id]
+    if (node_name != socket.node.name or identifier != socket.identifier or
+            s_ng != socket.id_data.name):
+        # node or tree has been renamed or the pointer reused, get a new key
+        del socket_keys[socket.as_pointer()]
+        s_id = socket_id(socket)
+        s_ng, node_name, identifier = socket_key_names[s_id]
+    set_socket_data(s_ng, node_name, s_id, out, shape)
 
 
 def SvGetSocket(socket, deepcopy=True):
@@ -1002,15 +1370,26 @@ def SvGetSocket(socket, deepcopy=True):
     if socket.is_linked:
         other = get_other_socket(socket)
         s_id = socket_id(other)
-        s_ng = other.id_data.name
+        s_ng = socket_key_names[s_id][0]
         if s_ng not in socket_data_cache:
             raise LookupError
         if s_id in socket_data_cache[s_ng]:
             out = socket_data_cache[s_ng][s_id]
+            socket_data_access[s_id] = next(socket_access_counter)
+            if is_vertex_arrays(out) and not getattr(socket.node, 'sv_vertex_arrays', False):
+                memo = socket_data_lists.get(s_id)
+                if memo and memo[0] == id(out):
+                    out = memo[1]
+                else:
+                    socket_data_lists[s_id] = (id(out), vertices_to_lists(out))
+                    out = socket_data_lists[s_id][1]
+            if deepcopy and SHARED_SOCKET_DATA:
+                deepcopy = not getattr(socket.node, 'sv_input_readonly', False)
             if deepcopy:
                 return sv_deep_copy(out)
-            else:
-                return out
+            if DEBUG_MODE:
+                shared_reads.append((socket.node.name, socket.name, s_ng, s_id, data_checksum(out)))
+            return out
         else:
             if DEBUG_MODE:
                 print("cache miss:", socket.node.name, "->", socket.name, "from:", other.node.name, "->", other.name)
@@ -1021,12 +1400,42 @@ def SvGetSocket(socket, deepcopy=True):
 class SvNoDataError(LookupError):
     pass
 
+
+def SvGetSocketShape(socket):
+    """
+    SvDataShape of the data in socket, or of the output linked to it,
+    None if there is no data. The shape is passed to sv_set or found
+    once per data and remembered.
+    """
+    if socket.is_output:
+        s_id = socket_id(socket)
+    elif socket.is_linked:
+        s_id = socket_id(get_other_socket(socket))
+    else:
+        return None
+    data = socket_data_cache.get(socket_key_names[s_id][0], {}).get(s_id)
+    if data is None:
+        return None
+    memo = socket_data_shape.get(s_id)
+    if memo and memo[0] == id(data):
+        return memo[1]
+    shape = data_shape(data)
+    socket_data_shape[s_id] = (id(data), shape)
+    return shape
+
 def reset_socket_cache(ng):
     """
     Reset socket cache either for node group.
     """
     global socket_data_cache
+    for s_id in socket_data_cache.get(ng.name, {}):
+        socket_data_shape.pop(s_id, None)
+        socket_data_lists.pop(s_id, None)
     socket_data_cache[ng.name] = {}
+    reset_socket_keys()
+    prune_socket_keys(ng)
+    for s_id in [s_id for s_id in evicted_sockets if socket_key_names[s_id][0] == ng.name]:
+        evicted_sockets.discard(s_id)
         
 
 ####################################
@@ -27,11 +27,15 @@ from bpy.types import NodeTree, NodeSocket, NodeSocketStandard
 from sverchok import data_structure
 from sverchok.data_structure import (SvGetSocketInfo, SvGetSocket,
                                      SvSetSocket, updateNode,
-                                     get_other_socket, SvNoDataError)
+                                     get_other_socket, SvNoDataError,
+                                     SvGetSocketShape)
 
 from sverchok.core.update_system import (build_update_list, process_from_node,
                                          process_tree, get_update_lists,
-                                         update_error_nodes)
+                                         update_error_nodes, update_dep_index,
+                                         process_animation, add_to_batch,
+                                         reset_group_cache)
+from sverchok.core import update_scheduler
 from sverchok.ui import color_def
 
 sentinel = object()
@@ -67,8 +71,11 @@ class MatrixSocket(NodeSocket):
         else:
             return default
 
-    def sv_set(self, data):
-        SvSetSocket(self, data)
+    def sv_set(self, data, shape=None):
+        SvSetSocket(self, data, shape)
+
+    def sv_shape(self):
+        return SvGetSocketShape(self)
 
     def draw(self, context, layout, node, text):
         if self.is_linked:
@@ -105,8 +112,11 @@ class VerticesSocket(NodeSocket):
         else:
             return default
             
-    def sv_set(self, data):
-        SvSetSocket(self, data)
+    def sv_set(self, data, shape=None):
+        SvSetSocket(self, data, shape)
+
+    def sv_shape(self):
+        return SvGetSocketShape(self)
 
     def draw(self, context, layout, node, text):
         if not self.is_output and not self.is_linked:
@@ -148,8 +158,11 @@ class StringsSocket(NodeSocketStandard):
         else:
             raise SvNoDataError
 
-    def sv_set(self, data):
-        SvSetSocket(self, data)
+    def sv_set(self, data, shape=None):
+        SvSetSocket(self, data, shape)
+
+    def sv_shape(self):
+        return SvGetSocketShape(self)
 
     def draw(self, context, layout, node, text):
         if self.prop_name:
@@ -276,7 +289,7 @@ class SverchCustomTree(NodeTree, SvNodeTreeCommon):
         Updates the Sverchok node tree if animation layers show true. For animation callback
         """
         if self.sv_animate:
-            process_tree(self)
+            process_animation(self)
 
 
 class SverchGroupTree(NodeTree, SvNodeTreeCommon):
@@ -293,6 +306,8 @@ class SverchGroupTree(NodeTree, SvNodeTreeCommon):
         if self.is_frozen():
             return
         self.adjust_reroutes()
+        update_dep_index(self)
+        reset_group_cache(self)
 
     @classmethod
     def poll(cls, context):
@@ -300,6 +315,16 @@ class SverchGroupTree(NodeTree, SvNodeTreeCommon):
 
 
 class SverchCustomTreeNode:
+    # nodes that never modify data from their input sockets can set this,
+    # with shared socket data they get it without a copy
+    sv_input_readonly = False
+    # nodes that can use vertex arrays, (N, 3) numpy arrays per object,
+    # other nodes get vertices as lists, see data_structure.vertices_to_lists
+    sv_vertex_arrays = False
+    # nodes with sv_offload_job and sv_offload_done can set this to be
+    # processed in worker processes, see core/offload.py
+    sv_offload = False
+
     @classmethod
     def poll(cls, ntree):
         return ntree.bl_idname in ['SverchCustomTreeType', 'SverchGroupTreeType']
@@ -337,7 +362,11 @@ class SverchCustomTreeNode:
         '''
         if self.id_data.is_frozen():
             return
-        if data_structure.DEBUG_MODE:
+        if add_to_batch(self):
+            return
+        if update_scheduler.enabled:
+            update_scheduler.request_update(self)
+        elif data_structure.DEBUG_MODE:
             a = time.perf_counter()
             process_from_node(self)
             b = time.perf_counter()
@@ -16,13 +16,30 @@
 #
 # ##### END GPL LICENSE BLOCK #####
 
-from ast import literal_eval
+import os
+import shutil
+import tempfile
 
 import bpy
 from bpy.props import BoolProperty, StringProperty, IntProperty
 
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode, node_id, changable_sockets
+from sverchok.utils.sv_data_io import save_frame, load_frame
+
+
+class SvCacheNodeClear(bpy.types.Operator):
+    """ Clear the frames cached in memory and on disk """
+    bl_idname = "node.sv_cache_node_clear"
+    bl_label = "Clear cache"
+
+    idname = StringProperty(name='idname', default='')
+    idtree = StringProperty(name='idtree', default='')
+
+    def execute(self, context):
+        node = bpy.data.node_groups[self.idtree].nodes[self.idname]
+        node.clear_cache()
+        return {'FINISHED'}
 
 
 class SvCacheNode(bpy.types.Node, SverchCustomTreeNode):
@@ -34,9 +51,18 @@ class SvCacheNode(bpy.types.Node, SverchCustomTreeNode):
 
     n_id = StringProperty()
     
-    cache_amount = IntProperty(default=1, min=0)
+    cache_amount = IntProperty(name="Frames", default=1, min=1,
+                               description="Frames up to the offset frame kept in memory",
+                               update=updateNode)
     cache_offset = IntProperty(default=1, min=0)
+    cache_spill = BoolProperty(name="Spill to disk", default=False,
+                               description="Write frames outside the window to disk and read them back when needed",
+                               update=updateNode)
+    spill_dir = StringProperty(name="Directory", default="//sv_cache", subtype='DIR_PATH')
+    # {n_id: {frame: data}}, frames in memory
     node_dict = {}
+    # {n_id: set of frames}, frames in memory that are the same on disk
+    on_disk = {}
     
     def sv_init(self, context):
         self.inputs.new("StringsSocket", "Data")
@@ -44,10 +70,50 @@ class SvCacheNode(bpy.types.Node, SverchCustomTreeNode):
 
     def draw_buttons(self, context, layout):
         layout.prop(self, "cache_offset")
+        layout.prop(self, "cache_amount")
+        layout.prop(self, "cache_spill")
+        if self.cache_spill:
+            layout.prop(self, "spill_dir", text="")
+        op = layout.operator("node.sv_cache_node_clear")
+        op.idname = self.name
+        op.idtree = self.id_data.name
 
     def update(self):
         changable_sockets(self, "Data", ["Data"])
-        
+
+    def spill_directory(self):
+        if bpy.data.filepath:
+            base = bpy.path.abspath(self.spill_dir)
+        else:
+            base = os.path.join(tempfile.gettempdir(), "sv_cache")
+        return os.path.join(base, node_id(self))
+
+    def clear_cache(self):
+        n_id = node_id(self)
+        self.node_dict.pop(n_id, None)
+        self.on_disk.pop(n_id, None)
+        shutil.rmtree(self.spill_directory(), ignore_errors=True)
+        updateNode(self, None)
+
+    def evict(self, data, frame_current):
+        """
+        Drop frames outside the window, writing them to disk first
+        when spilling is on
+        """
+        n_id = node_id(self)
+        on_disk = self.on_disk.setdefault(n_id, set())
+        first = frame_current - self.cache_offset - self.cache_amount + 1
+        for frame in [f for f in data if not first <= f <= frame_current]:
+            if self.cache_spill and frame not in on_disk:
+                try:
+                    save_frame(self.spill_directory(), frame, data[frame])
+                except (OSError, TypeError, ValueError) as err:
+                    # keep the frame in memory
+                    print("Cache node {}, could not write frame {}: {}".format(self.name, frame, err))
+                    continue
+            del data[frame]
+            on_disk.discard(frame)
+
     def process(self):
         n_id = node_id(self)
         data = self.node_dict.get(n_id)
@@ -58,12 +124,22 @@ class SvCacheNode(bpy.types.Node, SverchCustomTreeNode):
         frame_current = bpy.context.scene.frame_current
         out_frame = frame_current - self.cache_offset
         data[frame_current] = self.inputs[0].sv_get()
-        out_data = data.get(out_frame, [])
+        self.on_disk.setdefault(n_id, set()).discard(frame_current)
+        self.evict(data, frame_current)
+        out_data = data.get(out_frame)
+        if out_data is None and self.cache_spill:
+            out_data = load_frame(self.spill_directory(), out_frame)
+            if out_data is not None:
+                data[out_frame] = out_data
+                self.on_disk[n_id].add(out_frame)
+        if out_data is None:
+            out_data = []
         self.outputs[0].sv_set(out_data)
 
 def register():
+    bpy.utils.register_class(SvCacheNodeClear)
     bpy.utils.register_class(SvCacheNode)
 
 def unregister():
     bpy.utils.unregister_class(SvCacheNode)
-
+    bpy.utils.unregister_class(SvCacheNodeClear)
@@ -16,12 +16,19 @@
 #
 # ##### END GPL LICENSE BLOCK #####
 
+import itertools
+import time
+
 import bpy
-from bpy.props import StringProperty, EnumProperty, IntProperty
+import numpy as np
+from bpy.props import StringProperty, EnumProperty, IntProperty, FloatProperty
 
 from sverchok.node_tree import SverchCustomTreeNode
-from sverchok.data_structure import multi_socket, node_id, replace_socket
-from sverchok.core.update_system import make_tree_from_nodes, do_update
+from sverchok.data_structure import (multi_socket, node_id, replace_socket, updateNode,
+                                     socket_id, get_other_socket, set_socket_data,
+                                     socket_data_cache, SvNoDataError)
+from sverchok.core.update_system import (do_update, get_group_update_list, reset_error_nodes,
+                                         group_output_key, get_group_outputs, store_group_outputs)
 import ast
 
 
@@ -198,18 +205,28 @@ class SvGroupNode(bpy.types.Node, SverchCustomTreeNode, StoreSockets):
         group_ng = bpy.data.node_groups[self.group_name]
         in_node = find_node("SvGroupInputsNode", group_ng)
         out_node = find_node('SvGroupOutputsNode', group_ng)
-        for socket in self.inputs:
-            if socket.is_linked:
-                data = socket.sv_get(deepcopy=False)
-                in_node.outputs[socket.name].sv_set(data)
-        #  get update list
-        #  could be cached
-        ul = make_tree_from_nodes([out_node.name], group_ng, down=False)
-        do_update(ul, group_ng.nodes)
+        inputs = [(socket.name, socket.sv_get(deepcopy=False))
+                  for socket in self.inputs if socket.is_linked]
+        # instances of the group reading the same data share the result
+        key = group_output_key(group_ng, inputs)
+        outputs = get_group_outputs(group_ng, key) if key else None
+        if outputs is None:
+            for name, data in inputs:
+                in_node.outputs[name].sv_set(data)
+            reset_error_nodes(group_ng)
+            ul = get_group_update_list(group_ng, out_node)
+            do_update(ul, group_ng.nodes)
+            outputs = {socket.name: socket.sv_get(deepcopy=False)
+                       for socket in out_node.inputs if socket.is_linked}
+            if key and "error nodes" not in group_ng:
+                store_group_outputs(group_ng, key, outputs, inputs)
         # set output sockets correctly
         for socket in self.outputs:
             if socket.is_linked:
-                data = out_node.inputs[socket.name].sv_get(deepcopy=False)
+                if socket.name in outputs:
+                    data = outputs[socket.name]
+                else:
+                    data = out_node.inputs[socket.name].sv_get(deepcopy=False)
                 socket.sv_set(data)
     
     def load(self):
@@ -232,6 +249,38 @@ def find_node(id_name, ng):
             return n
     raise NotFoundErr
     
+def flat_values(data):
+    if isinstance(data, np.ndarray):
+        return data.ravel()
+    if isinstance(data, (list, tuple)):
+        return itertools.chain.from_iterable(
+            flat_values(d) if isinstance(d, (list, tuple, np.ndarray)) else (d,) for d in data)
+    return (data,)
+
+
+def max_difference(a, b):
+    """
+    Largest absolute difference between the numbers in a and b,
+    inf if they don't have the same structure
+    """
+    if a is None or b is None:
+        return float("inf")
+    try:
+        a = np.fromiter(flat_values(a), dtype=np.float64)
+        b = np.fromiter(flat_values(b), dtype=np.float64)
+    except (TypeError, ValueError):
+        return float("inf")
+    if a.shape != b.shape:
+        return float("inf")
+    if not a.size:
+        return 0.0
+    return float(np.abs(a - b).max())
+
+
+# last run of iteration nodes, {(tree name, node name): {"iterations", "converged", "timings"}}
+iteration_stats = {}
+
+
 class SvIterationNode(bpy.types.Node, SverchCustomTreeNode, StoreSockets):
     bl_idname = 'SvIterationNode'
     bl_label = 'Group Inputs'
@@ -239,6 +288,20 @@ class SvIterationNode(bpy.types.Node, SverchCustomTreeNode, StoreSockets):
     
     iter_count = IntProperty(name="Count")
     group_name = StringProperty()
+
+    convergence_modes = [
+        ("NONE", "Count", "Always run Count iterations"),
+        ("TOLERANCE", "Tolerance", "Stop when the watched output changes less than tolerance"),
+        ("PREDICATE", "Predicate", "Stop when the expression is true, with prev, data and i")]
+
+    convergence = EnumProperty(name="Stop", items=convergence_modes,
+                               default="NONE", update=updateNode)
+    watch_socket = StringProperty(name="Watch", description="Output to test, default the first",
+                                  update=updateNode)
+    tolerance = FloatProperty(name="Tolerance", default=1e-4, min=0.0,
+                              precision=6, update=updateNode)
+    predicate = StringProperty(name="Predicate", default="max_difference(prev, data) < 1e-4",
+                               update=updateNode)
     
     def update(self):
         '''
@@ -251,6 +314,19 @@ class SvIterationNode(bpy.types.Node, SverchCustomTreeNode, StoreSockets):
             op = layout.operator("node.sv_node_group_edit")
             op.group_name = self.group_name
             layout.prop(self, "iter_count")
+            layout.prop(self, "convergence", text="")
+            if self.convergence != "NONE":
+                layout.prop_search(self, "watch_socket", self, "outputs", text="")
+            if self.convergence == "TOLERANCE":
+                layout.prop(self, "tolerance")
+            elif self.convergence == "PREDICATE":
+                layout.prop(self, "predicate", text="")
+            stats = iteration_stats.get((self.id_data.name, self.name))
+            if stats and stats["timings"]:
+                msg = "{} iterations{}, {:.2f} ms each".format(
+                    stats["iterations"], " (converged)" if stats["converged"] else "",
+                    1000 * sum(stats["timings"]) / len(stats["timings"]))
+                layout.label(msg)
             
     def adjust_sockets(self, nodes):
         swap = {"inputs":"outputs",
@@ -269,22 +345,54 @@ class SvIterationNode(bpy.types.Node, SverchCustomTreeNode, StoreSockets):
         group_ng = bpy.data.node_groups[self.group_name]
         in_node = find_node("SvGroupInputsNode", group_ng)
         out_node = find_node('SvGroupOutputsNode', group_ng)
-        ul = make_tree_from_nodes([out_node.name], group_ng, down=False)
+        ul = get_group_update_list(group_ng, out_node)
 
         for socket in self.inputs:
             if socket.is_linked:
                 data = socket.sv_get(deepcopy=False)
                 in_node.outputs[socket.name].sv_set(data)
-        #  get update list
-        #  could be cached
+
+        # loop state goes straight from the socket cache entries feeding
+        # the outputs node to the ones of the inputs node,
+        # [(name, from socket key, to socket key)]
+        carried = [(socket.name, socket_id(get_other_socket(socket)),
+                    socket_id(in_node.outputs[socket.name]))
+                   for socket in out_node.inputs
+                   if socket.is_linked and socket.name in in_node.outputs]
+        watched = None
+        if self.convergence != "NONE":
+            linked = [socket for socket in out_node.inputs if socket.is_linked]
+            watch = self.watch_socket or (linked[0].name if linked else "")
+            watched = out_node.inputs.get(watch)
+            if watched is None or not watched.is_linked:
+                raise SvNoDataError("Nothing linked to watched output {!r}".format(watch))
+        if self.convergence == "PREDICATE":
+            predicate = compile(self.predicate, "<iteration predicate>", "eval")
+        previous = None
+        timings = []
+        converged = False
         for i in range(self.iter_count):
+            start = time.perf_counter()
             do_update(ul, group_ng.nodes)
-            for socket in out_node.inputs:
-                if socket.is_linked:
-                    data = out_node.inputs[socket.name].sv_get(deepcopy=False)
-                    socket.sv_set(data)
-                    in_node.outputs[socket.name].sv_set(data)
-                
+            cache = socket_data_cache.get(group_ng.name, {})
+            for name, from_id, to_id in carried:
+                if from_id not in cache:
+                    raise SvNoDataError
+                set_socket_data(group_ng.name, in_node.name, to_id, cache[from_id])
+            # outputs that aren't carried back can be watched too
+            current = watched.sv_get(deepcopy=False) if watched else None
+            timings.append(time.perf_counter() - start)
+            if self.convergence == "TOLERANCE":
+                converged = max_difference(previous, current) < self.tolerance
+            elif self.convergence == "PREDICATE" and previous is not None:
+                converged = bool(eval(predicate, {"np": np, "max_difference": max_difference},
+                                      {"prev": previous, "data": current, "i": i}))
+            if converged:
+                break
+            previous = current
+        iteration_stats[(self.id_data.name, self.name)] = {
+            "iterations": len(timings), "converged": converged, "timings": timings}
+
         # set output sockets correctly
         for socket in self.outputs:
             if socket.is_linked:
@@ -19,11 +19,13 @@
 from ast import literal_eval
 
 import bpy
+import numpy as np
 from bpy.props import BoolProperty, StringProperty
 
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import (handle_read, handle_write, handle_delete,
                             SvSetSocketAnyType, updateNode)
+from sverchok import data_structure
 import sverchok
 
 class SvObjSelected(bpy.types.Operator):
@@ -199,10 +201,17 @@ class ObjectsNode(bpy.types.Node, SverchCustomTreeNode):
 
                     for m in obj.matrix_world:
                         mtrx.append(list(m))
-                    for k, v in enumerate(obj_data.vertices):
-                        if self.vergroups and v.groups.values():
-                            vers_grouped.append(k)
-                        vers.append(list(v.co))
+                    if data_structure.VERTEX_ARRAYS:
+                        vers = np.empty(len(obj_data.vertices) * 3)
+                        obj_data.vertices.foreach_get('co', vers)
+                        vers.shape = (-1, 3)
+                        if self.vergroups:
+                            vers_grouped = [k for k, v in enumerate(obj_data.vertices) if v.groups.values()]
+                    else:
+                        for k, v in enumerate(obj_data.vertices):
+                            if self.vergroups and v.groups.values():
+                                vers_grouped.append(k)
+                            vers.append(list(v.co))
                     edgs = obj_data.edge_keys
                     for p in obj_data.polygons:
                         pols.append(list(p.vertices))
@@ -214,7 +223,7 @@ class ObjectsNode(bpy.types.Node, SverchCustomTreeNode):
                 vers_out_grouped.append(vers_grouped)
                 pols_out.append(pols)
                 mtrx_out.append(mtrx)
-            if vers_out[0]:
+            if len(vers_out[0]):
 
                 if self.outputs['Vertices'].is_linked:
                     SvSetSocketAnyType(self, 'Vertices', vers_out)
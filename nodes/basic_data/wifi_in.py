@@ -21,6 +21,7 @@ from bpy.props import StringProperty, BoolProperty
 
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import multi_socket
+from sverchok.core.update_system import invalidate_dep_index
 
 # Warning, changing this node without modifying the update system might break functionlaity
 # bl_idname and var_name is used by the update system
@@ -53,6 +54,7 @@ class WifiInNode(bpy.types.Node, SverchCustomTreeNode):
                     return
         # name is unique, store it.
         self.base_name = self.var_name
+        invalidate_dep_index(ng)
         if self.inputs: # if we have inputs, rename
             for i, s in enumerate(self.inputs):
                 s.name = "{0}[{1}]".format(self.var_name, i)
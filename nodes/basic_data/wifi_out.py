@@ -21,6 +21,7 @@ from bpy.props import StringProperty, EnumProperty
 
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode, SvSetSocketAnyType, SvGetSocketAnyType
+from sverchok.core.update_system import invalidate_dep_index
 
 # Warning, changing this node without modifying the update system might break functionlaity
 # bl_idname and var_name is used by the update system
@@ -48,6 +49,7 @@ class WifiOutNode(bpy.types.Node, SverchCustomTreeNode):
     def set_var_name(self):
         self.var_name = self.var_names
         ng = self.id_data
+        invalidate_dep_index(ng)
         wifi_dict = {node.var_name: node
                      for node in ng.nodes
                      if node.bl_idname == 'WifiInNode'}
@@ -62,6 +64,7 @@ class WifiOutNode(bpy.types.Node, SverchCustomTreeNode):
     def reset_var_name(self):
         self.var_name = ""
         self.outputs.clear()
+        invalidate_dep_index(self.id_data)
 
     def draw_buttons(self, context, layout):
         op_name = 'node.sverchok_text_callback'
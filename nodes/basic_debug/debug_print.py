@@ -28,6 +28,7 @@ class SvDebugPrintNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvDebugPrintNode'
     bl_label = 'Debug print'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_input_readonly = True
 
     # I wanted to show the bool so you could turn off and on individual sockets
     # but needs changes in node_s, want to think a bit more before adding an index option to
@@ -21,6 +21,7 @@
 import itertools
 
 import bpy
+import numpy as np
 from bpy.props import BoolProperty, StringProperty, BoolVectorProperty
 from mathutils import Matrix, Vector
 
@@ -75,10 +76,15 @@ def make_bmesh_geometry(node, idx, context, verts, *topology):
         vertices, this mode can be switched to to increase efficiency
     '''
     if node.fixed_verts and difference == 0:
-        f_v = list(itertools.chain.from_iterable(verts))
+        if isinstance(verts, np.ndarray):
+            f_v = verts.ravel()
+        else:
+            f_v = list(itertools.chain.from_iterable(verts))
         mesh.vertices.foreach_set('co', f_v)
         mesh.update()
     else:
+        if isinstance(verts, np.ndarray):
+            verts = verts.tolist()
 
         ''' get bmesh, write bmesh to obj, free bmesh'''
         bm = bmesh_from_pydata(verts, edges, faces)
@@ -131,8 +137,14 @@ def make_bmesh_geometry_merged(node, idx, context, yielder_object):
 
         if matrix:
             matrix = matrix_sanitizer(matrix)
-            verts = [matrix * Vector(v) for v in verts]
-
+            if isinstance(verts, np.ndarray):
+                m = np.array(matrix)
+                verts = np.dot(verts, m[:3, :3].T) + m[:3, 3]
+            else:
+                verts = [matrix * Vector(v) for v in verts]
+
+        if isinstance(verts, np.ndarray):
+            verts = verts.tolist()
         big_verts.extend(verts)
         big_edges.extend([[a + vert_count, b + vert_count] for a, b in edges])
         big_faces.extend([[j + vert_count for j in f] for f in faces])
@@ -193,6 +205,7 @@ class SvBmeshViewerNodeMK2(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvBmeshViewerNodeMK2'
     bl_label = 'Bmesh Viewer Draw 2'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_vertex_arrays = True
 
     # hints found at ba.org/forum/showthread.php?290106
     # - this will not allow objects on multiple layers, yet.
@@ -368,7 +381,7 @@ class SvBmeshViewerNodeMK2(bpy.types.Node, SverchCustomTreeNode):
             def keep_yielding():
                 # this will yield all in one go.
                 for idx, Verts in enumerate(mverts):
-                    if not Verts:
+                    if not len(Verts):
                         continue
 
                     data = get_edges_faces_matrices(idx)
@@ -380,7 +393,7 @@ class SvBmeshViewerNodeMK2(bpy.types.Node, SverchCustomTreeNode):
 
         else:
             for obj_index, Verts in enumerate(mverts):
-                if not Verts:
+                if not len(Verts):
                     continue
 
                 data = get_edges_faces_matrices(obj_index)
@@ -156,6 +156,8 @@ class ViewerNode2(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'ViewerNode2'
     bl_label = 'Viewer Draw2'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    # vertex arrays are drawn as they are, Vector() takes the rows
+    sv_vertex_arrays = True
 
     n_id = StringProperty(default='')
 
@@ -285,11 +285,55 @@ def _radians(d):
 ---------------------------------------------------
 """
 
+def generate(xml_text, maxmats, rseed, verts_in):
+    """
+    Evaluate the LSystem, returns matrices as lists, mask, and
+    vertices, edges and faces of tubes if verts_in is passed
+    """
+    lsys = LSystem(xml_text, maxmats)
+    shapes = lsys.evaluate(seed = rseed)
+
+    names = [shape[0] for shape in shapes if shape]
+    #convert names to integer list
+    iddict = {k:v for v,k in enumerate(set(names))} 
+    
+    mat_sublist = []
+    mat_list = []
+    mask_list = []
+    
+    edges_out = []
+    verts_out = [] 
+    faces_out = [] 
+    if verts_in is not None:
+        verts = Vector_generate(verts_in)
+    #make last entry in shapes None to allow make tube to finish last tube	
+    if shapes[-1]:
+        shapes.append(None)            
+    for i, shape in enumerate(shapes):
+        if shape:
+            mat_sublist.append(shape[1])
+            mat_list.append(shape[1])
+            mask_list.append(iddict[shape[0]])
+        else: 
+            if len(mat_sublist) > 0:
+                if verts_in is not None:
+                    v, e, f = lsys.make_tube(mat_sublist, verts)
+                    if v:
+                        verts_out.append(v)
+                        edges_out.append(e)
+                        faces_out.append(f)
+                    
+            mat_sublist = []
+
+    return Matrix_listing(mat_list), mask_list, verts_out, edges_out, faces_out
+
+
 class SvGenerativeArtNode(bpy.types.Node, SverchCustomTreeNode):
     ''' Generative Art or LSystem node'''
     bl_idname = 'SvGenerativeArtNode'
     bl_label = 'Generative Art'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_offload = True
 
     filename = StringProperty(default="", update=updateNode)
 
@@ -337,17 +381,17 @@ class SvGenerativeArtNode(bpy.types.Node, SverchCustomTreeNode):
             outputsocketname = ['data']
             changable_sockets(self, inputsocketname, outputsocketname)
 
-    def process(self):
+    def sv_offload_job(self):
         if not self.filename:
-            return
+            return None
         #xml text must be an internal file     
         if not (self.filename in bpy.data.texts):
-            return
+            return None
         internal_file = bpy.data.texts[self.filename]
-        self.xml_text = internal_file.as_string()     
-        #nvars = len(set([name for text, name, spec, conv in string.Formatter().parse(self.xml_text)]))    
+        xml_text = internal_file.as_string()     
+        #nvars = len(set([name for text, name, spec, conv in string.Formatter().parse(xml_text)]))    
         
-        nvars = self.xml_text.count('{') #this may be too large because of repeats        
+        nvars = xml_text.count('{') #this may be too large because of repeats        
         
         if ((self.outputs['Matrices'].is_linked) or (self.outputs['Vertices'].is_linked)):
             slots = []
@@ -361,53 +405,33 @@ class SvGenerativeArtNode(bpy.types.Node, SverchCustomTreeNode):
             else: 
                 slots = [0]*nvars
 
-            self.xml_text = self.xml_text.format(*slots)
+            xml_text = xml_text.format(*slots)
 
-            lsys = LSystem(self.xml_text, self.maxmats)
-            shapes = lsys.evaluate(seed = self.rseed)
-       
-            names = [shape[0] for shape in shapes if shape]
-            #convert names to integer list
-            iddict = {k:v for v,k in enumerate(set(names))} 
-            
-            mat_sublist = []
-            mat_list = []
-            mask_list = []
+            verts_in = None
+            if self.inputs['Vertices'].is_linked:
+                verts_in = SvGetSocketAnyType(self, self.inputs['Vertices'])
+            return generate, (xml_text, self.maxmats, self.rseed, verts_in)
+        return None
+
+    def sv_offload_done(self, result):
+        mat_list, mask_list, verts_out, edges_out, faces_out = result
+        if self.outputs['Matrices'].is_linked:
+            SvSetSocketAnyType(self, 'Matrices', mat_list)
+        if self.outputs['Mask'].is_linked:
+            SvSetSocketAnyType(self, 'Mask', [mask_list])
             
-            edges_out = []
-            verts_out = [] 
-            faces_out = [] 
-            #make last entry in shapes None to allow make tube to finish last tube	
-            if shapes[-1]:
-                shapes.append(None)            
-            for i, shape in enumerate(shapes):
-                if shape:
-                    mat_sublist.append(shape[1])
-                    mat_list.append(shape[1])
-                    mask_list.append(iddict[shape[0]])
-                else: 
-                    if len(mat_sublist) > 0:
-                        if self.inputs['Vertices'].is_linked:
-                            verts = Vector_generate(SvGetSocketAnyType(self, self.inputs['Vertices']))
-                            v, e, f = lsys.make_tube(mat_sublist, verts)
-                            if v:
-                                verts_out.append(v)
-                                edges_out.append(e)
-                                faces_out.append(f)
-                            
-                    mat_sublist = []
-                    
-            if self.outputs['Matrices'].is_linked:
-                SvSetSocketAnyType(self, 'Matrices', Matrix_listing(mat_list))
-            if self.outputs['Mask'].is_linked:
-                SvSetSocketAnyType(self, 'Mask', [mask_list])
-                
-            if self.outputs['Vertices'].is_linked:
-                SvSetSocketAnyType(self, 'Vertices', verts_out)
-            if self.outputs['Edges'].is_linked:
-                SvSetSocketAnyType(self, 'Edges', edges_out)
-            if self.outputs['Faces'].is_linked:
-                SvSetSocketAnyType(self, 'Faces', faces_out)
+        if self.outputs['Vertices'].is_linked:
+            SvSetSocketAnyType(self, 'Vertices', verts_out)
+        if self.outputs['Edges'].is_linked:
+            SvSetSocketAnyType(self, 'Edges', edges_out)
+        if self.outputs['Faces'].is_linked:
+            SvSetSocketAnyType(self, 'Faces', faces_out)
+
+    def process(self):
+        job = self.sv_offload_job()
+        if job:
+            function, args = job
+            self.sv_offload_done(function(*args))
 
     def update_socket(self, context):
         self.update()
@@ -28,10 +28,12 @@ from bpy.props import BoolProperty, StringProperty, EnumProperty, FloatVectorPro
 from mathutils import Vector
 from mathutils.geometry import interpolate_bezier
 
-from sverchok.utils.sv_curve_utils import Arc
+from sverchok.utils.lazy_import import lazy_module
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import fullList, updateNode, dataCorrect
 
+sv_curve_utils = lazy_module("sverchok.utils.sv_curve_utils")
+
 
 idx_map = {i: j for i, j in enumerate(ascii_lowercase)}
 
@@ -299,7 +301,7 @@ class PathParser(object):
             xy_end_final = self.relative(self.posxy, xy_end_pre)
             end = complex(*xy_end_final)
 
-        arc = Arc(start, radius, xaxis_rot, flag1, flag2, end)
+        arc = sv_curve_utils.Arc(start, radius, xaxis_rot, flag1, flag2, end)
 
         theta = 1/num_verts
         for i in range(num_verts+1):
@@ -27,6 +27,7 @@ class ListSumNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'ListSumNode'
     bl_label = 'List summa'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_input_readonly = True
 
     def sv_init(self, context):
         self.inputs.new('StringsSocket', "Data", "Data")
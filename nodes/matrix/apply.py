@@ -17,12 +17,15 @@
 # ##### END GPL LICENSE BLOCK #####
 
 import bpy
+import numpy as np
 from mathutils import Matrix, Vector
 
 from sverchok.node_tree import SverchCustomTreeNode, VerticesSocket, MatrixSocket
 from sverchok.data_structure import (Vector_generate, Vector_degenerate,
                             Matrix_generate, updateNode,
-                            SvGetSocketAnyType, SvSetSocketAnyType)
+                            SvGetSocketAnyType, SvSetSocketAnyType,
+                            is_vertex_arrays, vertices_to_arrays)
+from sverchok import data_structure
 
 
 class MatrixApplyNode(bpy.types.Node, SverchCustomTreeNode):
@@ -30,6 +33,7 @@ class MatrixApplyNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'MatrixApplyNode'
     bl_label = 'Apply matrix for vectors'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_vertex_arrays = True
 
     def sv_init(self, context):
         self.inputs.new('VerticesSocket', "Vectors", "Vectors")
@@ -39,10 +43,15 @@ class MatrixApplyNode(bpy.types.Node, SverchCustomTreeNode):
     def process(self):
         # inputs
         if self.outputs['Vectors'].is_linked:
-            vecs_ = SvGetSocketAnyType(self, self.inputs['Vectors'])
-            vecs = Vector_generate(vecs_)
-
+            vecs_ = SvGetSocketAnyType(self, self.inputs['Vectors'], deepcopy=False)
             mats_ = SvGetSocketAnyType(self, self.inputs['Matrixes'])
+
+            if data_structure.VERTEX_ARRAYS or is_vertex_arrays(vecs_):
+                vectors = self.vecscorrect_arrays(vertices_to_arrays(vecs_), mats_)
+                SvSetSocketAnyType(self, 'Vectors', vectors)
+                return
+
+            vecs = Vector_generate(vecs_)
             mats = Matrix_generate(mats_)
 
             vectors_ = self.vecscorrect(vecs, mats)
@@ -62,6 +71,15 @@ class MatrixApplyNode(bpy.types.Node, SverchCustomTreeNode):
             out.append(out_)
         return out
 
+    def vecscorrect_arrays(self, vecs, mats):
+        out = []
+        lengthve = len(vecs)-1
+        for i, m in enumerate(mats):
+            m = np.array(m, dtype=np.float64)
+            v = vecs[min(i, lengthve)]
+            out.append(np.dot(v, m[:3, :3].T) + m[:3, 3])
+        return out
+
 
 
 def register():
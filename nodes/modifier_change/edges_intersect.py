@@ -24,9 +24,11 @@ import bmesh
 from mathutils.geometry import intersect_line_line as LineIntersect
 
 from sverchok.node_tree import SverchCustomTreeNode
-from sverchok.utils import cad_module as cm
+from sverchok.utils.lazy_import import lazy_module
 from sverchok.utils.sv_bmesh_utils import bmesh_from_pydata
 
+cm = lazy_module("sverchok.utils.cad_module")
+
 ''' helpers '''
 
 
@@ -150,11 +152,39 @@ def unselect_nonintersecting(bm, d_edges, edge_indices):
         # print("unselected {}, non intersecting edges".format(reserved_edges))
 
 
+def intersect_edges(verts_in, edges_in):
+    bm = bmesh_from_pydata(verts_in, edges_in, [])
+
+    edge_indices = [e.index for e in bm.edges]
+    trim_indices = len(edge_indices)
+    for edge in bm.edges:
+        edge.select = True
+
+    d = get_intersection_dictionary(bm, edge_indices)
+
+    unselect_nonintersecting(bm, d.keys(), edge_indices)
+
+    # store non_intersecting edge sequencer
+    add_back = [[i.index for i in edge.verts] for edge in bm.edges if not edge.select]
+
+    update_mesh(bm, d)
+
+    verts_out = [v.co.to_tuple() for v in bm.verts]
+    edges_out = [[j.index for j in i.verts] for i in bm.edges]
+
+    # optional correction, remove originals, add back those that are not intersecting.
+    edges_out = edges_out[trim_indices:]
+    edges_out.extend(add_back)
+
+    return verts_out, edges_out
+
+
 class SvIntersectEdgesNode(bpy.types.Node, SverchCustomTreeNode):
 
     bl_idname = 'SvIntersectEdgesNode'
     bl_label = 'Intersect Edges'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_offload = True
 
     def sv_init(self, context):
         self.inputs.new('VerticesSocket', 'Verts_in', 'Verts_in')
@@ -166,7 +196,7 @@ class SvIntersectEdgesNode(bpy.types.Node, SverchCustomTreeNode):
     def draw_buttons(self, context, layout):
         pass
 
-    def process(self):
+    def sv_offload_job(self):
         inputs = self.inputs
         outputs = self.outputs
 
@@ -175,33 +205,20 @@ class SvIntersectEdgesNode(bpy.types.Node, SverchCustomTreeNode):
             edges_in = inputs['Edges_in'].sv_get()[0]
             linked = outputs['Verts_out'].is_linked
         except (IndexError, KeyError) as e:
-            return
-
-        bm = bmesh_from_pydata(verts_in, edges_in, [])
-
-        edge_indices = [e.index for e in bm.edges]
-        trim_indices = len(edge_indices)
-        for edge in bm.edges:
-            edge.select = True
-
-        d = get_intersection_dictionary(bm, edge_indices)
+            return None
 
-        unselect_nonintersecting(bm, d.keys(), edge_indices)
+        return intersect_edges, (verts_in, edges_in)
 
-        # store non_intersecting edge sequencer
-        add_back = [[i.index for i in edge.verts] for edge in bm.edges if not edge.select]
+    def sv_offload_done(self, result):
+        verts_out, edges_out = result
+        self.outputs['Verts_out'].sv_set([verts_out])
+        self.outputs['Edges_out'].sv_set([edges_out])
 
-        update_mesh(bm, d)
-
-        verts_out = [v.co.to_tuple() for v in bm.verts]
-        edges_out = [[j.index for j in i.verts] for i in bm.edges]
-
-        # optional correction, remove originals, add back those that are not intersecting.
-        edges_out = edges_out[trim_indices:]
-        edges_out.extend(add_back)
-
-        outputs['Verts_out'].sv_set([verts_out])
-        outputs['Edges_out'].sv_set([edges_out])
+    def process(self):
+        job = self.sv_offload_job()
+        if job:
+            function, args = job
+            self.sv_offload_done(function(*args))
 
 
 def register():
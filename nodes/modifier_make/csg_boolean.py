@@ -18,7 +18,7 @@
 
 import bpy
 import bmesh
-import sys
+from math import floor
 
 from bpy.props import FloatProperty, EnumProperty
 
@@ -26,42 +26,76 @@ from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode
 from sverchok.utils.sv_bmesh_utils import bmesh_from_pydata
 
-from sverchok.utils.csg_core import CSG
+from sverchok.utils.lazy_import import lazy_module
 
-def Boolean(VA, PA, VB, PB, operation):
-    if not all([VA, PA, VB, PB]):
-        return False, False
-
-    a = CSG.Obj_from_pydata(VA, PA)
-    b = CSG.Obj_from_pydata(VB, PB)
-
-    faces = []
-    vertices = []
+csg_core = lazy_module("sverchok.utils.csg_core")
 
-    recursionlimit = sys.getrecursionlimit()
-    sys.setrecursionlimit(10000)
-    try:
-        if operation == 'DIFF':
-            polygons = a.subtract(b).toPolygons()
-        elif operation == 'JOIN':
-            polygons = a.union(b).toPolygons()
-        elif operation == 'ITX':
-            polygons = a.intersect(b).toPolygons()
-    except RuntimeError as e:
-        raise RuntimeError(e)
+# cell offsets searched around a vertex when welding
+NEIGHBOURS = [(i, j, k) for i in (0, -1, 1) for j in (0, -1, 1) for k in (0, -1, 1)]
 
-    sys.setrecursionlimit(recursionlimit)
 
+def weld_polygons(polygons, distance):
+    """
+    Vertices and faces from csg polygons, vertices closer than distance
+    are merged. Vertices are hashed into a grid with cells of distance
+    size so only the neighbouring cells are searched.
+    When welding, repeated vertices are removed from faces and faces
+    left with less than 3 vertices are dropped. With distance 0 only
+    vertices at the same position are merged and faces are kept as
+    they are, like before welding was added.
+    """
+    vertices = []
+    faces = []
+    grid = {}
+    inv = 1.0 / distance if distance > 0 else 0.0
+    dist2 = distance * distance
     for polygon in polygons:
         indices = []
         for v in polygon.vertices:
-            pos = [v.pos.x, v.pos.y, v.pos.z]
-            if not pos in vertices:
-                vertices.append(pos)
-            index = vertices.index(pos)
+            x, y, z = v.pos.x, v.pos.y, v.pos.z
+            if inv:
+                cx, cy, cz = floor(x * inv), floor(y * inv), floor(z * inv)
+            else:
+                cx, cy, cz = x, y, z
+            index = None
+            for dx, dy, dz in NEIGHBOURS if inv else NEIGHBOURS[:1]:
+                for i in grid.get((cx + dx, cy + dy, cz + dz), ()):
+                    px, py, pz = vertices[i]
+                    if (px - x) ** 2 + (py - y) ** 2 + (pz - z) ** 2 <= dist2:
+                        index = i
+                        break
+                if index is not None:
+                    break
+            if index is None:
+                index = len(vertices)
+                vertices.append([x, y, z])
+                grid.setdefault((cx, cy, cz), []).append(index)
             indices.append(index)
-
+        if inv:
+            # welding can collapse edges and parts of the polygon
+            seen = set()
+            indices = [i for i in indices if not (i in seen or seen.add(i))]
+            if len(indices) < 3:
+                continue
         faces.append(indices)
+    return vertices, faces
+
+
+def Boolean(VA, PA, VB, PB, operation, weld_distance=0.0):
+    if not all([VA, PA, VB, PB]):
+        return False, False
+
+    a = csg_core.CSG.Obj_from_pydata(VA, PA)
+    b = csg_core.CSG.Obj_from_pydata(VB, PB)
+
+    if operation == 'DIFF':
+        polygons = a.subtract(b).toPolygons()
+    elif operation == 'JOIN':
+        polygons = a.union(b).toPolygons()
+    elif operation == 'ITX':
+        polygons = a.intersect(b).toPolygons()
+
+    vertices, faces = weld_polygons(polygons, weld_distance)
 
     return [vertices], [faces]
 
@@ -71,6 +105,7 @@ class SvCSGBooleanNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvCSGBooleanNode'
     bl_label = 'CSG BooleanNode'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_offload = True
 
     mode_options = [
         ("ITX", "Intersect", "", 0),
@@ -84,6 +119,11 @@ class SvCSGBooleanNode(bpy.types.Node, SverchCustomTreeNode):
         default="ITX",
         update=updateNode)
 
+    weld_distance = FloatProperty(
+        name="Weld", description="Merge output vertices closer than this, 0 only merges vertices at the same position",
+        default=0.0, min=0.0, precision=6,
+        update=updateNode)
+
     def sv_init(self, context):
         self.inputs.new('VerticesSocket', 'Verts A')
         self.inputs.new('StringsSocket',  'Polys A')
@@ -96,25 +136,35 @@ class SvCSGBooleanNode(bpy.types.Node, SverchCustomTreeNode):
     def draw_buttons(self, context, layout):
         row = layout.row()
         row.prop(self, 'selected_mode', expand=True)
+        layout.prop(self, 'weld_distance')
 
-    def process(self):
+    def sv_offload_job(self):
         for i in range(4):
             if not self.inputs[i].is_linked:
-                return
+                return None
 
         if not self.outputs['Vertices'].is_linked:
-            return
+            return None
 
         VA = self.inputs['Verts A'].sv_get()[0]
         PA = self.inputs['Polys A'].sv_get()[0]
         VB = self.inputs['Verts B'].sv_get()[0]
         PB = self.inputs['Polys B'].sv_get()[0]
 
-        verts_out, polys_out = Boolean(VA, PA, VB, PB, self.selected_mode)
+        return Boolean, (VA, PA, VB, PB, self.selected_mode, self.weld_distance)
+
+    def sv_offload_done(self, result):
+        verts_out, polys_out = result
 
         self.outputs['Vertices'].sv_set(verts_out)
         self.outputs['Polygons'].sv_set(polys_out)
 
+    def process(self):
+        job = self.sv_offload_job()
+        if job:
+            function, args = job
+            self.sv_offload_done(function(*args))
+
 
 def register():
     bpy.utils.register_class(SvCSGBooleanNode)
@@ -21,7 +21,69 @@ from bpy.props import FloatProperty
 
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode, SvSetSocketAnyType, SvGetSocketAnyType
-from sverchok.utils.voronoi import Site, computeVoronoiDiagram, computeDelaunayTriangulation
+from sverchok.utils.lazy_import import lazy_module
+
+voronoi = lazy_module("sverchok.utils.voronoi")
+
+
+def voronoi_2d(points_in, clip):
+    pts_out = []
+#    polys_out = []
+    edges_out = []
+    for obj in points_in:
+        pt_list = []
+        x_max = obj[0][0]
+        x_min = obj[0][0]
+        y_min = obj[0][1]
+        y_max = obj[0][1]
+        # creates points in format for voronoi library, throwing away z
+        for pt in obj:
+            x, y = pt[0], pt[1]
+            x_max = max(x, x_max)
+            x_min = min(x, x_min)
+            y_max = max(y, y_max)
+            y_min = min(x, x_min)
+            pt_list.append(voronoi.Site(pt[0], pt[1]))
+
+        res = voronoi.computeVoronoiDiagram(pt_list)
+
+        edges = res[2]
+        delta = clip
+        x_max = x_max + delta
+        y_max = y_max + delta
+
+        x_min = x_min - delta
+        y_min = y_min - delta
+
+        # clipping box to bounding box.
+        pts_tmp = []
+        for pt in res[0]:
+            x, y = pt[0], pt[1]
+            if x < x_min:
+                x = x_min
+            if x > x_max:
+                x = x_max
+
+            if y < y_min:
+                y = y_min
+            if y > y_max:
+                y = y_max
+            pts_tmp.append((x, y, 0))
+
+        pts_out.append(pts_tmp)
+
+        edges_out.append([(edge[1], edge[2]) for edge in edges if -1 not in edge])
+    return pts_out, edges_out
+
+
+def delaunay_2d(points_in):
+    tris_out = []
+    for obj in points_in:
+
+        pt_list = [voronoi.Site(pt[0], pt[1]) for pt in obj]
+        res = voronoi.computeDelaunayTriangulation(pt_list)
+        tris_out.append([tri for tri in res if -1 not in tri])
+    return tris_out
 
 
 class Voronoi2DNode(bpy.types.Node, SverchCustomTreeNode):
@@ -29,6 +91,7 @@ class Voronoi2DNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'Voronoi2DNode'
     bl_label = 'Voronoi'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_offload = True
 
     clip = FloatProperty(name='clip', description='Clipping Distance',
                          default=1.0, min=0,
@@ -45,67 +108,29 @@ class Voronoi2DNode(bpy.types.Node, SverchCustomTreeNode):
     def draw_buttons(self, context, layout):
         layout.prop(self, "clip", text="Clipping")
 
-    def process(self):
-        # inputs
+    def sv_offload_job(self):
         if 'Edges' in self.outputs and self.outputs['Edges'].is_linked or \
            'Vertices' in self.outputs and self.outputs['Vertices'].is_linked:
 
             if 'Vertices' in self.inputs and self.inputs['Vertices'].is_linked:
                 points_in = SvGetSocketAnyType(self, self.inputs['Vertices'])
+                return voronoi_2d, (points_in, self.clip)
+        return None
+
+    def sv_offload_done(self, result):
+        pts_out, edges_out = result
+        # outputs
+        if 'Vertices' in self.outputs and self.outputs['Vertices'].links:
+            SvSetSocketAnyType(self, 'Vertices', pts_out)
 
-            pts_out = []
-    #        polys_out = []
-            edges_out = []
-            for obj in points_in:
-                pt_list = []
-                x_max = obj[0][0]
-                x_min = obj[0][0]
-                y_min = obj[0][1]
-                y_max = obj[0][1]
-                # creates points in format for voronoi library, throwing away z
-                for pt in obj:
-                    x, y = pt[0], pt[1]
-                    x_max = max(x, x_max)
-                    x_min = min(x, x_min)
-                    y_max = max(y, y_max)
-                    y_min = min(x, x_min)
-                    pt_list.append(Site(pt[0], pt[1]))
-
-                res = computeVoronoiDiagram(pt_list)
-
-                edges = res[2]
-                delta = self.clip
-                x_max = x_max + delta
-                y_max = y_max + delta
-
-                x_min = x_min - delta
-                y_min = y_min - delta
-
-                # clipping box to bounding box.
-                pts_tmp = []
-                for pt in res[0]:
-                    x, y = pt[0], pt[1]
-                    if x < x_min:
-                        x = x_min
-                    if x > x_max:
-                        x = x_max
-
-                    if y < y_min:
-                        y = y_min
-                    if y > y_max:
-                        y = y_max
-                    pts_tmp.append((x, y, 0))
-
-                pts_out.append(pts_tmp)
-
-                edges_out.append([(edge[1], edge[2]) for edge in edges if -1 not in edge])
-
-            # outputs
-            if 'Vertices' in self.outputs and self.outputs['Vertices'].links:
-                SvSetSocketAnyType(self, 'Vertices', pts_out)
-
-            if 'Edges' in self.outputs and self.outputs['Edges'].links:
-                SvSetSocketAnyType(self, 'Edges', edges_out)
+        if 'Edges' in self.outputs and self.outputs['Edges'].links:
+            SvSetSocketAnyType(self, 'Edges', edges_out)
+
+    def process(self):
+        job = self.sv_offload_job()
+        if job:
+            function, args = job
+            self.sv_offload_done(function(*args))
 
     def update_socket(self, context):
         self.update()
@@ -117,29 +142,31 @@ class DelaunayTriangulation2DNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'DelaunayTriangulation2DNode'
     bl_label = 'Delaunay 2D'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_offload = True
 
     def sv_init(self, context):
         self.inputs.new('VerticesSocket', "Vertices", "Vertices")
  #       self.outputs.new('StringsSocket', "Edges", "Edges")
         self.outputs.new('StringsSocket', "Polygons", "Polygons")
 
-    def process(self):
+    def sv_offload_job(self):
         points_in = []
         if not ('Polygons' in self.outputs and self.outputs['Polygons'].is_linked):
-            return
+            return None
         if 'Vertices' in self.inputs and self.inputs['Vertices'].is_linked:
             points_in = SvGetSocketAnyType(self, self.inputs['Vertices'])
-        tris_out = []
-
-        for obj in points_in:
-
-            pt_list = [Site(pt[0], pt[1]) for pt in obj]
-            res = computeDelaunayTriangulation(pt_list)
-            tris_out.append([tri for tri in res if -1 not in tri])
+        return delaunay_2d, (points_in,)
 
+    def sv_offload_done(self, tris_out):
         if 'Polygons' in self.outputs and self.outputs['Polygons'].is_linked:
             SvSetSocketAnyType(self, 'Polygons', tris_out)
 
+    def process(self):
+        job = self.sv_offload_job()
+        if job:
+            function, args = job
+            self.sv_offload_done(function(*args))
+
 
 def register():
     bpy.utils.register_class(Voronoi2DNode)
@@ -23,7 +23,7 @@ from bpy.props import BoolProperty, StringProperty
 
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import (sv_Vars, updateNode, multi_socket, changable_sockets,
-                            dataSpoil, dataCorrect, levelsOflist,
+                            dataSpoil, dataCorrect,
                             SvSetSocketAnyType, SvGetSocketAnyType)
 from math import acos, acosh, asin, asinh, atan, atan2, \
                             atanh,ceil,copysign,cos,cosh,degrees,e, \
@@ -72,8 +72,10 @@ class Formula2Node(bpy.types.Node, SverchCustomTreeNode):
     def process(self):
         if self.inputs['X'].is_linked:
             vecs = SvGetSocketAnyType(self, self.inputs['X'])
+            levels = [self.inputs['X'].sv_shape().depth]
         else:
             vecs = [[0.0]]
+            levels = [2]
 
 
         # outputs
@@ -86,12 +88,10 @@ class Formula2Node(bpy.types.Node, SverchCustomTreeNode):
             for socket in self.inputs[1:]:
                 if socket.is_linked:
                     list_mult.append(SvGetSocketAnyType(self, socket))
+                    levels.append(socket.sv_shape().depth)
             #print(list_mult)
         code_formula = parser.expr(self.formula).compile()
         # finding nasty levels, make equal nastyness (canonical 0,1,2,3)
-        levels = [levelsOflist(vecs)]
-        for n in list_mult:
-            levels.append(levelsOflist(n))
         maxlevel = max(max(levels), 3)
         diflevel = maxlevel - levels[0]
 
@@ -20,13 +20,16 @@ from math import degrees
 from itertools import zip_longest
 
 import bpy
+import numpy as np
 from bpy.props import EnumProperty, BoolProperty, StringProperty
 from mathutils import Vector
 from mathutils.noise import noise_vector, cell_vector, noise, cell
 
 from sverchok.node_tree import SverchCustomTreeNode, VerticesSocket, StringsSocket
 from sverchok.data_structure import (fullList, levelsOflist, updateNode,
-                            SvSetSocketAnyType, SvGetSocketAnyType)
+                            SvSetSocketAnyType, SvGetSocketAnyType,
+                            match_long_repeat, is_vertex_arrays,
+                            vertices_to_arrays, vertices_to_lists)
 
 '''
 using slice [:] to generate 3-tuple instead of .to_tuple()
@@ -64,12 +67,37 @@ vector_out = {
 }
 
 
+def normalize_array(u):
+    length = np.sqrt((u * u).sum(axis=1))[:, np.newaxis]
+    # like mathutils zero vectors stay zero
+    return np.divide(u, length, out=np.zeros_like(u), where=length > 0)
+
+# operations on vertex arrays, (N, 3) arrays for u and v, (N,) for s
+array_scalar_out = {
+    "DOT":          lambda u, v: (u * v).sum(axis=1),
+    "DISTANCE":     lambda u, v: np.sqrt(((u - v) ** 2).sum(axis=1)),
+    "LEN":          lambda u: np.sqrt((u * u).sum(axis=1)),
+}
+
+array_vector_out = {
+    "CROSS":        lambda u, v: np.cross(u, v),
+    "ADD":          lambda u, v: u + v,
+    "SUB":          lambda u, v: u - v,
+    "SCALAR":       lambda u, s: u * s[:, np.newaxis],
+    "1/SCALAR":     lambda u, s: u * (1 / s)[:, np.newaxis],
+    "NORMALIZE":    normalize_array,
+    "NEG":          lambda u: -u,
+    "COMPONENT-WISE":  lambda u, v: u * v,
+}
+
+
 class VectorMathNode(bpy.types.Node, SverchCustomTreeNode):
 
     ''' VectorMath Node '''
     bl_idname = 'VectorMathNode'
     bl_label = 'Vector Math'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_vertex_arrays = True
 
     # vector math functions
     mode_items = [
@@ -204,9 +232,14 @@ class VectorMathNode(bpy.types.Node, SverchCustomTreeNode):
             if isinstance(inputs['U'].links[0].from_socket, VerticesSocket):
                 vector1 = SvGetSocketAnyType(self, inputs['U'], deepcopy=False)
 
-        if not vector1:
+        if not len(vector1):
             return
 
+        if is_vertex_arrays(vector1):
+            if self.process_arrays(vector1):
+                return
+            vector1 = vertices_to_lists(vector1)
+
         # reaches here only if we have vector1
         u = vector1
         leve = levelsOflist(u)
@@ -240,7 +273,7 @@ class VectorMathNode(bpy.types.Node, SverchCustomTreeNode):
                 name, _type = socket
                 if name in inputs and inputs[name].links:
                     if isinstance(inputs[name].links[0].from_socket, _type):
-                        b = SvGetSocketAnyType(self, inputs[name], deepcopy=False)
+                        b = vertices_to_lists(SvGetSocketAnyType(self, inputs[name], deepcopy=False))
 
                 # this means one of the necessary sockets is not connected
                 if not b:
@@ -271,7 +304,7 @@ class VectorMathNode(bpy.types.Node, SverchCustomTreeNode):
                 elif all([num_inputs == 2, ('V' in inputs), (inputs['V'].links)]):
 
                     if isinstance(inputs['V'].links[0].from_socket, VerticesSocket):
-                        vector2 = SvGetSocketAnyType(self, inputs['V'], deepcopy=False)
+                        vector2 = vertices_to_lists(SvGetSocketAnyType(self, inputs['V'], deepcopy=False))
                         result = self.recurse_fxy(u, vector2, func, leve - 1)
                     else:
                         print('socket connected to V is not a vertices socket')
@@ -285,6 +318,47 @@ class VectorMathNode(bpy.types.Node, SverchCustomTreeNode):
             if result:
                 SvSetSocketAnyType(self, 'out', result)
 
+    def process_arrays(self, u):
+        '''
+        vertex arrays in u, returns False if the operation
+        has no array version and the list version has to be used
+        '''
+        inputs = self.inputs
+        operation = self.items_
+        scalar = 'out' in self.outputs
+        funcs = array_scalar_out if scalar else array_vector_out
+        if operation not in funcs:
+            return False
+        func = funcs[operation]
+
+        if len(inputs) == 1:
+            result = [func(obj) for obj in u]
+        else:
+            name = inputs[1].name
+            if not inputs[name].is_linked:
+                return True
+            b = SvGetSocketAnyType(self, inputs[name], deepcopy=False)
+            if not len(b):
+                return True
+            if name == 'S':
+                b = [np.asarray(obj, dtype=np.float64).ravel() for obj in b]
+            else:
+                b = vertices_to_arrays(b)
+            result = []
+            for obj_u, obj_b in zip(*match_long_repeat([u, b])):
+                if len(obj_u) and len(obj_b):
+                    obj_u, obj_b = match_long_repeat([obj_u, obj_b])
+                else:
+                    obj_u, obj_b = obj_u[:0], obj_b[:0]
+                result.append(func(obj_u, obj_b))
+
+        if scalar:
+            # scalar outputs are StringsSocket, keep them lists
+            SvSetSocketAnyType(self, 'out', [r.tolist() for r in result])
+        else:
+            SvSetSocketAnyType(self, 'W', result)
+        return True
+
     '''
     apply f to all values recursively
     - fx and fxy do full list matching by length
@@ -17,10 +17,13 @@
 # ##### END GPL LICENSE BLOCK #####
 
 import bpy
+import numpy as np
 from bpy.props import FloatProperty
 from sverchok.node_tree import SverchCustomTreeNode, StringsSocket, VerticesSocket
 from sverchok.data_structure import (updateNode, Vector_generate,
-                            SvSetSocketAnyType, SvGetSocketAnyType)
+                            SvSetSocketAnyType, SvGetSocketAnyType,
+                            is_vertex_arrays, vertices_to_arrays)
+from sverchok import data_structure
 
 
 class VectorMoveNode(bpy.types.Node, SverchCustomTreeNode):
@@ -28,6 +31,7 @@ class VectorMoveNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'VectorMoveNode'
     bl_label = 'Vectors Move'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_vertex_arrays = True
 
     mult_ = FloatProperty(name='multiplier',
                           default=1.0,
@@ -43,16 +47,14 @@ class VectorMoveNode(bpy.types.Node, SverchCustomTreeNode):
         # inputs
         if 'vertices' in self.inputs and self.inputs['vertices'].links and \
            type(self.inputs['vertices'].links[0].from_socket) == VerticesSocket:
-            vers_ = SvGetSocketAnyType(self, self.inputs['vertices'])
-            vers = Vector_generate(vers_)
+            vers = SvGetSocketAnyType(self, self.inputs['vertices'], deepcopy=False)
         else:
             vers = []
 
         if 'vectors' in self.inputs and self.inputs['vectors'].links and \
            type(self.inputs['vectors'].links[0].from_socket) == VerticesSocket:
 
-            vecs_ = SvGetSocketAnyType(self, self.inputs['vectors'])
-            vecs = Vector_generate(vecs_)
+            vecs = SvGetSocketAnyType(self, self.inputs['vectors'], deepcopy=False)
         else:
             vecs = []
 
@@ -65,7 +67,10 @@ class VectorMoveNode(bpy.types.Node, SverchCustomTreeNode):
 
         # outputs
         if 'vertices' in self.outputs and self.outputs['vertices'].links:
-            mov = self.moved(vers, vecs, mult)
+            if data_structure.VERTEX_ARRAYS or is_vertex_arrays(vers) or is_vertex_arrays(vecs):
+                mov = self.moved_arrays(vertices_to_arrays(vers), vertices_to_arrays(vecs), mult)
+            else:
+                mov = self.moved(Vector_generate(vers), Vector_generate(vecs), mult)
             SvSetSocketAnyType(self, 'vertices', mov)
 
     def moved(self, vers, vecs, mult):
@@ -92,6 +97,21 @@ class VectorMoveNode(bpy.types.Node, SverchCustomTreeNode):
         #print ('move', str(moved))
         return moved
 
+    def moved_arrays(self, vers, vecs, mult):
+        # same matching as moved, the last vector and multiplier are
+        # repeated for objects and vertices without one
+        def fit(values, count):
+            if len(values) >= count:
+                return values[:count]
+            return np.concatenate([values, np.repeat(values[-1:], count - len(values), axis=0)])
+
+        moved = []
+        for i, ob in enumerate(vers):
+            vec = fit(vecs[min(i, len(vecs)-1)], len(ob))
+            m = fit(np.asarray(mult[min(i, len(mult)-1)], dtype=np.float64), len(ob))
+            moved.append(ob + vec * m[:, np.newaxis])
+        return moved
+
 
 
 def register():
@@ -27,6 +27,7 @@ class VectorsOutNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'VectorsOutNode'
     bl_label = 'Vectors out'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_input_readonly = True
 
     def sv_init(self, context):
         self.inputs.new('VerticesSocket', "Vectors", "Vectors")
@@ -19,7 +19,7 @@
 import bpy
 
 from sverchok.node_tree import SverchCustomTreeNode
-from sverchok.data_structure import levelsOflist, SvSetSocketAnyType, SvGetSocketAnyType
+from sverchok.data_structure import SvSetSocketAnyType, SvGetSocketAnyType
 
 
 class VertsDelDoublesNode(bpy.types.Node, SverchCustomTreeNode):
@@ -43,7 +43,7 @@ class VertsDelDoublesNode(bpy.types.Node, SverchCustomTreeNode):
             # get any type socket from input:
             vers = SvGetSocketAnyType(self, self.inputs['vers'])
             # Process data
-            levs = levelsOflist(vers)
+            levs = self.inputs['vers'].sv_shape().depth
             result = self.remdou(vers, levs)
             SvSetSocketAnyType(self, 'vers', result)
 
@@ -1,10 +1,15 @@
 import bpy
 from bpy.types import AddonPreferences
-from bpy.props import BoolProperty, FloatVectorProperty, EnumProperty
+from bpy.props import (BoolProperty, FloatVectorProperty, EnumProperty,
+                       IntProperty, FloatProperty, StringProperty)
 
 from sverchok import data_structure
 from sverchok.core import handlers
 from sverchok.core import update_system
+from sverchok.core import cache_budget
+from sverchok.core import disk_cache
+from sverchok.core import offload
+from sverchok.core import update_scheduler
 from sverchok.utils import sv_panels_tools
 from sverchok.ui import color_def
 
@@ -15,11 +20,26 @@ class SverchokPreferences(AddonPreferences):
     def update_debug_mode(self, context):
         data_structure.DEBUG_MODE = self.show_debug
 
+    def update_incremental(self, context):
+        data_structure.INCREMENTAL_UPDATE = self.incremental_update
+
+    def update_shared_data(self, context):
+        data_structure.SHARED_SOCKET_DATA = self.shared_socket_data
+
+    def update_vertex_arrays(self, context):
+        data_structure.VERTEX_ARRAYS = self.vertex_arrays
+
+    def update_error_isolation(self, context):
+        data_structure.ERROR_ISOLATION = self.error_isolation
+
     def update_heat_map(self, context):
         data_structure.heat_map_state(self.heat_map)
 
     def set_frame_change(self, context):
         handlers.set_frame_change(self.frame_change_mode)
+
+    def update_animation_subtree(self, context):
+        data_structure.ANIMATION_SUBTREE = self.animation_subtree
     
     def update_theme(self, context):
         color_def.rebuild_color_cache()
@@ -46,6 +66,102 @@ class SverchokPreferences(AddonPreferences):
         update=update_system.update_error_colors)
 
 
+    incremental_update = BoolProperty(
+        name="Incremental update",
+        description="Skip nodes in partial updates if their input and properties are unchanged",
+        default=False, subtype='NONE',
+        update=update_incremental)
+
+    shared_socket_data = BoolProperty(
+        name="Shared socket data",
+        description="Nodes that don't modify their input get socket data without a copy",
+        default=False, subtype='NONE',
+        update=update_shared_data)
+
+    vertex_arrays = BoolProperty(
+        name="Vertex arrays",
+        description="Pass vertices as numpy arrays between nodes that support it, converted to lists for other nodes",
+        default=False, subtype='NONE',
+        update=update_vertex_arrays)
+
+    error_isolation = BoolProperty(
+        name="Error isolation",
+        description="After a node error skip only the nodes that depend on it and process the rest",
+        default=False, subtype='NONE',
+        update=update_error_isolation)
+
+    cache_budget_tree = IntProperty(
+        name="Layout cache budget (MB)",
+        description="Evict socket data from fast nodes above this size per layout, 0 is no limit",
+        default=0, min=0,
+        update=cache_budget.update_budget)
+
+    cache_budget_total = IntProperty(
+        name="Total cache budget (MB)",
+        description="Evict socket data from fast nodes above this total size, 0 is no limit",
+        default=0, min=0,
+        update=cache_budget.update_budget)
+
+    cache_cheap_time = FloatProperty(
+        name="Evict below (ms)",
+        description="Only evict data of nodes that process faster than this",
+        default=5.0, min=0.0,
+        update=cache_budget.update_budget)
+
+    disk_cache = BoolProperty(
+        name="Disk cache",
+        description="Store outputs of slow generator and modifier nodes on disk and reuse them",
+        default=False,
+        update=disk_cache.update_settings)
+
+    disk_cache_dir = StringProperty(
+        name="Disk cache directory",
+        description="Directory for the disk cache, can be shared between machines, empty is the temp directory",
+        default="", subtype='DIR_PATH',
+        update=disk_cache.update_settings)
+
+    disk_cache_min_time = FloatProperty(
+        name="Cache above (ms)",
+        description="Only store outputs of nodes that process slower than this",
+        default=50.0, min=0.0,
+        update=disk_cache.update_settings)
+
+    process_offload = BoolProperty(
+        name="Process offload",
+        description="Process heavy pure python nodes in worker processes, several at once when possible, linux only",
+        default=False,
+        update=offload.update_settings)
+
+    offload_workers = IntProperty(
+        name="Offload workers",
+        description="Number of worker processes, 0 is one per cpu",
+        default=0, min=0,
+        update=offload.update_settings)
+
+    offload_timeout = FloatProperty(
+        name="Offload timeout (s)",
+        description="Process a node here if its worker takes longer than this",
+        default=60.0, min=1.0,
+        update=offload.update_settings)
+
+    coalesce_updates = BoolProperty(
+        name="Coalesce updates",
+        description="Collect property changes and process them together at most once per interval",
+        default=False,
+        update=update_scheduler.update_settings)
+
+    coalesce_interval = FloatProperty(
+        name="Update interval (ms)",
+        description="Minimum time between updates from property changes",
+        default=100.0, min=0.0,
+        update=update_scheduler.update_settings)
+
+    coalesce_latest_wins = BoolProperty(
+        name="Latest wins",
+        description="Wait until changes stop for the interval, only the latest state is processed",
+        default=False,
+        update=update_scheduler.update_settings)
+
     #  heat map settings
     heat_map = BoolProperty(
         name="Heat map",
@@ -124,6 +240,13 @@ class SverchokPreferences(AddonPreferences):
         default="POST",
         update=set_frame_change)
 
+    animation_subtree = BoolProperty(
+        name="Only animated nodes",
+        description="On frame change only process nodes that depend on frame, drivers or animated objects, "
+                    "nodes reading other scene data are not updated",
+        default=False,
+        update=update_animation_subtree)
+
     #  ctrl+space settings
     
     show_icons = BoolProperty(
@@ -144,6 +267,24 @@ class SverchokPreferences(AddonPreferences):
         col.label(text="Frame change handler:")
         row1 = col.row()
         row1.prop(self, "frame_change_mode", expand=True)
+        col.prop(self, "animation_subtree")
+        col.prop(self, "incremental_update")
+        col.prop(self, "shared_socket_data")
+        col.prop(self, "vertex_arrays")
+        col.prop(self, "error_isolation")
+        col.prop(self, "cache_budget_tree")
+        col.prop(self, "cache_budget_total")
+        col.prop(self, "cache_cheap_time")
+        col.prop(self, "disk_cache")
+        col.prop(self, "disk_cache_dir")
+        col.prop(self, "disk_cache_min_time")
+        if offload.is_supported():
+            col.prop(self, "process_offload")
+            col.prop(self, "offload_workers")
+            col.prop(self, "offload_timeout")
+        col.prop(self, "coalesce_updates")
+        col.prop(self, "coalesce_interval")
+        col.prop(self, "coalesce_latest_wins")
         col.prop(self, "show_icons")
         col.prop(self, "over_sized_buttons")
         col.separator()
@@ -0,0 +1,269 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+The tests run with plain python and pytest, without blender, from the
+repository root:
+
+    python -m pytest -q
+
+bpy, bmesh and mathutils are replaced by placeholders that are enough to
+import the modules under test, the tests only call functions that don't
+touch blender data. The sverchok package points at the repository
+without running its __init__, which registers the add-on.
+
+Node trees, nodes, sockets and links are stood in for by the Fake
+classes below, made with the fake_tree fixture:
+
+    def test_something(fake_tree):
+        tree = fake_tree("Tree")
+        a = tree.add_node("A", compute=lambda node: [[node.value]], value=1)
+        b = tree.add_node("B", inputs=["Data"])
+        tree.link(a.outputs[0], b.inputs[0])
+"""
+
+import os
+import sys
+import types
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+
+class Placeholder(types.ModuleType):
+    """
+    Module where every attribute is a class or a function doing nothing,
+    capitalized names are classes except in bpy.props
+    """
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        if name[:1].isupper() and self.__name__ != "bpy.props":
+            value = type(name, (), {})
+        else:
+            value = lambda *args, **kwargs: None
+        setattr(self, name, value)
+        return value
+
+
+class FakeCollection(dict):
+    """
+    bpy collection, items by name, iterating gives the items
+    """
+    def __iter__(self):
+        return iter(list(self.values()))
+
+
+def install_placeholders():
+    for name in ("bpy", "bpy.types", "bpy.props", "bpy.utils", "bpy.app",
+                 "bpy.app.handlers", "bmesh", "mathutils", "mathutils.geometry",
+                 "nodeitems_utils"):
+        if name not in sys.modules:
+            sys.modules[name] = Placeholder(name)
+    bpy = sys.modules["bpy"]
+    for name in ("types", "props", "utils", "app"):
+        setattr(bpy, name, sys.modules["bpy." + name])
+    bpy.app.handlers = sys.modules["bpy.app.handlers"]
+    bpy.app.handlers.persistent = lambda handler: handler
+    bpy.data = types.SimpleNamespace(node_groups=FakeCollection(), objects=FakeCollection(),
+                                     texts=FakeCollection(), filepath="")
+    bpy.context = types.SimpleNamespace(
+        user_preferences=types.SimpleNamespace(addons={}))
+    if "sverchok" not in sys.modules:
+        package = types.ModuleType("sverchok")
+        package.__path__ = [ROOT]
+        package.__file__ = os.path.join(ROOT, "__init__.py")
+        package.bl_info = {"version": (0, 5, 0, 0)}
+        sys.modules["sverchok"] = package
+        # pytest imports the __init__ of the repository as the package
+        # named after the directory, give it this one instead
+        sys.modules.setdefault(os.path.basename(ROOT), package)
+    # before benchmarks/bench_csg.py, which makes empty packages otherwise
+    import sverchok.utils
+    import sverchok.core
+
+
+install_placeholders()
+
+
+from sverchok import data_structure
+from sverchok.core import update_system
+
+
+class FakeSockets(list):
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            for socket in self:
+                if socket.name == key:
+                    return socket
+            raise KeyError(key)
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        if isinstance(key, str):
+            return any(socket.name == key for socket in self)
+        return super().__contains__(key)
+
+
+class FakeSocket:
+    def __init__(self, node, name, is_output):
+        self.node = node
+        self.id_data = node.id_data
+        self.name = self.identifier = name
+        self.is_output = is_output
+        self.is_linked = False
+        self.links = []
+
+    def as_pointer(self):
+        return id(self)
+
+    def sv_set(self, data, shape=None):
+        data_structure.SvSetSocket(self, data, shape)
+
+    def sv_get(self, deepcopy=True):
+        return data_structure.SvGetSocket(self, deepcopy)
+
+
+class FakeLink:
+    def __init__(self, from_socket, to_socket):
+        self.from_socket = from_socket
+        self.to_socket = to_socket
+        self.from_node = from_socket.node
+        self.to_node = to_socket.node
+        self.is_valid = True
+        self.is_hidden = False
+
+
+class FakeNode:
+    """
+    Node whose properties are keyword arguments, read as attributes and
+    changed in node.props. process sets compute(node) to all linked
+    outputs and counts the calls in processed.
+    """
+    def __init__(self, tree, name, inputs=(), outputs=("Data",), bl_idname="SvTestNode",
+                 compute=None, **props):
+        self.id_data = tree
+        self.name = name
+        self.bl_idname = bl_idname
+        self.inputs = FakeSockets(FakeSocket(self, s, False) for s in inputs)
+        self.outputs = FakeSockets(FakeSocket(self, s, True) for s in outputs)
+        self.props = props
+        self.compute = compute
+        self.processed = 0
+        self.use_custom_color = False
+        self.color = (0.0, 0.0, 0.0)
+
+    def __getattr__(self, name):
+        try:
+            return self.__dict__["props"][name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def items(self):
+        return self.props.items()
+
+    def process(self):
+        self.processed += 1
+        if self.compute is not None:
+            data = self.compute(self)
+            for socket in self.outputs:
+                if socket.is_linked:
+                    socket.sv_set(data)
+
+
+class FakeNodes(FakeCollection):
+    def __init__(self, tree):
+        super().__init__()
+        self.id_data = tree
+
+
+class FakeTree:
+    def __init__(self, name, bl_idname='SverchCustomTreeType'):
+        self.name = name
+        self.bl_idname = bl_idname
+        self.nodes = FakeNodes(self)
+        self.links = []
+        self.sv_process = True
+        self.animation_data = None
+        self.id_props = {}
+
+    def __contains__(self, key):
+        return key in self.id_props
+
+    def __getitem__(self, key):
+        return self.id_props[key]
+
+    def __setitem__(self, key, value):
+        self.id_props[key] = value
+
+    def __delitem__(self, key):
+        del self.id_props[key]
+
+    def is_frozen(self):
+        return False
+
+    def add_node(self, name, **kwargs):
+        node = FakeNode(self, name, **kwargs)
+        self.nodes[name] = node
+        return node
+
+    def link(self, from_socket, to_socket):
+        link = FakeLink(from_socket, to_socket)
+        self.links.append(link)
+        from_socket.links.append(link)
+        to_socket.links = [link]
+        from_socket.is_linked = to_socket.is_linked = True
+        return link
+
+
+@pytest.fixture
+def sv_cache(monkeypatch):
+    """
+    Empty socket data cache and update caches for the test
+    """
+    for name, value in [("socket_keys", {}), ("socket_name_keys", {}), ("socket_key_names", {}),
+                        ("socket_data_cache", {}), ("evicted_sockets", set()),
+                        ("socket_data_shape", {}), ("socket_data_lists", {}),
+                        ("socket_data_access", {}), ("node_data_version", {})]:
+        monkeypatch.setattr(data_structure, name, value)
+    for name in ("update_cache", "merged_update_cache", "partial_update_cache", "fingerprint_cache",
+                 "dep_index_cache", "group_update_cache", "group_output_cache",
+                 "animation_update_cache"):
+        monkeypatch.setattr(update_system, name, {})
+
+
+@pytest.fixture
+def fake_tree(sv_cache, monkeypatch):
+    """
+    Factory of FakeTree, registered in bpy.data.node_groups for the test
+    """
+    import bpy
+
+    def make(name="Test tree", bl_idname='SverchCustomTreeType'):
+        tree = FakeTree(name, bl_idname)
+        monkeypatch.setitem(bpy.data.node_groups, name, tree)
+        return tree
+    return make
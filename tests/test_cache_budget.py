@@ -0,0 +1,116 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Size estimates and eviction of socket data in core/cache_budget.py
+
+import sys
+
+import numpy as np
+import pytest
+
+from sverchok import data_structure
+from sverchok.core import cache_budget, update_profile, update_system
+
+
+def floats(node):
+    return [[float(i) for i in range(1000)]]
+
+
+@pytest.fixture
+def trees(fake_tree, monkeypatch):
+    monkeypatch.setattr(cache_budget, "size_memo", {})
+    monkeypatch.setattr(update_profile, "last_durations", {})
+    tree = fake_tree("Tree")
+    group = fake_tree("Group", 'SverchGroupTreeType')
+    for ng, names in [(tree, ["Old", "Cheap", "Slow", "Group Inputs"]), (group, ["Cheap"])]:
+        for name in names:
+            node = ng.add_node(name, compute=floats)
+            viewer = ng.add_node(name + " Viewer", inputs=["Data"], outputs=[])
+            ng.link(node.outputs[0], viewer.inputs[0])
+    tree.nodes["Group Inputs"].bl_idname = "SvGroupInputsNode"
+    durations = update_profile.last_durations
+    for ng in (tree, group):
+        for node in ng.nodes:
+            node.process()
+            durations[(ng.name, node.name)] = 0.001
+    durations[("Tree", "Slow")] = 1.0
+    return tree, group
+
+
+def key(node):
+    return data_structure.socket_id(node.outputs[0])
+
+
+def test_estimate_size():
+    array = np.zeros((100, 3))
+    assert cache_budget.estimate_size(array) == (300, array.nbytes)
+    elements, size = cache_budget.estimate_size([[(1.0, 2.0, 3.0)] * 100])
+    assert elements == 300
+    assert size >= 300 * sys.getsizeof(1.0)
+    elements, size = cache_budget.estimate_size([list(range(1000))])
+    assert elements == 1000
+    assert cache_budget.estimate_size([]) == (0, sys.getsizeof([]))
+
+
+def test_only_cheap_layout_nodes_are_evicted(trees):
+    tree, group = trees
+    sizes = cache_budget.socket_sizes()
+    assert len(sizes) == 5
+    left = cache_budget.evict(sizes, 0)
+    cache = data_structure.socket_data_cache
+    assert set(cache["Tree"]) == {key(tree.nodes["Slow"]), key(tree.nodes["Group Inputs"])}
+    assert set(cache["Group"]) == {key(group.nodes["Cheap"])}
+    assert data_structure.evicted_sockets == {key(tree.nodes["Old"]), key(tree.nodes["Cheap"])}
+    assert left == sum(s[0] for s in cache_budget.socket_sizes())
+
+
+def test_least_recently_used_first(trees):
+    tree, group = trees
+    sizes = cache_budget.socket_sizes()
+    total = sum(s[0] for s in sizes)
+    # read the old data, cheap is now the oldest
+    tree.nodes["Old Viewer"].inputs[0].sv_get()
+    cache_budget.evict(sizes, total - 1)
+    assert data_structure.evicted_sockets == {key(tree.nodes["Cheap"])}
+    assert cache_budget.evict(cache_budget.socket_sizes(), total) < total
+
+
+def test_evicted_data_is_made_again(trees):
+    tree, group = trees
+    viewer = tree.nodes["Cheap Viewer"]
+    cheap = tree.nodes["Cheap"]
+    data = viewer.inputs[0].sv_get()
+    cache_budget.evict(cache_budget.socket_sizes(), 0)
+    with pytest.raises(data_structure.SvNoDataError):
+        viewer.inputs[0].sv_get()
+    cheap.processed = 0
+    update_system.refresh_evicted(viewer, tree.nodes)
+    assert cheap.processed == 1
+    assert viewer.inputs[0].sv_get() == data
+    assert key(cheap) not in data_structure.evicted_sockets
+    # the other evicted node isn't needed by the viewer
+    assert key(tree.nodes["Old"]) in data_structure.evicted_sockets
+
+
+def test_enforce_budget(trees, monkeypatch):
+    tree, group = trees
+    monkeypatch.setattr(cache_budget, "tree_budget", 1)
+    monkeypatch.setattr(cache_budget, "total_budget", 0)
+    cache_budget.enforce_budget()
+    assert data_structure.evicted_sockets == {key(tree.nodes["Old"]), key(tree.nodes["Cheap"])}
+    assert "2 evicted sockets" in cache_budget.report()
@@ -0,0 +1,88 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Welding of the CSG Boolean node output
+
+import pytest
+
+import bench_csg
+from sverchok.utils.csg_geom import CSGVertex, CSGPolygon
+from sverchok.nodes.modifier_make.csg_boolean import weld_polygons, Boolean
+
+
+def make_polygons(faces):
+    return [CSGPolygon([CSGVertex(co) for co in face]) for face in faces]
+
+
+def unwelded(polygons):
+    """
+    The output of the node before welding was added
+    """
+    vertices = []
+    faces = []
+    for polygon in polygons:
+        indices = []
+        for v in polygon.vertices:
+            pos = [v.pos.x, v.pos.y, v.pos.z]
+            if not pos in vertices:
+                vertices.append(pos)
+            indices.append(vertices.index(pos))
+        faces.append(indices)
+    return vertices, faces
+
+
+@pytest.mark.parametrize("operation", bench_csg.OPERATIONS)
+def test_distance_zero_is_unchanged(operation):
+    va, pa = bench_csg.cube(3)
+    vb, pb = bench_csg.uv_sphere(8, (0.4, 0.3, 0.2))
+    polygons = bench_csg.boolean(bench_csg.CSGNode, va, pa, vb, pb, operation)
+    vertices, faces = unwelded(polygons)
+    assert faces
+    assert weld_polygons(polygons, 0.0) == (vertices, faces)
+    assert Boolean(va, pa, vb, pb, operation) == ([vertices], [faces])
+
+
+def test_close_vertices_are_merged():
+    polygons = make_polygons([
+        [(0, 0, 0), (1, 0, 0), (1, 1, 0)],
+        [(1e-7, 0, 0), (1, 1, 0), (0, 1, 0)],
+    ])
+    vertices, faces = weld_polygons(polygons, 1e-5)
+    assert len(vertices) == 4
+    assert faces == [[0, 1, 2], [0, 2, 3]]
+    vertices, faces = weld_polygons(polygons, 0.0)
+    assert len(vertices) == 5
+
+
+def test_repeated_indices_are_removed():
+    # the second and the fourth vertex weld together, not next to each other
+    polygons = make_polygons([
+        [(0, 0, 0), (1, 0, 0), (1, 1, 0), (1 + 1e-7, 0, 0), (0, 1, 0)],
+    ])
+    vertices, faces = weld_polygons(polygons, 1e-5)
+    assert faces == [[0, 1, 2, 3]]
+
+
+def test_collapsed_faces_are_dropped():
+    polygons = make_polygons([
+        [(0, 0, 0), (1, 0, 0), (1, 1, 0)],
+        # a sliver that welds down to two vertices
+        [(0, 0, 0), (1, 0, 0), (1e-7, 1e-7, 0), (1 + 1e-7, 0, 0)],
+    ])
+    vertices, faces = weld_polygons(polygons, 1e-5)
+    assert faces == [[0, 1, 2]]
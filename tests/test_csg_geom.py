@@ -0,0 +1,62 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# The iterative BSP tree of utils/csg_geom.py against the recursive one it
+# replaced, which is kept in benchmarks/bench_csg.py
+
+import sys
+
+import pytest
+
+import bench_csg
+from bench_csg import CSG, CSGNode, RecursiveCSGNode, boolean, polygon_key
+
+
+@pytest.mark.parametrize("make", [bench_csg.cube, bench_csg.uv_sphere, bench_csg.torus])
+@pytest.mark.parametrize("operation", bench_csg.OPERATIONS)
+def test_same_polygons_as_recursive(make, operation):
+    va, pa = make(6)
+    vb, pb = make(6, (0.37, 0.23, 0.11))
+    iterative = boolean(CSGNode, va, pa, vb, pb, operation)
+    recursive = boolean(RecursiveCSGNode, va, pa, vb, pb, operation)
+    assert iterative
+    assert polygon_key(iterative) == polygon_key(recursive)
+
+
+def test_clone_and_invert():
+    verts, polys = bench_csg.cube(3)
+    node = CSGNode(CSG.Obj_from_pydata(verts, polys).polygons)
+    clone = node.clone()
+    clone.invert()
+    clone.invert()
+    assert polygon_key(clone.allPolygons()) == polygon_key(node.allPolygons())
+    # the clone doesn't share polygons with the original
+    clone.invert()
+    assert polygon_key(clone.allPolygons()) != polygon_key(node.allPolygons())
+
+
+def test_deep_tree_within_recursion_limit():
+    # every plane of a convex mesh has all other polygons behind it, so
+    # the tree is as deep as the polygon count
+    verts, polys = bench_csg.uv_sphere(34)
+    assert len(polys) > sys.getrecursionlimit()
+    polygons = CSG.Obj_from_pydata(verts, polys).polygons
+    node = CSGNode(polygons)
+    assert len(node.allPolygons()) == len(polys)
+    with pytest.raises(RecursionError):
+        RecursiveCSGNode(CSG.Obj_from_pydata(verts, polys).polygons)
@@ -0,0 +1,240 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+import itertools
+
+import numpy as np
+import pytest
+
+from sverchok import data_structure as ds
+
+
+# the list matching functions before the list and array fast paths
+
+def repeat_last(lst):
+    i = -1
+    while lst:
+        i += 1
+        if len(lst) > i:
+            yield lst[i]
+        else:
+            yield lst[-1]
+
+
+def match_long_repeat(lsts):
+    max_l = 0
+    tmp = []
+    for l in lsts:
+        max_l = max(max_l, len(l))
+    for l in lsts:
+        if len(l) == max_l:
+            tmp.append(l)
+        else:
+            tmp.append(repeat_last(l))
+    return list(map(list, zip(*zip(*tmp))))
+
+
+def match_long_cycle(lsts):
+    max_l = 0
+    tmp = []
+    for l in lsts:
+        max_l = max(max_l, len(l))
+    for l in lsts:
+        if len(l) == max_l:
+            tmp.append(l)
+        else:
+            tmp.append(itertools.cycle(l))
+    return list(map(list, zip(*zip(*tmp))))
+
+
+def match_cross2(lsts):
+    return list(reversed(list(map(list, zip(*itertools.product(*reversed(lsts)))))))
+
+
+MATCHING = [
+    (ds.match_long_repeat, match_long_repeat),
+    (ds.match_long_cycle, match_long_cycle),
+    (ds.match_cross2, match_cross2),
+]
+
+LISTS = [
+    [[1, 2, 3, 4, 5], [10, 11]],
+    [[1, 2, 3], [10]],
+    [[1.5], [(0, 1, 2), (3, 4, 5), (6, 7, 8)], ["a", "b"]],
+    [(1, 2), [3, 4, 5, 6, 7], (8,)],
+    [[[1, 2], [3]], [None]],
+    [[1, 2, 3]],
+    [[1, 2, 3], []],
+    [],
+]
+
+
+@pytest.mark.parametrize("fast, reference", MATCHING)
+@pytest.mark.parametrize("lsts", LISTS)
+def test_list_matching(fast, reference, lsts):
+    out = fast(lsts)
+    assert out == reference(lsts)
+    assert all(type(l) is list for l in out)
+    # the same objects, not copies
+    for l, o in zip(lsts, out):
+        for item in o:
+            assert any(item is x for x in l)
+
+
+ARRAYS = [
+    [np.arange(5.0), np.arange(2.0)],
+    [np.arange(3), np.array([7])],
+    [np.arange(12.0).reshape(4, 3), np.arange(6.0).reshape(2, 3), np.array([[9.0, 9.0, 9.0]])],
+    [np.arange(4), np.arange(3.0), np.arange(2)],
+    [np.arange(3), np.array([], dtype=int)],
+]
+
+
+@pytest.mark.parametrize("fast, reference", MATCHING)
+@pytest.mark.parametrize("lsts", ARRAYS)
+def test_array_matching(fast, reference, lsts):
+    out = fast(lsts)
+    # repeat_last fails on arrays, compare with the old version on lists of rows
+    expected = reference([list(l) for l in lsts])
+    assert len(out) == len(expected)
+    for o, e, l in zip(out, expected, lsts):
+        assert isinstance(o, np.ndarray)
+        assert o.dtype == l.dtype
+        assert np.array_equal(o, np.array(e))
+
+
+def test_array_matching_doesnt_copy():
+    long, single = np.arange(6.0), np.array([2.0])
+    out = ds.match_long_repeat([long, single])
+    assert out[0] is long
+    assert np.shares_memory(out[1], single)
+    with pytest.raises(ValueError):
+        out[1][0] = 1.0
+
+
+@pytest.mark.parametrize("fast, reference", MATCHING)
+def test_mixed_inputs_use_general_path(fast, reference):
+    lsts = [np.arange(3), [4, 5], "ab"]
+    assert fast(lsts) == reference(lsts)
+
+
+@pytest.fixture
+def linked_sockets(fake_tree):
+    """
+    Factory of an output socket linked to an input socket of another node
+    """
+    tree = fake_tree()
+
+    def make(sv_vertex_arrays=False):
+        name = "From {}".format(len(tree.nodes))
+        from_node = tree.add_node(name)
+        to_node = tree.add_node(name.replace("From", "To"), inputs=["Data"], outputs=[])
+        to_node.sv_vertex_arrays = sv_vertex_arrays
+        tree.link(from_node.outputs[0], to_node.inputs[0])
+        return from_node.outputs[0], to_node.inputs[0]
+    return make
+
+
+@pytest.mark.parametrize("data, depth, leaf, lengths", [
+    ([[1, 2], [3, 4], [5, 6]], 2, int, (3, 2)),
+    ([[(0.0, 1.0, 2.0)] * 4, [(1.0, 1.0, 1.0)] * 4], 3, float, (2, 4, 3)),
+    ([[(0.0, 1.0, 2.0)] * 4, [(1.0, 1.0, 1.0)] * 3], 3, float, None),
+    ([[[1, 2]], [3]], 3, int, None),
+    ([["a", "b"]], 2, str, (1, 2)),
+    ([], 0, None, (0,)),
+    ([[]], 1, list, (1,)),
+])
+def test_data_shape(data, depth, leaf, lengths):
+    shape = ds.data_shape(data)
+    assert shape.depth == depth == ds.levelsOflist(data)
+    assert shape.leaf is leaf
+    assert shape.lengths == lengths
+    assert shape == ds.SvDataShape(depth, leaf, lengths)
+
+
+def test_array_shape():
+    shape = ds.data_shape(np.zeros((2, 5, 3), dtype=np.float32))
+    assert shape == ds.SvDataShape(3, np.float32, (2, 5, 3))
+    assert ds.data_shape([np.zeros((5, 3))]).depth == 3
+
+
+def test_empty_vertex_array():
+    # an empty mesh with vertex arrays
+    shape = ds.data_shape([np.zeros((0, 3))])
+    assert shape.depth == 3
+    assert shape.leaf is None
+    assert shape.lengths is None
+    assert ds.data_shape([np.zeros((2, 3)), np.zeros((0, 3))]).leaf is np.float64
+
+
+def test_data_shape_lengths_are_lazy():
+    data = [[1, 2], [3, 4]]
+    shape = ds.data_shape(data)
+    data.append([5, 6])
+    assert shape.lengths == (3, 2)
+    data.append([7])
+    # found once
+    assert shape.lengths == (3, 2)
+    assert "lengths=(3, 2)" in repr(shape)
+
+
+def test_data_correct_with_shape():
+    data = [[[(1.0, 2.0, 3.0)]], [[(4.0, 5.0, 6.0)]]]
+    assert ds.dataCorrect(data, shape=ds.data_shape(data)) == ds.dataCorrect(data)
+
+
+def test_socket_shape_is_remembered(linked_sockets):
+    output, input = linked_sockets()
+    data = [[1, 2, 3]]
+    ds.SvSetSocket(output, data)
+    shape = ds.SvGetSocketShape(input)
+    assert shape == ds.SvDataShape(2, int, (1, 3))
+    assert ds.SvGetSocketShape(output) is shape
+    known = ds.SvDataShape(2, int, (1, 3))
+    ds.SvSetSocket(output, [[4, 5, 6]], known)
+    assert ds.SvGetSocketShape(input) is known
+    ds.SvSetSocket(output, [[4, 5]])
+    assert ds.SvGetSocketShape(input).lengths == (1, 2)
+
+
+def test_vertex_arrays_round_trip():
+    verts = [[(0.0, 1.0, 2.0), (3.0, 4.0, 5.0)], [(6.0, 7.0, 8.0)]]
+    arrays = ds.vertices_to_arrays(verts)
+    assert ds.is_vertex_arrays(arrays)
+    assert not ds.is_vertex_arrays(verts)
+    assert [a.shape for a in arrays] == [(2, 3), (1, 3)]
+    assert all(a.dtype == np.float64 for a in arrays)
+    assert ds.vertices_to_lists(arrays) == verts
+    assert ds.vertices_to_lists(verts) is verts
+    assert ds.vertices_to_arrays([[]])[0].shape == (0, 3)
+    assert ds.vertices_to_arrays([[(1, 2, 3)]])[0].dtype == np.float64
+
+
+def test_vertex_arrays_only_for_nodes_that_take_them(linked_sockets):
+    arrays = [np.arange(6.0).reshape(2, 3)]
+    output, input = linked_sockets()
+    ds.SvSetSocket(output, arrays)
+    lists = ds.SvGetSocket(input, deepcopy=False)
+    assert lists == [[(0.0, 1.0, 2.0), (3.0, 4.0, 5.0)]]
+    # converted once per data
+    assert ds.SvGetSocket(input, deepcopy=False) is lists
+    assert ds.SvGetSocket(input) == lists
+
+    output, input = linked_sockets(sv_vertex_arrays=True)
+    ds.SvSetSocket(output, arrays)
+    assert ds.SvGetSocket(input, deepcopy=False) is arrays
@@ -0,0 +1,193 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Storing node outputs in core/disk_cache.py and reading them back
+
+import hashlib
+import os
+import pickle
+import types
+
+import numpy as np
+import pytest
+
+import bpy
+
+from sverchok.core import disk_cache
+from sverchok.utils import sv_IO_panel_tools
+
+KEY = hashlib.sha1(b"first").hexdigest()
+OTHER_KEY = hashlib.sha1(b"second").hexdigest()
+
+
+def generator(tree, outputs, name="Generator"):
+    """
+    Node with outputs, each linked to a viewer
+    """
+    node = tree.add_node(name, outputs=list(outputs))
+    viewer = tree.add_node(name + " Viewer", inputs=list(outputs), outputs=[])
+    for socket in node.outputs:
+        tree.link(socket, viewer.inputs[socket.name])
+    return node
+
+
+def viewed(node, name):
+    return node.id_data.nodes[node.name + " Viewer"].inputs[name].sv_get(deepcopy=False)
+
+
+@pytest.fixture
+def cache(tmpdir, monkeypatch, sv_cache):
+    monkeypatch.setattr(disk_cache, "cache_dir", str(tmpdir))
+    monkeypatch.setattr(disk_cache, "min_time", 0.0)
+    disk_cache.clear()
+    yield disk_cache
+    disk_cache.clear()
+
+
+def set_outputs(node, outputs):
+    for socket in node.outputs:
+        socket.sv_set(outputs[socket.name])
+
+
+def test_round_trip(cache, fake_tree):
+    outputs = {
+        "Vertices": [[(float(i), 0.0, i * 0.25) for i in range(30)]],
+        "Polygons": [[[i, i + 1, i + 2] for i in range(28)]],
+        "Matrices": [np.eye(4)],
+    }
+    node = generator(fake_tree(), outputs)
+    set_outputs(node, outputs)
+    cache.store(node, KEY, 1.0)
+    assert cache.stats["stored"] == 1
+    assert os.path.exists(cache.key_path(KEY))
+
+    other = generator(fake_tree("Other tree"), outputs)
+    assert cache.load(other, KEY)
+    assert cache.stats["hits"] == 1
+    assert np.array_equal(viewed(other, "Matrices")[0], np.eye(4))
+    assert viewed(other, "Vertices") == outputs["Vertices"]
+    assert viewed(other, "Polygons") == outputs["Polygons"]
+
+
+def test_fast_nodes_are_not_stored(cache, fake_tree, monkeypatch):
+    monkeypatch.setattr(cache, "min_time", 0.5)
+    node = generator(fake_tree(), ["Data"])
+    set_outputs(node, {"Data": [[1, 2]]})
+    cache.store(node, KEY, 0.1)
+    assert not os.path.exists(cache.key_path(KEY))
+
+
+def test_missing_outputs_are_a_miss(cache, fake_tree):
+    tree = fake_tree()
+    node = generator(tree, ["Data"])
+    set_outputs(node, {"Data": [[1, 2]]})
+    cache.store(node, KEY, 1.0)
+    other = generator(tree, ["Data", "More"], "Other")
+    assert not cache.load(other, KEY)
+    # unlinked outputs don't need to be in the file
+    other.outputs[1].is_linked = False
+    assert cache.load(other, KEY)
+    assert not cache.load(other, OTHER_KEY)
+    assert cache.stats["misses"] == 2
+
+
+def test_data_that_cant_be_stored(cache, fake_tree):
+    node = generator(fake_tree(), ["Data"])
+    set_outputs(node, {"Data": [[object()]]})
+    cache.store(node, KEY, 1.0)
+    assert cache.stats["stored"] == 0
+    assert os.listdir(os.path.dirname(cache.key_path(KEY))) == []
+
+
+def test_pickled_files_are_not_loaded(cache, fake_tree):
+    node = generator(fake_tree(), ["Data"])
+    path = cache.key_path(KEY)
+    os.makedirs(os.path.dirname(path))
+    with open(path, 'wb') as cache_file:
+        pickle.dump({"Data": [[1, 2]]}, cache_file)
+    assert not cache.load(node, KEY)
+    with pytest.raises(LookupError):
+        viewed(node, "Data")
+
+
+def test_nodes_reading_images_are_not_cached(fake_tree):
+    tree = fake_tree()
+    for bl_idname, cacheable in [("SvBoxNode", True), ("ImageNode", False), ("HilbertImageNode", False)]:
+        node = tree.add_node(bl_idname, bl_idname=bl_idname)
+        # as if defined in nodes/generator
+        node.__class__ = type(bl_idname, (type(node),), {"__module__": "sverchok.nodes.generator.node"})
+        assert disk_cache.is_cacheable(node) == cacheable
+
+
+@pytest.fixture
+def keyed(cache, monkeypatch):
+    """
+    Every node is cacheable, its properties are the ones to store
+    """
+    monkeypatch.setattr(cache, "enabled", True)
+    monkeypatch.setattr(cache, "is_cacheable", lambda node: True)
+    monkeypatch.setattr(sv_IO_panel_tools, "get_node_params",
+                        lambda node, node_dict, groups_dict: dict(node.items()))
+    return cache
+
+
+def test_cost_is_measured_every_time(keyed, fake_tree, monkeypatch):
+    node = generator(fake_tree(), ["Data"])
+    clock = iter([0.0, 0.01, 1.0, 2.0])
+    monkeypatch.setattr(disk_cache.time, "perf_counter", lambda: next(clock))
+    monkeypatch.setattr(keyed, "min_time", 0.5)
+    keyed.process(node)
+    assert keyed.node_cost[("Test tree", "Generator")] == 0.01
+    # no key for a fast node, it's measured anyway
+    assert keyed.node_key(node) is None
+    keyed.process(node)
+    assert keyed.node_cost[("Test tree", "Generator")] == 1.0
+    assert node.processed == 2
+    assert keyed.stats["stored"] == 0
+    # slow now, stored on the next run
+    assert keyed.node_key(node) is not None
+
+
+def test_text_is_in_the_key(keyed, fake_tree, monkeypatch):
+    text = types.SimpleNamespace(string="<rule/>", as_string=lambda: text.string)
+    monkeypatch.setitem(bpy.data.texts, "rules.xml", text)
+    tree = fake_tree()
+    art = generator(tree, ["Data"], "Art")
+    art.bl_idname = "SvGenerativeArtNode"
+    art.props["filename"] = "rules.xml"
+    key = keyed.node_key(art)
+    assert key and keyed.node_key(art) == key
+    text.string = "<rule></rule>"
+    assert keyed.node_key(art) != key
+    art.props["filename"] = "missing.xml"
+    assert keyed.node_key(art) is None
+
+
+def test_clear_keeps_other_files(cache, fake_tree, tmpdir):
+    node = generator(fake_tree(), ["Data"])
+    set_outputs(node, {"Data": [[1, 2]]})
+    cache.store(node, KEY, 1.0)
+    tmpdir.join("notes.txt").write("mine")
+    tmpdir.join(KEY[:2], "notes.txt").write("mine too")
+    tmpdir.join("photos", KEY + ".npz").write("not a cache file", ensure=True)
+    tmpdir.join(OTHER_KEY[:2], OTHER_KEY + ".npz.123.tmp").write("partial", ensure=True)
+    cache.clear()
+    assert not os.path.exists(cache.key_path(KEY))
+    assert sorted(os.listdir(str(tmpdir))) == [KEY[:2], "notes.txt", "photos"]
+    assert os.listdir(str(tmpdir.join(KEY[:2]))) == ["notes.txt"]
+    assert tmpdir.join("photos", KEY + ".npz").check()
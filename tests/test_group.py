@@ -0,0 +1,177 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Memoized group outputs and convergence of the iteration node of
+# nodes/basic_data/group.py
+
+import bpy
+import pytest
+
+from sverchok import data_structure
+from sverchok.core import update_system
+from sverchok.nodes.basic_data import group
+
+
+def half(node):
+    return [[node.inputs[0].sv_get()[0][0] / 2]]
+
+
+@pytest.fixture
+def group_node(fake_tree, monkeypatch):
+    """
+    Group node running a group that halves X, with a nested group
+    """
+    monkeypatch.setattr(group, "socket_data_cache", data_structure.socket_data_cache)
+    nested = fake_tree("Nested", 'SverchGroupTreeType')
+    nested.add_node("Offset", value=0)
+    halves = fake_tree("Halves", 'SverchGroupTreeType')
+    inputs = halves.add_node("Group Inputs", outputs=["X"], bl_idname="SvGroupInputsNode")
+    halve = halves.add_node("Half", inputs=["X"], compute=half)
+    outputs = halves.add_node("Group Outputs", inputs=["X"], outputs=[],
+                              bl_idname="SvGroupOutputsNode")
+    halves.add_node("Nested", bl_idname="SvGroupNode", group_name="Nested")
+    halves.link(inputs.outputs[0], halve.inputs[0])
+    halves.link(halve.outputs[0], outputs.inputs[0])
+
+    tree = fake_tree("Tree")
+    start = tree.add_node("Start", compute=lambda node: [[node.value]], value=1.0)
+    node = tree.add_node("Group", inputs=["X"], outputs=["X"],
+                         bl_idname="SvGroupNode", group_name="Halves")
+    tree.link(start.outputs[0], node.inputs[0])
+    viewer = tree.add_node("Viewer", inputs=["X"], outputs=[])
+    tree.link(node.outputs[0], viewer.inputs[0])
+    start.process()
+    return node
+
+
+def group_run(node):
+    """
+    Process the group node, the output and the number of times the
+    nodes in the group ran
+    """
+    halve = bpy.data.node_groups["Halves"].nodes["Half"]
+    halve.processed = 0
+    group.SvGroupNode.process(node)
+    return node.id_data.nodes["Viewer"].inputs[0].sv_get(), halve.processed
+
+
+def test_group_outputs_are_memoized(group_node):
+    start = group_node.id_data.nodes["Start"]
+    halves = bpy.data.node_groups["Halves"]
+    assert group_run(group_node) == ([[0.5]], 1)
+    # the same input data
+    assert group_run(group_node) == ([[0.5]], 0)
+    # a changed input
+    start.props["value"] = 3.0
+    start.process()
+    assert group_run(group_node) == ([[1.5]], 1)
+    assert group_run(group_node) == ([[1.5]], 0)
+    # a changed property, in the group or a group in it
+    halves.nodes["Half"].props["value"] = 1
+    assert group_run(group_node) == ([[1.5]], 1)
+    bpy.data.node_groups["Nested"].nodes["Offset"].props["value"] = 1
+    assert group_run(group_node) == ([[1.5]], 1)
+    assert group_run(group_node) == ([[1.5]], 0)
+    # an edit of the group tree, like a new link
+    update_system.reset_group_cache(halves)
+    assert group_run(group_node) == ([[1.5]], 1)
+
+
+def test_group_output_key(group_node):
+    halves = bpy.data.node_groups["Halves"]
+    data = [[1.0]]
+    key = update_system.group_output_key(halves, [("X", data)])
+    assert update_system.group_output_key(halves, [("X", data)]) == key
+    # by identity, replaced data is a new key
+    assert update_system.group_output_key(halves, [("X", [[1.0]])]) != key
+    halves.add_node("Frame", bl_idname="SvFrameInfoNode")
+    # reads the scene, not memoized
+    assert update_system.group_output_key(halves, [("X", data)]) is None
+
+
+@pytest.fixture
+def iteration(fake_tree, monkeypatch):
+    """
+    Iteration node running a group that halves X, with Count linked
+    to the outputs without being carried back
+    """
+    # imported by name, the sv_cache fixture replaced it
+    monkeypatch.setattr(group, "socket_data_cache", data_structure.socket_data_cache)
+    loop = fake_tree("Loop", 'SverchGroupTreeType')
+    inputs = loop.add_node("Group Inputs", outputs=["X"], bl_idname="SvGroupInputsNode")
+    halve = loop.add_node("Half", inputs=["X"], compute=half)
+    count = loop.add_node("Count", compute=lambda node: [[len(node.id_data.nodes)]])
+    outputs = loop.add_node("Group Outputs", inputs=["X", "Count"], outputs=[],
+                            bl_idname="SvGroupOutputsNode")
+    loop.link(inputs.outputs[0], halve.inputs[0])
+    loop.link(halve.outputs[0], outputs.inputs["X"])
+    loop.link(count.outputs[0], outputs.inputs["Count"])
+
+    tree = fake_tree("Tree")
+    start = tree.add_node("Start", compute=lambda node: [[1.0]])
+    node = tree.add_node("Iteration", inputs=["X"], outputs=["X", "Count"],
+                         bl_idname="SvIterationNode", group_name="Loop", iter_count=100,
+                         convergence="NONE", watch_socket="", tolerance=0.1,
+                         predicate="data[0][0] < 0.01")
+    tree.link(start.outputs[0], node.inputs[0])
+    viewer = tree.add_node("Viewer", inputs=["X"], outputs=[])
+    tree.link(node.outputs[0], viewer.inputs[0])
+    start.process()
+    return node
+
+
+def run(node):
+    group.SvIterationNode.process(node)
+    stats = group.iteration_stats[("Tree", "Iteration")]
+    return stats["iterations"], stats["converged"]
+
+
+def test_count(iteration):
+    iteration.props["iter_count"] = 3
+    assert run(iteration) == (3, False)
+    assert iteration.id_data.nodes["Viewer"].inputs[0].sv_get() == [[0.125]]
+
+
+@pytest.mark.parametrize("convergence, iterations", [("TOLERANCE", 4), ("PREDICATE", 7)])
+def test_convergence(iteration, convergence, iterations):
+    iteration.props["convergence"] = convergence
+    assert run(iteration) == (iterations, True)
+
+
+def test_watched_output_that_isnt_carried(iteration):
+    # the same every time
+    iteration.props["watch_socket"] = "Count"
+    iteration.props["convergence"] = "TOLERANCE"
+    assert run(iteration) == (2, True)
+    iteration.props["convergence"] = "PREDICATE"
+    iteration.props["predicate"] = "data == [[4]]"
+    assert run(iteration) == (2, True)
+
+
+def test_watched_output_without_data(iteration):
+    iteration.props["convergence"] = "TOLERANCE"
+    iteration.props["watch_socket"] = "Y"
+    with pytest.raises(data_structure.SvNoDataError):
+        run(iteration)
+    iteration.props["watch_socket"] = "Count"
+    out_node = group.find_node("SvGroupOutputsNode", bpy.data.node_groups["Loop"])
+    out_node.inputs["Count"].is_linked = False
+    with pytest.raises(data_structure.SvNoDataError):
+        run(iteration)
+
+
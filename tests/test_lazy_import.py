@@ -0,0 +1,65 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Lazy modules of utils/lazy_import.py and the modules reloaded with them
+
+import importlib
+import sys
+
+import pytest
+
+from sverchok.utils import lazy_import
+
+
+@pytest.fixture
+def package(tmpdir, monkeypatch):
+    """
+    Package where core imports geom, as csg_core does csg_geom
+    """
+    root = tmpdir.mkdir("lazy_package")
+    root.join("__init__.py").write("")
+    root.join("geom.py").write("import math\nsides = 4\n")
+    root.join("core.py").write("from lazy_package.geom import *\n")
+    monkeypatch.syspath_prepend(str(tmpdir))
+    monkeypatch.setattr(lazy_import, "lazy_loaded", [])
+    monkeypatch.setattr(lazy_import, "import_times", {})
+    yield root
+    for name in list(sys.modules):
+        if name.split(".")[0] == "lazy_package":
+            del sys.modules[name]
+
+
+def test_imported_on_first_use(package):
+    core = lazy_import.lazy_module("lazy_package.core")
+    assert "not loaded" in repr(core)
+    assert "lazy_package.core" not in sys.modules
+    assert core.sides == 4
+    assert "lazy_package.core" in lazy_import.import_times
+
+
+def test_modules_it_imports_are_reloaded_first(package):
+    core = lazy_import.lazy_module("lazy_package.core")
+    core.sides
+    # math isn't in the package
+    assert lazy_import.lazy_loaded == ["lazy_package", "lazy_package.geom", "lazy_package.core"]
+    # what the reload in the add-on __init__ does
+    package.join("geom.py").write("sides = 6\n")
+    for name in lazy_import.lazy_loaded:
+        importlib.reload(sys.modules[name])
+    assert sys.modules["lazy_package.core"].sides == 6
+    assert "0 modules, 3 lazy modules loaded" in lazy_import.report()
@@ -0,0 +1,139 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Starting offloaded jobs early and the timeout of core/offload.py,
+# with a pool running the jobs when their result is asked for
+
+import multiprocessing
+
+import pytest
+
+from sverchok.core import offload
+
+
+class FakeResult:
+    def __init__(self, pool, function, args):
+        self.pool = pool
+        self.function = function
+        self.args = args
+
+    def get(self, timeout=None):
+        if self.pool.stuck:
+            raise multiprocessing.TimeoutError
+        return self.function(*self.args)
+
+
+class FakePool:
+    def __init__(self):
+        self.started = []
+        self.stuck = False
+        self.closed = False
+
+    def apply_async(self, function, args):
+        self.started.append(args[0])
+        return FakeResult(self, function, args)
+
+
+def square(name, value):
+    return value * value
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    pool = FakePool()
+    monkeypatch.setattr(offload, "get_pool", lambda: None if pool.closed else pool)
+    monkeypatch.setattr(offload, "close_pool", lambda: setattr(pool, "closed", True))
+    return pool
+
+
+def offloaded(tree, name, value, inputs=()):
+    """
+    Node squaring value in the pool
+    """
+    node = tree.add_node(name, inputs=inputs, compute=lambda node: [[-1]],
+                         sv_offload=True, value=value)
+    node.props["sv_offload_job"] = lambda: (square, (name, node.value))
+    node.props["sv_offload_done"] = lambda result: node.outputs[0].sv_set([[result]])
+    return node
+
+
+@pytest.fixture
+def tree(fake_tree):
+    """
+    A, B and D in the pool, D depends on C which isn't, the update
+    list is A, B, C, D
+    """
+    tree = fake_tree()
+    offloaded(tree, "A", 2)
+    offloaded(tree, "B", 3)
+    tree.add_node("C")
+    offloaded(tree, "D", 4, inputs=["Data"])
+    tree.link(tree.nodes["C"].outputs[0], tree.nodes["D"].inputs[0])
+    for name in "ABD":
+        viewer = tree.add_node(name + " Viewer", inputs=["Data"], outputs=[])
+        tree.link(tree.nodes[name].outputs[0], viewer.inputs[0])
+    return tree
+
+
+def viewed(tree, name):
+    return tree.nodes[name + " Viewer"].inputs[0].sv_get()
+
+
+def test_ready_nodes_are_started_early(pool, tree):
+    upstream = {"D": {"C"}}
+    jobs = {}
+    offload.process(tree.nodes["A"], ["A", "B", "C", "D"], upstream, jobs)
+    # B only waits for nodes already processed, D waits for C
+    assert pool.started == ["A", "B"]
+    assert list(jobs) == ["B"]
+    assert viewed(tree, "A") == [[4]]
+    offload.process(tree.nodes["B"], ["B", "C", "D"], upstream, jobs)
+    # not started again
+    assert pool.started == ["A", "B"]
+    assert viewed(tree, "B") == [[9]]
+    # nothing to start while C is processed
+    offload.start_ready(["C", "D"], tree.nodes, upstream, jobs)
+    assert not jobs
+    tree.nodes["C"].process()
+    offload.process(tree.nodes["D"], ["D"], upstream, jobs)
+    assert pool.started == ["A", "B", "D"]
+    assert viewed(tree, "D") == [[16]]
+    assert [tree.nodes[name].processed for name in "ABD"] == [0, 0, 0]
+
+
+def test_skipped_nodes_arent_started(pool, tree):
+    jobs = {}
+    offload.start_ready(["A", "B", "C", "D"], tree.nodes, {}, jobs, lambda name: name == "D")
+    assert pool.started == ["B"]
+    # the result of a node that won't be processed is dropped
+    offload.discard(jobs, "B")
+    assert not jobs
+
+
+def test_timeout(pool, tree):
+    pool.stuck = True
+    jobs = {}
+    offload.process(tree.nodes["A"], ["A", "B", "C", "D"], {"D": {"C"}}, jobs)
+    # processed here, the pool is started over
+    assert tree.nodes["A"].processed == 1
+    assert viewed(tree, "A") == [[-1]]
+    assert pool.closed
+    assert not jobs
+    offload.process(tree.nodes["B"], ["B", "C", "D"], {"D": {"C"}}, jobs)
+    assert tree.nodes["B"].processed == 1
+    assert pool.started == ["A", "B"]
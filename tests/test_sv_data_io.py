@@ -0,0 +1,152 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Socket data files of utils/sv_data_io.py, used by the Cache node spill
+# and the disk cache
+
+import io
+import math
+import os
+import pickle
+
+import numpy as np
+import pytest
+
+from sverchok.utils.sv_data_io import save_data, load_data, save_frame, load_frame, frame_path
+from sverchok.nodes.basic_data.cache import SvCacheNode
+
+
+def round_trip(data):
+    f = io.BytesIO()
+    save_data(f, data)
+    f.seek(0)
+    return load_data(f)
+
+
+def same(a, b):
+    """
+    Equal with the same types all the way down
+    """
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, np.ndarray):
+        return a.dtype == b.dtype and np.array_equal(a, b)
+    if isinstance(a, (list, tuple)):
+        return len(a) == len(b) and all(same(x, y) for x, y in zip(a, b))
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(same(a[k], b[k]) for k in a)
+    if isinstance(a, float) and math.isnan(a):
+        return math.isnan(b)
+    return a == b
+
+
+verts = [[(float(i), i * 0.5, -i / 3.0) for i in range(40)]]
+polys = [[[i, i + 1, i + 2] for i in range(37)]]
+
+
+@pytest.mark.parametrize("data", [
+    verts,
+    polys,
+    [[1, 2, 3]],
+    [list(range(20)), [0.1 * i for i in range(20)]],
+    [[(1.0, 2.0), (3, 4)]],
+    ([1.5, None, True], "text"),
+    {"Vertices": verts, "Count": [[2 ** 70]], (1, 2): [float("nan")] * 20},
+    [np.arange(12.0).reshape(4, 3), np.arange(5, dtype=np.int32)],
+    [[1.0] * 20 + [1]],
+    [[(1.0, 2.0)] * 16 + [[3.0, 4.0]]],
+    [],
+])
+def test_round_trip(data):
+    assert same(round_trip(data), data)
+
+
+def test_unknown_data_is_refused():
+    with pytest.raises(TypeError):
+        save_data(io.BytesIO(), [[object()]])
+    with pytest.raises(TypeError):
+        save_data(io.BytesIO(), [np.array([object()])])
+
+
+def test_pickles_are_not_loaded():
+    f = io.BytesIO()
+    np.save(f, np.array([{"a": 1}], dtype=object), allow_pickle=True)
+    f.seek(0)
+    with pytest.raises(ValueError):
+        load_data(f)
+    with pytest.raises(ValueError):
+        load_data(io.BytesIO(pickle.dumps(verts)))
+
+
+def test_frames(tmpdir):
+    directory = str(tmpdir)
+    arrays = [np.arange(9.0).reshape(3, 3), np.arange(4)]
+    save_frame(directory, 1, arrays)
+    save_frame(directory, 2, verts)
+    loaded = load_frame(directory, 1)
+    assert all(isinstance(a, np.memmap) for a in loaded)
+    assert all(np.array_equal(a, b) for a, b in zip(loaded, arrays))
+    assert same(load_frame(directory, 2), verts)
+    assert load_frame(directory, 3) is None
+
+
+def test_frame_overwritten_with_other_data(tmpdir):
+    directory = str(tmpdir)
+    save_frame(directory, 1, [np.zeros(3)])
+    save_frame(directory, 1, polys)
+    assert not os.path.exists(frame_path(directory, 1, ext=".json"))
+    assert same(load_frame(directory, 1), polys)
+
+
+def test_broken_frame_is_skipped(tmpdir):
+    directory = str(tmpdir)
+    with open(frame_path(directory, 1), 'wb') as frame_file:
+        frame_file.write(b"not a frame")
+    assert load_frame(directory, 1) is None
+
+
+class CacheNode:
+    """
+    Stands in for the Cache node, with the evict method of the node
+    """
+    name = "Cache"
+    n_id = "1"
+    cache_offset = 1
+    cache_amount = 1
+    cache_spill = True
+    on_disk = {}
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def spill_directory(self):
+        return self.directory
+
+    evict = SvCacheNode.evict
+
+
+def test_cache_node_spill(tmpdir):
+    node = CacheNode(str(tmpdir))
+    data = {1: verts, 2: [np.arange(3.0)], 3: polys, 4: [[object()]], 5: [[5]], 6: [[6]]}
+    node.evict(data, 6)
+    # the frame that can't be written stays in memory
+    assert sorted(data) == [4, 5, 6]
+    assert same(load_frame(node.directory, 1), verts)
+    assert np.array_equal(load_frame(node.directory, 2)[0], np.arange(3.0))
+    assert same(load_frame(node.directory, 3), polys)
+    assert load_frame(node.directory, 4) is None
@@ -0,0 +1,81 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# The level scheduler of core/toposort.py, against the depth first
+# make_update_list it replaced, kept in benchmarks/bench_update_list.py
+
+import types
+
+import pytest
+
+from bench_update_list import synthetic_tree, check_order, make_update_list_dfs
+from sverchok.core.toposort import topological_levels, SvCycleError
+from sverchok.core.update_system import make_update_list, make_update_levels
+
+
+@pytest.mark.parametrize("count, parts, seed", [(50, 1, 0), (300, 4, 1), (1000, 8, 2)])
+def test_levels(count, parts, seed):
+    node_set, deps = synthetic_tree(count, parts=parts, seed=seed)
+    levels = topological_levels(node_set, deps)
+    order = [name for level in levels for name in level]
+    assert sorted(order) == sorted(node_set)
+    check_order(order, deps)
+    check_order(make_update_list_dfs(set(node_set), deps), deps)
+    level_of = {name: i for i, level in enumerate(levels) for name in level}
+    for name in node_set:
+        upstream = [level_of[dep] for dep in deps.get(name, ())]
+        # every node is in the first level after all its dependencies
+        assert level_of[name] == (max(upstream) + 1 if upstream else 0)
+
+
+def test_dependencies_outside_node_set_are_ignored():
+    deps = {"B": {"A"}, "C": {"B"}, "D": {"C", "X"}}
+    assert topological_levels({"B", "C", "D"}, deps) == [["B"], ["C"], ["D"]]
+    levels = topological_levels({"A", "C", "D", "E"}, deps)
+    assert sorted(levels[0]) == ["A", "C", "E"]
+    assert levels[1:] == [["D"]]
+
+
+def test_cycle():
+    deps = {"A": {"C"}, "B": {"A"}, "C": {"B"}, "D": {"C"}, "E": set()}
+    with pytest.raises(SvCycleError) as info:
+        topological_levels(set(deps), deps)
+    cycle = info.value.nodes
+    assert sorted(cycle) == ["A", "B", "C"]
+    # in the direction of the data flow
+    for i, name in enumerate(cycle):
+        assert cycle[i - 1] in deps[name]
+    assert str(info.value) == " -> ".join(cycle + cycle[:1])
+
+
+def test_self_link_is_a_cycle():
+    deps = {"A": {"A"}, "B": {"A"}}
+    with pytest.raises(SvCycleError) as info:
+        topological_levels({"A", "B"}, deps)
+    assert info.value.nodes == ["A"]
+
+
+def test_update_list():
+    ng = types.SimpleNamespace(name="Test tree")
+    deps = {"B": {"A"}, "C": {"A"}, "D": {"B", "C"}}
+    levels = make_update_levels(ng, {"A", "B", "C", "D"}, deps)
+    assert [sorted(level) for level in levels] == [["A"], ["B", "C"], ["D"]]
+    assert make_update_list(ng, {"A", "B", "C", "D"}, deps) == [name for level in levels for name in level]
+    assert make_update_list(ng, {"D"}, deps) == ["D"]
+    deps["A"] = {"D"}
+    assert make_update_list(ng, {"A", "B", "C", "D"}, deps) == []
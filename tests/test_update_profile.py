@@ -0,0 +1,96 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Timing history, chrome traces and statistics of core/update_profile.py
+
+import json
+
+import pytest
+
+from sverchok.core import update_profile
+
+
+def item(name, start, duration, bl_idname="SvTestNode", **extra):
+    return dict(extra, name=name, bl_idname=bl_idname, start=start, duration=duration)
+
+
+@pytest.fixture
+def profile(monkeypatch):
+    monkeypatch.setattr(update_profile, "history", update_profile.collections.deque(maxlen=3))
+    monkeypatch.setattr(update_profile, "last_durations", {})
+    return update_profile
+
+
+def test_record(profile):
+    profile.record("Tree", [])
+    assert not profile.history
+    for i in range(4):
+        profile.record("Tree", [item("A", i, 0.1 * i), item("B", i, 0.0, skipped="A")])
+    # a rolling history
+    assert len(profile.history) == 3
+    assert profile.last_durations == {("Tree", "A"): pytest.approx(0.3)}
+    profile.clear()
+    assert not profile.history and not profile.last_durations
+
+
+def test_chrome_trace(profile):
+    entries = [("Tree", [item("A", 1.0, 0.5), item("B", 1.5, 0.25, error="no data")]),
+               ("Group", [item("C", 2.0, 0.125, bl_idname="SvGroupNode")]),
+               ("Tree", [item("D", 3.0, 0.001)])]
+    trace = json.loads(json.dumps(profile.chrome_trace(entries)))
+    assert trace["displayTimeUnit"] == "ms"
+    events = trace["traceEvents"]
+    # a process per tree, named by metadata events
+    names = {e["pid"]: e["args"]["name"] for e in events if e["ph"] == "M"}
+    assert names == {0: "Tree", 1: "Group"}
+    assert all(e["name"] == "process_name" for e in events if e["ph"] == "M")
+    complete = {e["name"]: e for e in events if e["ph"] == "X"}
+    assert complete["B"] == {"name": "B", "cat": "SvTestNode", "ph": "X",
+                             "ts": 1.5e6, "dur": 0.25e6, "pid": 0, "tid": 0,
+                             "args": {"bl_idname": "SvTestNode", "error": "no data"}}
+    assert complete["C"]["cat"] == "SvGroupNode"
+    # a thread per recorded graph
+    assert [(complete[n]["pid"], complete[n]["tid"]) for n in "ABCD"] == \
+        [(0, 0), (0, 0), (1, 1), (0, 2)]
+
+
+def test_percentile():
+    values = list(range(1, 21))
+    assert update_profile.percentile(values, 0.0) == 1
+    assert update_profile.percentile(values, 0.5) == 11
+    # nearest rank of 0.95 * 19 = 18.05
+    assert update_profile.percentile(values, 0.95) == 19
+    assert update_profile.percentile(values, 1.0) == 20
+    assert update_profile.percentile([7], 0.95) == 7
+
+
+def test_node_statistics(profile):
+    entries = [("Tree", [item("A", i, d), item("B", i, 0.0, skipped="A")])
+               for i, d in enumerate([0.4, 0.1, 0.3, 0.2, 1.0])]
+    entries.append(("Group", [item("A", 0, 2.0)]))
+    stats = profile.node_statistics(entries)
+    # skipped nodes aren't counted
+    assert set(stats) == {("Tree", "A"), ("Group", "A")}
+    a = stats[("Tree", "A")]
+    assert a["count"] == 5
+    assert (a["min"], a["median"], a["p95"], a["max"]) == (0.1, 0.3, 1.0, 1.0)
+    assert a["total"] == pytest.approx(2.0)
+    assert stats[("Group", "A")]["median"] == 2.0
+    lines = profile.statistics_table(stats).splitlines()
+    # slowest first
+    assert lines[1].startswith("Group") and lines[2].startswith("Tree")
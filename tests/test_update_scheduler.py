@@ -0,0 +1,102 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Coalescing of property change updates in core/update_scheduler.py
+
+import types
+
+import pytest
+
+from sverchok.core import update_scheduler, update_system
+
+
+@pytest.fixture
+def scheduler(fake_tree, monkeypatch):
+    """
+    Scheduler with a clock set by the test, returns the tree and the
+    names of the nodes of every update
+    """
+    clock = types.SimpleNamespace(now=100.0)
+    monkeypatch.setattr(update_scheduler, "time",
+                        types.SimpleNamespace(perf_counter=lambda: clock.now))
+    monkeypatch.setattr(update_scheduler, "interval", 0.25)
+    monkeypatch.setattr(update_scheduler, "latest_wins", False)
+    for name in ("pending", "last_run", "last_request"):
+        monkeypatch.setattr(update_scheduler, name, {})
+    updates = []
+    monkeypatch.setattr(update_system, "process_from_nodes",
+                        lambda nodes: updates.append([node.name for node in nodes]))
+    tree = fake_tree()
+    for name in ("A", "B", "C"):
+        tree.add_node(name)
+    return tree, clock, updates
+
+
+def test_interval(scheduler):
+    tree, clock, updates = scheduler
+    nodes = tree.nodes
+    update_scheduler.request_update(nodes["A"])
+    # the first change is processed at once
+    assert updates == [["A"]]
+    clock.now += 0.125
+    update_scheduler.request_update(nodes["B"])
+    update_scheduler.request_update(nodes["C"])
+    update_scheduler.request_update(nodes["B"])
+    assert updates == [["A"]]
+    update_scheduler.sv_scheduler_handler(None)
+    assert updates == [["A"]]
+    clock.now += 0.125
+    update_scheduler.sv_scheduler_handler(None)
+    # together, each node once
+    assert updates == [["A"], ["B", "C"]]
+    assert not update_scheduler.pending
+    update_scheduler.sv_scheduler_handler(None)
+    assert len(updates) == 2
+
+
+def test_latest_wins(scheduler, monkeypatch):
+    tree, clock, updates = scheduler
+    monkeypatch.setattr(update_scheduler, "latest_wins", True)
+    for name in ("A", "B", "A"):
+        update_scheduler.request_update(tree.nodes[name])
+        clock.now += 0.125
+        update_scheduler.sv_scheduler_handler(None)
+    # changes came faster than the interval, nothing processed
+    assert updates == []
+    clock.now += 0.125
+    update_scheduler.sv_scheduler_handler(None)
+    assert updates == [["A", "B"]]
+
+
+def test_frozen_tree(scheduler, monkeypatch):
+    tree, clock, updates = scheduler
+    monkeypatch.setattr(tree, "is_frozen", lambda: True)
+    update_scheduler.request_update(tree.nodes["A"])
+    assert updates == []
+    assert not update_scheduler.pending
+
+
+def test_flush_all(scheduler):
+    tree, clock, updates = scheduler
+    update_scheduler.last_run[tree.name] = clock.now
+    update_scheduler.request_update(tree.nodes["C"])
+    del tree.nodes["C"]
+    update_scheduler.request_update(tree.nodes["B"])
+    update_scheduler.flush_all()
+    # removed nodes are left out
+    assert updates == [["B"]]
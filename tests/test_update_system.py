@@ -0,0 +1,231 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Update lists and processing in core/update_system.py
+
+import pytest
+
+from sverchok import data_structure
+from sverchok.core import update_system, offload
+
+
+def total(node):
+    """
+    The value property and the sum of the inputs
+    """
+    return [[node.value + sum(s.sv_get()[0][0] for s in node.inputs if s.is_linked)]]
+
+
+def fail(node):
+    raise ValueError("no data")
+
+
+@pytest.fixture
+def tree(fake_tree, monkeypatch):
+    monkeypatch.setattr(data_structure, "INCREMENTAL_UPDATE", True)
+    tree = fake_tree()
+    # A -> B -> C and A -> D
+    for name, value in [("A", 1), ("B", 0), ("C", 0), ("D", 5)]:
+        tree.add_node(name, inputs=["Data"], compute=total, value=value)
+    for a, b in [("A", "B"), ("B", "C"), ("A", "D")]:
+        tree.link(tree.nodes[a].outputs[0], tree.nodes[b].inputs[0])
+    tree.add_node("Viewer", inputs=["Data"], outputs=[])
+    tree.link(tree.nodes["C"].outputs[0], tree.nodes["Viewer"].inputs[0])
+    deps = update_system.make_dep_dict(tree)
+    nodes = tree.nodes
+    update_system.do_update_general(list(nodes.keys()), nodes, deps=deps)
+    return nodes, deps
+
+
+def processed(nodes):
+    counts = {name: node.processed for name, node in nodes.items() if name != "Viewer"}
+    for node in nodes.values():
+        node.processed = 0
+    return counts
+
+
+def test_unchanged_nodes_are_skipped(tree):
+    nodes, deps = tree
+    assert processed(nodes) == {"A": 1, "B": 1, "C": 1, "D": 1}
+    update_system.do_update_general(list(nodes.keys()), nodes, deps=deps)
+    # the first node of the list is always processed
+    assert processed(nodes) == {"A": 1, "B": 0, "C": 0, "D": 0}
+
+
+def test_changes_are_passed_downstream(tree):
+    nodes, deps = tree
+    processed(nodes)
+    nodes["A"].props["value"] = 2
+    update_system.do_update_general(list(nodes.keys()), nodes, deps=deps)
+    assert processed(nodes) == {"A": 1, "B": 1, "C": 1, "D": 1}
+    assert nodes["Viewer"].inputs[0].sv_get() == [[2]]
+
+
+def test_same_output_stops_the_update(tree):
+    nodes, deps = tree
+    processed(nodes)
+    nodes["B"].props["value"] = 1
+    nodes["A"].props["value"] = 0
+    update_system.do_update_general(list(nodes.keys()), nodes, deps=deps)
+    # B has the same output as before, C isn't processed
+    assert processed(nodes) == {"A": 1, "B": 1, "C": 0, "D": 1}
+
+
+def test_changed_properties(tree):
+    nodes, deps = tree
+    processed(nodes)
+    nodes["C"].props["value"] = 3
+    update_system.do_update_general(list(nodes.keys()), nodes, deps=deps)
+    assert processed(nodes) == {"A": 1, "B": 0, "C": 1, "D": 0}
+    assert nodes["Viewer"].inputs[0].sv_get() == [[4]]
+
+
+def test_without_deps_all_nodes_are_processed(tree):
+    nodes, deps = tree
+    processed(nodes)
+    update_system.do_update_general(list(nodes.keys()), nodes)
+    assert processed(nodes) == {"A": 1, "B": 1, "C": 1, "D": 1}
+
+
+def test_fingerprint(tree):
+    nodes, deps = tree
+    node = nodes["B"]
+    assert update_system.fingerprint_unchanged(node, deps)
+    assert not update_system.check_fingerprint(node, deps)
+    data_structure.bump_node_data_version("Test tree", "A")
+    assert not update_system.fingerprint_unchanged(node, deps)
+    # only check_fingerprint stores it
+    assert not update_system.fingerprint_unchanged(node, deps)
+    assert update_system.check_fingerprint(node, deps)
+    assert update_system.fingerprint_unchanged(node, deps)
+
+
+def test_merge_levels():
+    assert update_system.merge_levels([[["a"], ["b"]], [["c"], ["d", "e"], ["f"]]]) == \
+        ["a", "c", "b", "d", "e", "f"]
+    assert update_system.merge_levels([]) == []
+
+
+@pytest.fixture
+def two_parts(fake_tree, monkeypatch):
+    """
+    Tree of two unconnected chains, A1 -> A2 -> A3 and B1 -> B2,
+    returns the tree and the processing order
+    """
+    order = []
+
+    def record(node):
+        order.append(node.name)
+        return [[node.name]]
+
+    tree = fake_tree()
+    for chain in (["A1", "A2", "A3"], ["B1", "B2"]):
+        for name in chain:
+            tree.add_node(name, inputs=["Data"], compute=record)
+        for a, b in zip(chain, chain[1:]):
+            tree.link(tree.nodes[a].outputs[0], tree.nodes[b].inputs[0])
+    return tree, order
+
+
+def test_parts_are_processed_one_after_another(two_parts):
+    tree, order = two_parts
+    update_system.process_tree(tree)
+    assert order in (["A1", "A2", "A3", "B1", "B2"], ["B1", "B2", "A1", "A2", "A3"])
+
+
+def test_parts_are_merged_for_offload(two_parts, monkeypatch):
+    tree, order = two_parts
+    monkeypatch.setattr(offload, "enabled", True)
+    monkeypatch.setattr(offload, "is_supported", lambda: True)
+    update_system.process_tree(tree)
+    assert order in (["A1", "B1", "A2", "B2", "A3"], ["B1", "A1", "B2", "A2", "A3"])
+
+
+def test_error_in_merged_parts_only_stops_its_part(two_parts, monkeypatch):
+    tree, order = two_parts
+    monkeypatch.setattr(offload, "enabled", True)
+    monkeypatch.setattr(offload, "is_supported", lambda: True)
+    tree.nodes["A1"].compute = fail
+    update_system.process_tree(tree)
+    assert order == ["B1", "B2"]
+    assert "A1" in tree["error nodes"]
+
+
+def test_skip_after_error(tree, monkeypatch):
+    nodes, deps = tree
+    processed(nodes)
+    monkeypatch.setattr(data_structure, "ERROR_ISOLATION", True)
+    nodes["B"].compute = fail
+    update_system.do_update_general(list(nodes.keys()), nodes)
+    # the branch of D doesn't depend on B
+    assert processed(nodes) == {"A": 1, "B": 1, "C": 0, "D": 1}
+    assert nodes["Viewer"].processed == 0
+    graph = {item["name"]: item for item in update_system.graphs[-1]}
+    assert graph["B"]["error"] == repr(ValueError("no data"))
+    assert graph["C"]["skipped"] == graph["Viewer"]["skipped"] == "B"
+    assert "skipped" not in graph["D"] and "error" not in graph["D"]
+    assert "B" in nodes.id_data["error nodes"]
+
+
+def test_error_stops_the_update_without_isolation(tree):
+    nodes, deps = tree
+    processed(nodes)
+    nodes["B"].compute = fail
+    assert update_system.do_update_general(list(nodes.keys()), nodes) is None
+    assert processed(nodes) == {"A": 1, "B": 1, "C": 0, "D": 0}
+
+
+@pytest.fixture
+def joined(fake_tree, monkeypatch):
+    """
+    Tree where A and B both feed C, C -> D, and E is on its own
+    """
+    monkeypatch.setattr(update_system, "batch_nodes", update_system.collections.OrderedDict())
+    tree = fake_tree()
+    for name in "ABCDE":
+        tree.add_node(name, inputs=["Data", "More"], compute=total, value=1)
+    for a, b in [("A", "C"), ("C", "D")]:
+        tree.link(tree.nodes[a].outputs[0], tree.nodes[b].inputs[0])
+    tree.link(tree.nodes["B"].outputs[0], tree.nodes["C"].inputs[1])
+    update_system.build_update_list(tree)
+    return tree
+
+
+def test_process_from_nodes(joined):
+    nodes = joined.nodes
+    update_system.process_from_nodes([nodes["A"], nodes["B"], nodes["A"]])
+    # C and D are downstream of both, processed once
+    assert processed(nodes) == {"A": 1, "B": 1, "C": 1, "D": 1, "E": 0}
+    key = frozenset(["A", "B"])
+    assert sorted(update_system.partial_update_cache["Test tree"][key]) == ["A", "B", "C", "D"]
+    update_system.process_from_nodes([nodes["B"], nodes["A"]])
+    assert processed(nodes) == {"A": 1, "B": 1, "C": 1, "D": 1, "E": 0}
+
+
+def test_batch_update(joined):
+    nodes = joined.nodes
+    with update_system.batch_update():
+        for name in "ABA":
+            assert update_system.add_to_batch(nodes[name])
+        with update_system.batch_update():
+            assert update_system.add_to_batch(nodes["B"])
+        # only the outer block processes
+        assert processed(nodes) == {name: 0 for name in "ABCDE"}
+    assert processed(nodes) == {"A": 1, "B": 1, "C": 1, "D": 1, "E": 0}
+    assert not update_system.batch_nodes
+    assert not update_system.add_to_batch(nodes["A"])
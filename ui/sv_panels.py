@@ -210,6 +210,11 @@ class SverchokToolsMenu(bpy.types.Panel):
                 split.scale_x = little_width
                 split.prop(tree, 'use_fake_user', toggle=True, text='F')
 
+        row = layout.row(align=True)
+        row.operator("node.sverchok_export_timings", text="Export timings")
+        row.operator("node.sverchok_cache_report", text="Cache report")
+        row.operator("node.sverchok_clear_disk_cache", text="Clear disk cache")
+
         if context.scene.sv_new_version:
             row = layout.row()
             row.alert = True
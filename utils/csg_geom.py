@@ -260,91 +260,116 @@ class CSGNode(object):
             self.build(polygons)
 
     def clone(self):
-        node = CSGNode()
-        if self.plane:
-            node.plane = self.plane.clone()
-        if self.front:
-            node.front = self.front.clone()
-        if self.back:
-            node.back = self.back.clone()
-        node.polygons = map(lambda p: p.clone(), self.polygons)
-        return node
+        root = CSGNode()
+        stack = [(self, root)]
+        while stack:
+            source, node = stack.pop()
+            if source.plane:
+                node.plane = source.plane.clone()
+            node.polygons = [p.clone() for p in source.polygons]
+            if source.front:
+                node.front = CSGNode()
+                stack.append((source.front, node.front))
+            if source.back:
+                node.back = CSGNode()
+                stack.append((source.back, node.back))
+        return root
+
+    def nodes(self):
+        """
+        All nodes of this BSP tree, this node first
+        """
+        out = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            out.append(node)
+            if node.back:
+                stack.append(node.back)
+            if node.front:
+                stack.append(node.front)
+        return out
 
     def invert(self):
         """
         Convert solid space to empty space and empty space to solid space.
         """
-        for poly in self.polygons:
-            poly.flip()
-        self.plane.flip()
-        if self.front:
-            self.front.invert()
-        if self.back:
-            self.back.invert()
-        temp = self.front
-        self.front = self.back
-        self.back = temp
+        for node in self.nodes():
+            for poly in node.polygons:
+                poly.flip()
+            if node.plane:
+                node.plane.flip()
+            node.front, node.back = node.back, node.front
 
     def clipPolygons(self, polygons):
         """
-        Recursively remove all polygons in `polygons` that are inside this BSP
-        tree.
+        Remove all polygons in `polygons` that are inside this BSP tree.
+        The tree is walked with a stack, front before back, so the order
+        of the polygons is the same as when walking it recursively.
         """
-        if not self.plane:
-            return polygons[:]
-        front = []
-        back = []
-        for poly in polygons:
-            self.plane.splitPolygon(poly, front, back, front, back)
-        if self.front:
-            front = self.front.clipPolygons(front)
-        if self.back:
-            back = self.back.clipPolygons(back)
-        else:
+        result = []
+        stack = [(self, polygons)]
+        while stack:
+            node, polygons = stack.pop()
+            if not node.plane:
+                result.extend(polygons)
+                continue
+            front = []
             back = []
-        front.extend(back)
-        return front
+            split = node.plane.splitPolygon
+            for poly in polygons:
+                split(poly, front, back, front, back)
+            # polygons behind a node without back are inside
+            if node.back and back:
+                stack.append((node.back, back))
+            if node.front:
+                if front:
+                    stack.append((node.front, front))
+            else:
+                result.extend(front)
+        return result
 
     def clipTo(self, bsp):
         """
         Remove all polygons in this BSP tree that are inside the other BSP tree
         `bsp`.
         """
-        self.polygons = bsp.clipPolygons(self.polygons)
-        if self.front:
-            self.front.clipTo(bsp)
-        if self.back:
-            self.back.clipTo(bsp)
+        for node in self.nodes():
+            node.polygons = bsp.clipPolygons(node.polygons)
 
     def allPolygons(self):
         """
         Return a list of all polygons in this BSP tree.
         """
-        polygons = self.polygons[:]
-        if self.front:
-            polygons.extend(self.front.allPolygons())
-        if self.back:
-            polygons.extend(self.back.allPolygons())
+        polygons = []
+        for node in self.nodes():
+            polygons.extend(node.polygons)
         return polygons
 
     def build(self, polygons):
-        if isinstance(polygons, map):
-            polygons = list(polygons)
-            if not len(polygons):
-                return
-
-        if not self.plane:
-            self.plane = polygons[0].plane.clone()
-        front = []
-        back = []
-        for poly in polygons:
-            self.plane.splitPolygon(
-                poly, self.polygons, self.polygons, front, back)
-        if len(front):
-            if not self.front:
-                self.front = CSGNode()
-            self.front.build(front)
-        if len(back):
-            if not self.back:
-                self.back = CSGNode()
-            self.back.build(back)
+        """
+        Build a BSP tree out of `polygons`. When called on an existing tree, the
+        new polygons are filtered down to the bottom of the tree and become new
+        nodes there.
+        """
+        stack = [(self, list(polygons))]
+        while stack:
+            node, polygons = stack.pop()
+            if not polygons:
+                continue
+            if not node.plane:
+                node.plane = polygons[0].plane.clone()
+            front = []
+            back = []
+            split = node.plane.splitPolygon
+            coplanar = node.polygons
+            for poly in polygons:
+                split(poly, coplanar, coplanar, front, back)
+            if front:
+                if not node.front:
+                    node.front = CSGNode()
+                stack.append((node.front, front))
+            if back:
+                if not node.back:
+                    node.back = CSGNode()
+                stack.append((node.back, back))
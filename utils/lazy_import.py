@@ -0,0 +1,92 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Timed imports for the add-on startup and modules that are only
+# imported the first time they are used, when a node processes.
+# Set the environment variable SVERCHOK_IMPORT_REPORT to print
+# the import report when sverchok is registered.
+
+import importlib
+import os
+import sys
+import time
+
+# {module name: seconds}, including the modules it imports itself
+import_times = {}
+# seconds for importing all of sverchok, set by the add-on __init__
+startup_time = 0.0
+# names of lazy modules that have been imported and of the modules of
+# their package they imported, in the order to reload them
+lazy_loaded = []
+
+
+def timed_import(name, package=None):
+    start = time.perf_counter()
+    module = importlib.import_module(name, package)
+    import_times[module.__name__] = time.perf_counter() - start
+    return module
+
+
+class LazyModule:
+    """
+    Stand in for a module that is imported on first attribute access
+        cm = lazy_module("sverchok.utils.cad_module")
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            package = self._name.split(".")[0]
+            before = set(sys.modules)
+            self._module = timed_import(self._name)
+            # like csg_geom for csg_core, reloaded before the module using it
+            lazy_loaded.extend(sorted(name for name in set(sys.modules) - before
+                                      if name.split(".")[0] == package
+                                      and name != self._name and name not in lazy_loaded))
+            if self._name not in lazy_loaded:
+                lazy_loaded.append(self._name)
+        return getattr(self._module, attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module else "not loaded"
+        return "<lazy module '{}' {}>".format(self._name, state)
+
+
+def lazy_module(name):
+    return LazyModule(name)
+
+
+def report(count=20):
+    """
+    Text report of the total import time and the slowest modules
+    """
+    startup_count = sum(1 for name in import_times if name not in lazy_loaded)
+    lines = ["Sverchok import: {:.3f} s for {} modules, {} lazy modules loaded".format(
+        startup_time, startup_count, len(lazy_loaded))]
+    slowest = sorted(import_times.items(), key=lambda item: item[1], reverse=True)
+    for name, seconds in slowest[:count]:
+        lazy = " (lazy)" if name in lazy_loaded else ""
+        lines.append("  {:<50} {:>8.1f} ms{}".format(name, seconds * 1000, lazy))
+    return "\n".join(lines)
+
+
+def report_requested():
+    return bool(os.environ.get("SVERCHOK_IMPORT_REPORT"))
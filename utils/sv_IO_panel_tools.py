@@ -114,12 +114,64 @@ def has_state_switch_protection(node, k):
         return node.bl_idname in {'VectorMathNode'}
 
 
+def get_node_params(node, node_dict, groups_dict):
+    '''
+    The properties of node to export, {name: value}. Text content of
+    profile nodes goes to node_dict, group layouts to groups_dict.
+    '''
+    texts = bpy.data.texts
+    node_items = {}
+    node_enums = find_enumerators(node)
+
+    ObjectsNode = (node.bl_idname == 'ObjectsNode')
+    ProfileParamNode = (node.bl_idname == 'SvProfileNode')
+    IsGroupNode = (node.bl_idname == 'SvGroupNode')
+
+    for k, v in node.items():
+
+        if k == 'n_id':
+            # used to store the hash of the current Node,
+            # this is created along with the Node anyway. skip.
+            continue
+
+        if k in {'typ', 'newsock'}:
+            ''' these are reserved variables for changeable socks '''
+            continue
+
+        if has_state_switch_protection(node, k):
+            continue
+
+        # this silences the import error when items not found.
+        if ObjectsNode and (k == "objects_local"):
+            continue
+
+        if ProfileParamNode and (k == "filename"):
+            '''add file content to dict'''
+            node_dict['path_file'] = texts[node.filename].as_string()
+
+        if IsGroupNode and (k == "group_name"):
+            if v not in groups_dict:
+                group_ng = bpy.data.node_groups[v]
+                group_dict = create_dict_of_tree(group_ng)
+                group_json = json.dumps(group_dict)
+                groups_dict[v] = group_json
+
+        if isinstance(v, (float, int, str)):
+            node_items[k] = v
+        else:
+            node_items[k] = v[:]
+
+        if k in node_enums:
+            v = getattr(node, k)
+            node_items[k] = v
+    return node_items
+
+
 def create_dict_of_tree(ng, skip_set={}, selected=False):
     nodes = ng.nodes
     layout_dict = {}
     nodes_dict = {}
     groups_dict = {}
-    texts = bpy.data.texts
     if not skip_set:
         skip_set = {'SvImportExport', 'Sv3DviewPropsNode'}
 
@@ -133,52 +185,7 @@ def create_dict_of_tree(ng, skip_set={}, selected=False):
             continue
 
         node_dict = {}
-        node_items = {}
-        node_enums = find_enumerators(node)
-
-        ObjectsNode = (node.bl_idname == 'ObjectsNode')
-        ProfileParamNode = (node.bl_idname == 'SvProfileNode')
-        IsGroupNode = (node.bl_idname == 'SvGroupNode')
-
-        for k, v in node.items():
-
-            if k == 'n_id':
-                # used to store the hash of the current Node,
-                # this is created along with the Node anyway. skip.
-                continue
-
-            if k in {'typ', 'newsock'}:
-                ''' these are reserved variables for changeable socks '''
-                continue
-
-            if has_state_switch_protection(node, k):
-                continue
-
-            # this silences the import error when items not found.
-            if ObjectsNode and (k == "objects_local"):
-                continue
-
-            if ProfileParamNode and (k == "filename"):
-                '''add file content to dict'''
-                node_dict['path_file'] = texts[node.filename].as_string()
-
-            if IsGroupNode and (k == "group_name"):
-                if v not in groups_dict:
-                    group_ng = bpy.data.node_groups[v]
-                    group_dict = create_dict_of_tree(group_ng)
-                    group_json = json.dumps(group_dict)
-                    groups_dict[v] = group_json
-
-            if isinstance(v, (float, int, str)):
-                node_items[k] = v
-            else:
-                node_items[k] = v[:]
-
-            if k in node_enums:
-                v = getattr(node, k)
-                node_items[k] = v
-
-        node_dict['params'] = node_items
+        node_dict['params'] = get_node_params(node, node_dict, groups_dict)
         node_dict['location'] = node.location[:]
         node_dict['bl_idname'] = node.bl_idname
         node_dict['height'] = node.height
@@ -0,0 +1,202 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+'''
+Headless batch evaluation of layouts exported with the IO panel.
+
+usage, in background blender:
+
+    blender -b --python sverchok/utils/sv_batch.py -- layout.json
+        --param "Float.float_=0;0.5;1" --param "BasicSpline.knot_1=(0,0,0);(1,0,0)"
+        --frames 1:100:10 --output "Vectors out" --out /tmp/results
+
+Values of a --param are separated by ";" and read as python literals, so
+vectors and tuples can be passed. Every combination of the --param values
+is evaluated for every frame and written to out as variant_NNNN_frame_NNNN.json, together with manifest.json.
+--output limits the written data to some nodes, "node" or "node.socket",
+by default all cached output sockets are written.
+'''
+
+import argparse
+import ast
+import itertools
+import json
+import os
+import sys
+
+import bpy
+
+
+def parse_param(text):
+    """
+    "node.prop=v1;v2" -> (node, prop, [v1, v2]), values are python literals
+    if possible otherwise strings, "(0,0,1);(1,0,0)" gives two tuples
+    """
+    target, values = text.split("=", 1)
+    node_name, prop = target.rsplit(".", 1)
+    out = []
+    for value in values.split(";"):
+        try:
+            out.append(ast.literal_eval(value.strip()))
+        except (ValueError, SyntaxError):
+            out.append(value)
+    return node_name, prop, out
+
+
+def parse_frames(text):
+    if not text:
+        return [None]
+    parts = [int(p) for p in text.split(":")]
+    start, end = parts[0], parts[1] if len(parts) > 1 else parts[0]
+    step = parts[2] if len(parts) > 2 else 1
+    return list(range(start, end + 1, step))
+
+
+def to_json(data):
+    """
+    Socket data to something json can write
+    """
+    if isinstance(data, (list, tuple)):
+        return [to_json(d) for d in data]
+    if hasattr(data, 'tolist'):
+        return data.tolist()
+    if hasattr(data, 'col'):  # mathutils.Matrix
+        return [row[:] for row in data]
+    if hasattr(data, 'to_tuple'):  # mathutils.Vector, Color, Euler
+        return data[:]
+    return data
+
+
+def collect_outputs(ng, outputs=None):
+    """
+    Data of output sockets, {node name: {socket name: data}}
+    outputs is a list of "node" or "node.socket" names, if not passed
+    all output sockets with data are used
+    """
+    from sverchok import data_structure
+    cache = data_structure.socket_data_cache.get(ng.name, {})
+    wanted = {}
+    if outputs:
+        for name in outputs:
+            if name in ng.nodes:
+                wanted[name] = None
+            else:
+                node_name, socket_name = name.rsplit(".", 1)
+                wanted.setdefault(node_name, set()).add(socket_name)
+    out = {}
+    for node in ng.nodes:
+        if outputs and node.name not in wanted:
+            continue
+        for socket in node.outputs:
+            if wanted.get(node.name) and socket.name not in wanted[node.name]:
+                continue
+            s_id = data_structure.socket_id(socket)
+            if s_id in cache:
+                out.setdefault(node.name, {})[socket.name] = to_json(cache[s_id])
+    return out
+
+
+def load_layout(path, tree_name="sv_batch"):
+    from sverchok.utils.sv_IO_panel_tools import import_tree
+    ng = bpy.data.node_groups.new(tree_name, 'SverchCustomTreeType')
+    import_tree(ng, path, create_texts=True)
+    return ng
+
+
+def run_batch(path, params=(), frames=(None,), outputs=None, out_dir="."):
+    """
+    Evaluate the layout in path for every combination of params and
+    every frame, write the results to out_dir. Returns the manifest.
+    """
+    from sverchok.core import handlers
+    from sverchok import data_structure
+
+    os.makedirs(out_dir, exist_ok=True)
+    ng = load_layout(path)
+    # frames are processed here, not by the frame change handler
+    handlers.set_frame_change(None)
+    try:
+        manifest = evaluate_variants(ng, params, frames, outputs, out_dir)
+    finally:
+        addon = bpy.context.user_preferences.addons.get(data_structure.SVERCHOK_NAME)
+        if addon:
+            handlers.set_frame_change(addon.preferences.frame_change_mode)
+
+    manifest["layout"] = os.path.abspath(path)
+    with open(os.path.join(out_dir, "manifest.json"), 'w') as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
+    return manifest
+
+
+def evaluate_variants(ng, params, frames, outputs, out_dir):
+    """
+    Set params, with updates frozen, and process the tree for every frame
+    """
+    from sverchok.core.update_system import process_tree
+
+    scene = bpy.context.scene
+    names = ["{}.{}".format(node_name, prop) for node_name, prop, _ in params]
+    manifest = {"variants": []}
+    for i, values in enumerate(itertools.product(*[p[2] for p in params])):
+        ng.freeze(hard=True)
+        for (node_name, prop, _), value in zip(params, values):
+            setattr(ng.nodes[node_name], prop, value)
+        ng.unfreeze(hard=True)
+        for frame in frames:
+            if frame is not None:
+                scene.frame_set(frame)
+            process_tree(ng)
+            file_name = "variant_{:04d}_frame_{:04d}.json".format(i, frame or 0)
+            result = {"params": dict(zip(names, values)),
+                      "frame": frame,
+                      "outputs": collect_outputs(ng, outputs)}
+            with open(os.path.join(out_dir, file_name), 'w') as result_file:
+                json.dump(result, result_file)
+            manifest["variants"].append({"file": file_name,
+                                         "params": result["params"],
+                                         "frame": frame})
+            print("sv_batch: wrote", file_name)
+    return manifest
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(prog="sv_batch", description="Sverchok batch evaluation")
+    parser.add_argument("layout", help="layout exported as .json or .zip")
+    parser.add_argument("--param", action="append", default=[],
+                        help='node.prop=v1;v2;... values to sweep')
+    parser.add_argument("--frames", default="", help="start:end[:step]")
+    parser.add_argument("--output", action="append", default=[],
+                        help='"node" or "node.socket" to write, default all')
+    parser.add_argument("--out", default="sv_batch_out", help="output directory")
+    args = parser.parse_args(argv)
+
+    import addon_utils
+    if "sverchok" not in sys.modules:
+        addon_utils.enable("sverchok", default_set=True)
+
+    run_batch(args.layout,
+              params=[parse_param(p) for p in args.param],
+              frames=parse_frames(args.frames),
+              outputs=args.output,
+              out_dir=args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Socket data to and from files without pickle, so reading a file can't
+# run code. The data is written as a numpy .npz file, read back with
+# allow_pickle=False. Arrays, and lists of numbers or of equal length
+# rows of numbers like vertices and polygons, are stored as arrays, the
+# nesting around them as json in the array "meta":
+#   list                       [items]
+#   tuple                      {"t": [items]}
+#   dict                       {"d": [[key, value], ...]}
+#   array                      {"a": index}
+#   packed numbers             {"p": index, "list": outer is a list, "rows": "list", "tuple" or None}
+#   Matrix, Vector, Euler ...  {"m": type name, "v": values}
+# mathutils types are read back as lists where mathutils isn't available.
+# save_frame and load_frame keep frames of data in a directory, for the
+# Cache node.
+
+import json
+import os
+import zipfile
+
+import numpy as np
+
+# change when the stored format changes
+DATA_FORMAT = 1
+# shorter lists of numbers are kept in the json
+PACK_MIN = 16
+
+mathutils_types = {'Matrix', 'Vector', 'Quaternion', 'Euler', 'Color'}
+
+
+def pack_numbers(data):
+    """
+    (array, row type) for a list of numbers or of equal length rows of
+    numbers, all of one type, None if data can't be stored exactly as an
+    array.
+    """
+    first = data[0]
+    kind = type(first)
+    if kind is float or kind is int:
+        if not all(type(x) is kind for x in data):
+            return None
+        rows = None
+    elif kind is list or kind is tuple:
+        n = len(first)
+        if not n:
+            return None
+        leaf = type(first[0])
+        if leaf is not float and leaf is not int:
+            return None
+        for row in data:
+            if type(row) is not kind or len(row) != n:
+                return None
+            for x in row:
+                if type(x) is not leaf:
+                    return None
+        rows = kind.__name__
+        kind = leaf
+    else:
+        return None
+    try:
+        array = np.array(data, dtype=np.float64 if kind is float else np.int64)
+    except OverflowError:
+        return None
+    return array, rows
+
+
+def to_storable(data, arrays):
+    """
+    json compatible form of data, arrays in it are appended to arrays
+    """
+    if data is None or isinstance(data, (bool, int, float, str)):
+        return data
+    if isinstance(data, np.ndarray):
+        if data.dtype.hasobject:
+            raise TypeError("Can't store arrays of python objects")
+        arrays.append(data)
+        return {"a": len(arrays) - 1}
+    if isinstance(data, np.generic):
+        return data.item()
+    if isinstance(data, (list, tuple)):
+        packed = pack_numbers(data) if len(data) >= PACK_MIN else None
+        if packed is not None:
+            arrays.append(packed[0])
+            return {"p": len(arrays) - 1, "list": isinstance(data, list), "rows": packed[1]}
+        items = [to_storable(d, arrays) for d in data]
+        return items if isinstance(data, list) else {"t": items}
+    if isinstance(data, dict):
+        return {"d": [[to_storable(k, arrays), to_storable(v, arrays)] for k, v in data.items()]}
+    kind = type(data).__name__
+    if kind in mathutils_types and type(data).__module__ == 'mathutils':
+        if kind == 'Matrix':
+            values = [list(row) for row in data]
+        elif kind == 'Euler':
+            values = [list(data), data.order]
+        else:
+            values = list(data)
+        return {"m": kind, "v": values}
+    raise TypeError("Can't store {} in socket data".format(kind))
+
+
+def make_mathutils(kind, values):
+    try:
+        import mathutils
+    except ImportError:
+        return values
+    if kind == 'Euler':
+        return mathutils.Euler(*values)
+    return getattr(mathutils, kind)(values)
+
+
+def from_storable(data, arrays):
+    """
+    Data from the form made by to_storable
+    """
+    if isinstance(data, list):
+        return [from_storable(d, arrays) for d in data]
+    if not isinstance(data, dict):
+        return data
+    if "a" in data:
+        return arrays[data["a"]]
+    if "p" in data:
+        out = arrays[data["p"]].tolist()
+        if data["rows"] == "tuple":
+            out = [tuple(row) for row in out]
+        return out if data["list"] else tuple(out)
+    if "t" in data:
+        return tuple(from_storable(d, arrays) for d in data["t"])
+    if "d" in data:
+        return {from_storable(k, arrays): from_storable(v, arrays) for k, v in data["d"]}
+    if "m" in data:
+        return make_mathutils(data["m"], data["v"])
+    raise ValueError("Unknown entry in socket data file")
+
+
+def save_data(file, data, compress=False):
+    """
+    Write data to file, a path or a file object.
+    Raises TypeError for data that can't be stored.
+    """
+    arrays = []
+    storable = to_storable(data, arrays)
+    meta = json.dumps({"format": DATA_FORMAT,
+                       "arrays": len(arrays),
+                       "data": storable}).encode()
+    named = {"a{}".format(i): array for i, array in enumerate(arrays)}
+    named["meta"] = np.frombuffer(meta, dtype=np.uint8)
+    if compress:
+        np.savez_compressed(file, **named)
+    else:
+        np.savez(file, **named)
+
+
+def load_data(file):
+    """
+    Read data written by save_data from file, a path or a file object.
+    Raises ValueError if the file isn't valid.
+    """
+    try:
+        stored = np.load(file, allow_pickle=False)
+        if not hasattr(stored, 'files'):
+            raise ValueError("Not a socket data file, single array")
+        with stored:
+            meta = json.loads(stored["meta"].tobytes().decode())
+            if meta.get("format") != DATA_FORMAT:
+                raise ValueError("Socket data file format {}".format(meta.get("format")))
+            arrays = [stored["a{}".format(i)] for i in range(meta["arrays"])]
+    except (KeyError, TypeError, EOFError, UnicodeDecodeError, zipfile.BadZipFile) as err:
+        raise ValueError("Not a socket data file: {}".format(err))
+    return from_storable(meta["data"], arrays)
+
+
+def frame_path(directory, frame, index=None, ext=".npz"):
+    if index is None:
+        return os.path.join(directory, "{}{}".format(frame, ext))
+    return os.path.join(directory, "{}_{}.npy".format(frame, index))
+
+
+def save_frame(directory, frame, data):
+    """
+    Write the data of one frame, lists of arrays are written as .npy
+    files so they can be memory mapped when read back, other data with
+    save_data. Raises TypeError if data can't be written.
+    """
+    os.makedirs(directory, exist_ok=True)
+    if data and isinstance(data, list) and all(isinstance(d, np.ndarray) for d in data):
+        for i, array in enumerate(data):
+            np.save(frame_path(directory, frame, i), array, allow_pickle=False)
+        with open(frame_path(directory, frame, ext=".json"), 'w') as frame_file:
+            json.dump({"arrays": len(data)}, frame_file)
+    else:
+        header_path = frame_path(directory, frame, ext=".json")
+        if os.path.exists(header_path):
+            os.remove(header_path)
+        save_data(frame_path(directory, frame), data)
+
+
+def load_frame(directory, frame):
+    """
+    Data of a frame written by save_frame, None if there is none
+    """
+    try:
+        header_path = frame_path(directory, frame, ext=".json")
+        if os.path.exists(header_path):
+            with open(header_path) as frame_file:
+                header = json.load(frame_file)
+            return [np.load(frame_path(directory, frame, i), mmap_mode='r', allow_pickle=False)
+                    for i in range(header["arrays"])]
+        path = frame_path(directory, frame)
+        if os.path.exists(path):
+            return load_data(path)
+    except (OSError, ValueError, KeyError) as err:
+        print("Could not read frame {}: {}".format(frame, err))
+    return None
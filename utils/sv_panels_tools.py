@@ -30,6 +30,7 @@ import bpy
 from bpy.props import StringProperty, CollectionProperty, BoolProperty
 
 from sverchok.core.update_system import process_tree, build_update_list
+from sverchok.core import update_profile, cache_budget, disk_cache
 from sverchok.node_tree import SverchCustomTreeNode
 import sverchok
 
@@ -113,6 +114,51 @@ class SverchokPurgeCache(bpy.types.Operator):
         return {'FINISHED'}
 
 
+class SverchokExportTimings(bpy.types.Operator):
+    """Export recorded update timings as chrome trace and node statistics"""
+    bl_idname = "node.sverchok_export_timings"
+    bl_label = "Sverchok export timings"
+
+    filepath = StringProperty(subtype='FILE_PATH', default="sv_timings.json")
+
+    def execute(self, context):
+        if not update_profile.history:
+            self.report({'WARNING'}, "No timings recorded")
+            return {'CANCELLED'}
+        path = bpy.path.ensure_ext(bpy.path.abspath(self.filepath), ".json")
+        stats_path = os.path.splitext(path)[0] + "_stats.json"
+        update_profile.write_chrome_trace(path)
+        update_profile.write_statistics(stats_path)
+        print(update_profile.statistics_table())
+        self.report({'INFO'}, "Timings written to {}".format(path))
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+
+class SverchokCacheReport(bpy.types.Operator):
+    """Print size of socket cache and the largest sockets in console"""
+    bl_idname = "node.sverchok_cache_report"
+    bl_label = "Sverchok cache report"
+
+    def execute(self, context):
+        print(cache_budget.report())
+        return {'FINISHED'}
+
+
+class SverchokClearDiskCache(bpy.types.Operator):
+    """Remove all node outputs stored in the disk cache"""
+    bl_idname = "node.sverchok_clear_disk_cache"
+    bl_label = "Sverchok clear disk cache"
+
+    def execute(self, context):
+        disk_cache.clear()
+        self.report({'INFO'}, "Disk cache cleared")
+        return {'FINISHED'}
+
+
 # USED IN CTRL+U PROPERTIES WINDOW
 class SverchokHome(bpy.types.Operator):
     """Sverchok Home"""
@@ -320,6 +366,9 @@ sv_tools_classes = [
     SverchokCheckForUpgrades,
     SverchokUpdateAddon,
     SverchokPurgeCache,
+    SverchokExportTimings,
+    SverchokCacheReport,
+    SverchokClearDiskCache,
     SverchokHome,
     Sv3dPropItem,
     SvSwitchToLayout,